@@ -0,0 +1,170 @@
+"""Load test for the dashboard servers: requests/second and latency percentiles.
+
+Starts the Flask (dashboard_server) and/or ASGI (dashboard_asgi, via uvicorn)
+dashboards on local ports, or targets already running servers with --url, and
+hammers them with concurrent keep-alive clients.
+
+    python bench/dashboard_load.py --server flask --server asgi --concurrency 50 --duration 10
+    python bench/dashboard_load.py --url http://127.0.0.1:8000 --path /users?limit=50
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+DEFAULT_PATHS = ['/users', '/achievements', '/leaderboard', '/modlogs']
+
+SERVER_COMMANDS = {
+    'flask': lambda port: [sys.executable, '-c',
+                           f"import dashboard_server; dashboard_server.app.run(port={port}, threaded=True)"],
+    'asgi': lambda port: [sys.executable, '-m', 'uvicorn', 'dashboard_asgi:app',
+                          '--port', str(port), '--log-level', 'warning']
+}
+
+async def read_response(reader):
+    """Read one HTTP/1.x response; returns (status, keep_alive, body length)."""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    version, status = lines[0].split(' ', 2)[:2]
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+    if 'content-length' in headers:
+        body = await reader.readexactly(int(headers['content-length']))
+    elif headers.get('transfer-encoding', '').lower() == 'chunked':
+        body = b''
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).strip().split(b';')[0], 16)
+            chunk = await reader.readexactly(size + 2)
+            if size == 0:
+                break
+            body += chunk[:-2]
+    else:
+        body = await reader.read()
+        keep_alive = False
+    return int(status), keep_alive, len(body)
+
+async def client(host, port, paths, deadline, latencies, errors, accept_gzip):
+    reader = writer = None
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        request = (f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+                   + ("Accept-Encoding: gzip\r\n" if accept_gzip else "")
+                   + "\r\n").encode('latin-1')
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive, _ = await read_response(reader)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            errors.append(path)
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            continue
+        latencies.append(time.perf_counter() - started)
+        if status >= 400:
+            errors.append(path)
+        if not keep_alive:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = min(int(round(pct / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[k]
+
+async def run_load(url, paths, concurrency, duration, accept_gzip):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(client(host, port, paths, deadline, latencies, errors, accept_gzip)
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "url": url,
+        "paths": paths,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "req_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round((latencies[-1] if latencies else 0) * 1000, 2)
+    }
+
+def wait_for_port(host, port, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            asyncio.run(asyncio.wait_for(asyncio.open_connection(host, port), 1.0))
+            return True
+        except (OSError, asyncio.TimeoutError):
+            time.sleep(0.2)
+    return False
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--server', action='append', choices=sorted(SERVER_COMMANDS),
+                        help="start this dashboard locally and test it (repeatable)")
+    parser.add_argument('--url', action='append', default=[], help="test an already running server")
+    parser.add_argument('--path', action='append', help="request path, repeatable (default: the four table routes)")
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--port', type=int, default=8765, help="first port used for --server")
+    parser.add_argument('--gzip', action='store_true', help="send Accept-Encoding: gzip")
+    parser.add_argument('--output', help="also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    paths = args.path or DEFAULT_PATHS
+    targets = [(url, None) for url in args.url]
+    for offset, name in enumerate(args.server or []):
+        port = args.port + offset
+        process = subprocess.Popen(SERVER_COMMANDS[name](port), cwd=ROOT,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        targets.append((f"http://127.0.0.1:{port}", (name, process)))
+    if not targets:
+        parser.error("give at least one --server or --url")
+
+    results = []
+    try:
+        for url, started in targets:
+            if started and not wait_for_port('127.0.0.1', urlsplit(url).port):
+                print(f"{started[0]}: server did not start on {url}", file=sys.stderr)
+                continue
+            result = asyncio.run(run_load(url, paths, args.concurrency, args.duration, args.gzip))
+            result["server"] = started[0] if started else url
+            results.append(result)
+            print(f"{result['server']:>24}  {result['req_per_s']:>9} req/s  "
+                  f"p50 {result['p50_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  errors {result['errors']}")
+    finally:
+        for _, started in targets:
+            if started:
+                started[1].terminate()
+                started[1].wait()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
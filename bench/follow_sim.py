@@ -0,0 +1,203 @@
+"""Follow-mode simulation: API calls per minute and tracking error in a fake room.
+
+A scripted target clicks to random destinations and walks there at avatar speed.
+Each strategy follows it for the same script on a virtual clock, so ten simulated
+minutes take well under a second:
+
+    poll     the old follow_loop: get_room_users + walk_to every 2.5 s
+    event    Follower driven by move events, no prediction
+    predict  Follower driven by move events, leading the target by --horizon seconds
+
+    python bench/follow_sim.py --minutes 10 --seed 1 --horizon 0.5
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import selectors
+import sys
+from types import SimpleNamespace
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT)
+
+from bot.utils import movement  # noqa: E402
+from bot.utils.room_state import RoomState  # noqa: E402
+
+AVATAR_SPEED = 2.5  # units per second, target and bot alike
+API_LATENCY = 0.08  # seconds per highrise call
+SAMPLE_INTERVAL = 0.1
+ROOM_SIZE = 30.0
+
+class _InstantSelector(selectors.DefaultSelector):
+    """Never waits: a select timeout just advances the loop's virtual clock."""
+
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+
+    def select(self, timeout=None):
+        events = super().select(0)
+        if not events and timeout:
+            self.clock.now += timeout
+        return events
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    def __init__(self):
+        self.clock = SimpleNamespace(now=0.0)
+        super().__init__(selector=_InstantSelector(self.clock))
+
+    def time(self):
+        return self.clock.now
+
+class Position:
+    def __init__(self, x, y, z, facing="FrontRight"):
+        self.x, self.y, self.z, self.facing = x, y, z, facing
+
+class Walker:
+    """Straight-line walk from where the avatar is now to a destination."""
+
+    def __init__(self, x, z):
+        self.start = (x, z)
+        self.dest = (x, z)
+        self.started_at = 0.0
+
+    def position(self, now):
+        distance = math.dist(self.start, self.dest)
+        if distance == 0:
+            return self.dest
+        progress = min((now - self.started_at) * AVATAR_SPEED / distance, 1.0)
+        return (self.start[0] + (self.dest[0] - self.start[0]) * progress,
+                self.start[1] + (self.dest[1] - self.start[1]) * progress)
+
+    def walk(self, now, x, z):
+        self.start = self.position(now)
+        self.dest = (x, z)
+        self.started_at = now
+        return math.dist(self.start, self.dest) / AVATAR_SPEED
+
+class FakeHighrise:
+    def __init__(self, room):
+        self.room = room
+        self.calls = {"get_room_users": 0, "walk_to": 0}
+
+    async def get_room_users(self):
+        self.calls["get_room_users"] += 1
+        await asyncio.sleep(API_LATENCY)
+        dest = self.room.target.dest
+        return SimpleNamespace(content=[(self.room.target_user, Position(dest[0], 0.0, dest[1]))])
+
+    async def walk_to(self, position):
+        self.calls["walk_to"] += 1
+        await asyncio.sleep(API_LATENCY)
+        self.room.bot.walk(asyncio.get_running_loop().time(), position.x, position.z)
+
+class FakeRoom:
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.target_user = SimpleNamespace(id="target", username="target")
+        self.target = Walker(ROOM_SIZE / 2, ROOM_SIZE / 2)
+        self.bot = Walker(ROOM_SIZE / 2 - 1, ROOM_SIZE / 2 - 1)
+        self.room_state = None
+
+    async def run_target(self, duration):
+        loop = asyncio.get_running_loop()
+        angle = self.rng.uniform(0, 2 * math.pi)
+        while loop.time() < duration:
+            x, z = self.target.position(loop.time())
+            # People mostly keep heading the same way, with the occasional turn
+            angle += self.rng.gauss(0, 0.5)
+            step = self.rng.uniform(1.0, 6.0)
+            dest_x = min(max(x + step * math.cos(angle), 0.0), ROOM_SIZE)
+            dest_z = min(max(z + step * math.sin(angle), 0.0), ROOM_SIZE)
+            travel = self.target.walk(loop.time(), dest_x, dest_z)
+            if self.room_state is not None:
+                self.room_state.on_move(self.target_user, Position(dest_x, 0.0, dest_z))
+            # Sometimes click again mid-walk, sometimes stand around
+            if self.rng.random() < 0.3:
+                await asyncio.sleep(travel * self.rng.uniform(0.3, 0.8))
+            else:
+                await asyncio.sleep(travel + self.rng.uniform(0.5, 4.0))
+
+async def poll_follow(bot, room, duration):
+    """The original follow_loop: fetch the room every 2.5 s and walk behind the target."""
+    loop = asyncio.get_running_loop()
+    while loop.time() < duration:
+        room_users = (await bot.highrise.get_room_users()).content
+        for room_user, position in room_users:
+            if room_user.id == room.target_user.id:
+                await bot.highrise.walk_to(Position(position.x - 1.0, position.y, position.z - 1.0, position.facing))
+                break
+        await asyncio.sleep(2.5)
+
+async def event_follow(bot, room, duration, horizon):
+    room_state = RoomState(bot)
+    room.room_state = room_state
+    follower = movement.Follower(bot, room_state, room.target_user.id, horizon=horizon)
+    task = asyncio.create_task(follower.run())
+    await asyncio.sleep(duration)
+    follower.stop()
+    await task
+
+async def simulate(strategy, minutes, seed, horizon):
+    duration = minutes * 60
+    room = FakeRoom(seed)
+    bot = SimpleNamespace(highrise=FakeHighrise(room))
+    errors = []
+
+    async def sample():
+        loop = asyncio.get_running_loop()
+        while loop.time() < duration:
+            now = loop.time()
+            tx, tz = room.target.position(now)
+            desired = (tx + movement.FOLLOW_OFFSET[0], tz + movement.FOLLOW_OFFSET[1])
+            errors.append(math.dist(room.bot.position(now), desired))
+            await asyncio.sleep(SAMPLE_INTERVAL)
+
+    if strategy == "poll":
+        follow = poll_follow(bot, room, duration)
+    else:
+        follow = event_follow(bot, room, duration, horizon if strategy == "predict" else 0.0)
+    await asyncio.gather(room.run_target(duration), sample(), follow)
+
+    errors.sort()
+    calls = bot.highrise.calls
+    return {
+        "strategy": strategy,
+        "minutes": minutes,
+        "walk_to_per_min": round(calls["walk_to"] / minutes, 1),
+        "get_room_users_per_min": round(calls["get_room_users"] / minutes, 1),
+        "api_calls_per_min": round(sum(calls.values()) / minutes, 1),
+        "mean_error": round(sum(errors) / len(errors), 3),
+        "p95_error": round(errors[int(0.95 * (len(errors) - 1))], 3),
+        "max_error": round(errors[-1], 3)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--minutes', type=float, default=10.0, help="simulated minutes per strategy")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--strategy', action='append', choices=["poll", "event", "predict"])
+    parser.add_argument('--horizon', type=float, default=0.5, help="prediction horizon (s) for the predict strategy")
+    parser.add_argument('--output', help="also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = []
+    for strategy in args.strategy or ["poll", "event", "predict"]:
+        loop = VirtualTimeLoop()
+        try:
+            result = loop.run_until_complete(simulate(strategy, args.minutes, args.seed, args.horizon))
+        finally:
+            loop.close()
+        results.append(result)
+        print(f"{strategy:>8}  api calls/min {result['api_calls_per_min']:>6}  walk_to/min {result['walk_to_per_min']:>6}  "
+              f"error mean {result['mean_error']:>6} p95 {result['p95_error']:>6} max {result['max_error']:>6}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
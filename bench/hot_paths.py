@@ -0,0 +1,275 @@
+"""Micro-benchmarks for the bot's hot paths as the number of profiles grows.
+
+Each size gets a fresh synthetic profiles.json in a temporary data directory
+(the real data/ is never touched) and a fake bot whose highrise client only
+counts calls. Every operation runs until --iterations samples or --budget
+seconds, whichever comes first:
+
+    on_message           ChatHandler.on_message for plain chat (XP, stats, achievements)
+    add_xp               xp_manager.add_xp
+    get_leaderboard      xp_manager.get_leaderboard(10)
+    check_achievements   achievements_manager.check_and_unlock_achievements
+    claim_event_reward   event_manager.claim_event_reward for users with finished quests
+    leaderboard_route    GET /leaderboard with a changed profiles.json (through the
+                         Flask test client, or dashboard_data when Flask is missing)
+
+    python bench/hot_paths.py --sizes 1000 10000 100000 --output results.json
+    python bench/hot_paths.py --sizes 1000 --op add_xp --op on_message
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT)
+
+import dashboard_data  # noqa: E402
+from bot.core import profile_manager  # noqa: E402
+from bot.handlers.chat import ChatHandler  # noqa: E402
+from bot.utils import (achievements_manager, change_feed, emote_manager, event_manager,  # noqa: E402
+                       level_curve, modlog, roles, session_tracker, warnings_store, xp_limiter, xp_manager)
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+BENCH_EVENT_ID = "bench_event"
+# Every EVENT_PARTICIPANT_EVERY-th synthetic user has finished the bench event's quests
+EVENT_PARTICIPANT_EVERY = 4
+
+class FakeHighrise:
+    """Stand-in for bot.highrise: every coroutine method succeeds after `latency` seconds and is counted.
+
+    get_room_users answers from `room_users`, a list of (user, position) pairs.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = Counter()
+        self.room_users = []
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            self.calls[name] += 1
+            if self.latency:
+                await asyncio.sleep(self.latency)
+
+        return call
+
+    async def get_room_users(self):
+        self.calls["get_room_users"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return SimpleNamespace(content=list(self.room_users))
+
+class FakeBot:
+    def __init__(self, latency=0.0):
+        self.highrise = FakeHighrise(latency)
+
+    async def send_emote(self, user_id, emote_name):
+        await self.highrise.send_emote(user_id, emote_name)
+
+def redirect_data(data_dir):
+    """Point every module that persists data at data_dir."""
+    profile_manager.PROFILES_FILE = os.path.join(data_dir, 'profiles.json')
+    dashboard_data.DATA_DIR = data_dir
+    dashboard_data.PROFILES_FILE = profile_manager.PROFILES_FILE
+    change_feed.DATA_DIR = data_dir
+    change_feed.CHANGES_FILE = os.path.join(data_dir, 'changes.jsonl')
+    event_manager.DATA_DIR = data_dir
+    event_manager.EVENTS_FILE = os.path.join(data_dir, 'events.json')
+    level_curve.LEVEL_CURVE_FILE = os.path.join(data_dir, 'level_curve.json')
+    emote_manager.EMOTE_DURATIONS_FILE = os.path.join(data_dir, 'emote_durations.json')
+    modlog.DATA_DIR = data_dir
+    modlog.MODLOG_FILE = os.path.join(data_dir, 'modlog.jsonl')
+    modlog.LEGACY_MODLOG_FILE = os.path.join(data_dir, 'modlog.json')
+    modlog.INDEX_FILE = os.path.join(data_dir, 'modlog_index.json')
+    warnings_store.DATA_DIR = data_dir
+    warnings_store.WARNINGS_DB = os.path.join(data_dir, 'warnings.db')
+    warnings_store.LEGACY_WARNINGS_FILE = os.path.join(data_dir, 'warnings.json')
+    roles.ROLES_FILE = os.path.join(data_dir, 'roles.json')
+    session_tracker.SESSIONS_FILE = os.path.join(data_dir, 'sessions.json')
+
+def user_id_for(i):
+    return f"user{i:07d}"
+
+def make_profile(i, rng):
+    """A profile shaped like profile_manager.create_profile's, with some history."""
+    messages = int(rng.expovariate(1 / 150))
+    xp = messages + rng.randrange(0, 500)
+    profile = {
+        "name": f"User{i}",
+        "birthday": None,
+        "age": None,
+        "stats": {
+            "messages": messages,
+            "time_spent": rng.randrange(0, 900),
+            "xp": xp,
+            "level": xp_manager.calculate_level(xp),
+            "games_played": rng.randrange(0, 40),
+            "room_joins": rng.randrange(1, 60)
+        },
+        "wallet": {"coins": rng.randrange(0, 1000)},
+        "achievements": ["first_message"] if messages else [],
+        "inventory": []
+    }
+    if i % EVENT_PARTICIPANT_EVERY == 0:
+        profile["event_progress"] = {BENCH_EVENT_ID: {"chat": 10}}
+    return profile
+
+def make_profiles(count, seed=0):
+    rng = random.Random(seed)
+    return {user_id_for(i): make_profile(i, rng) for i in range(count)}
+
+def bench_event():
+    now = datetime.now(timezone.utc)
+    return {
+        "id": BENCH_EVENT_ID,
+        "name": "Benchmark Event",
+        "start": (now - timedelta(days=1)).isoformat(),
+        "end": (now + timedelta(days=1)).isoformat(),
+        "quests": [{"id": "chat", "description": "Send 10 messages", "target": 10}],
+        "rewards": [{"item_id": "bench_badge", "quantity": 1}]
+    }
+
+def write_data(data_dir, count, seed):
+    with open(profile_manager.PROFILES_FILE, 'w') as f:
+        json.dump(make_profiles(count, seed), f, indent=2)
+    with open(event_manager.EVENTS_FILE, 'w') as f:
+        json.dump([bench_event()], f, indent=2)
+    for path in (change_feed.CHANGES_FILE, change_feed.CHANGES_FILE + '.1'):
+        if os.path.exists(path):
+            os.remove(path)
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = min(int(round(pct / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[k]
+
+def summarize(samples):
+    samples = sorted(samples)
+    total = sum(samples)
+    ms = lambda seconds: round(seconds * 1000, 3)
+    return {
+        "samples": len(samples),
+        "ops_per_s": round(len(samples) / total, 1) if total else 0.0,
+        "mean_ms": ms(total / len(samples)) if samples else 0.0,
+        "min_ms": ms(samples[0]) if samples else 0.0,
+        "p50_ms": ms(percentile(samples, 50)),
+        "p95_ms": ms(percentile(samples, 95)),
+        "p99_ms": ms(percentile(samples, 99)),
+        "max_ms": ms(samples[-1]) if samples else 0.0
+    }
+
+def measure(run, iterations, budget):
+    """Time run(i) for i = 0, 1, ... until `iterations` samples or `budget` seconds (at least 3 samples)."""
+    samples = []
+    deadline = time.perf_counter() + budget
+    for i in range(iterations):
+        started = time.perf_counter()
+        run(i)
+        samples.append(time.perf_counter() - started)
+        if len(samples) >= 3 and time.perf_counter() > deadline:
+            break
+    return samples
+
+def leaderboard_route():
+    """(label, fn) serving /leaderboard the way the dashboard does, rebuilt each call."""
+    try:
+        import dashboard_server
+    except ImportError:
+        return "dashboard_data", lambda: dashboard_data.build_leaderboard(dashboard_data.load_profiles())
+    client = dashboard_server.app.test_client()
+
+    def get():
+        # A new mtime is what a profile write looks like to the response cache
+        os.utime(dashboard_data.PROFILES_FILE, ns=(time.time_ns(), time.time_ns()))
+        response = client.get('/leaderboard')
+        if response.status_code != 200:
+            raise RuntimeError(f"/leaderboard returned {response.status_code}")
+
+    return "flask", get
+
+def operations(count, handler, loop, rng):
+    participants = [user_id_for(i) for i in range(0, count, EVENT_PARTICIPANT_EVERY)]
+    rng.shuffle(participants)
+    pick = lambda: user_id_for(rng.randrange(count))
+    route_via, route = leaderboard_route()
+    return {
+        "on_message": (None, lambda i: loop.run_until_complete(handler.on_message(pick(), f"hello room {i}"))),
+        "add_xp": (None, lambda i: xp_manager.add_xp(pick(), 1)),
+        "get_leaderboard": (None, lambda i: xp_manager.get_leaderboard(10)),
+        "check_achievements": (None, lambda i: achievements_manager.check_and_unlock_achievements(pick())),
+        "claim_event_reward": (None, lambda i: event_manager.claim_event_reward(
+            participants[i % len(participants)], BENCH_EVENT_ID)),
+        "leaderboard_route": (route_via, lambda i: route())
+    }
+
+def run_size(count, ops, iterations, budget, seed):
+    with tempfile.TemporaryDirectory(prefix='bench-hot-paths-') as data_dir:
+        redirect_data(data_dir)
+        write_data(data_dir, count, seed)
+        profiles_bytes = os.path.getsize(profile_manager.PROFILES_FILE)
+        bot = FakeBot()
+        handler = ChatHandler(bot)
+        # Fresh limiter per size so earlier sizes do not rate-limit this one
+        xp_limiter._limiter = xp_limiter.XPRateLimiter()
+        loop = asyncio.new_event_loop()
+        try:
+            available = operations(count, handler, loop, random.Random(seed))
+            results = []
+            for name in ops:
+                via, run = available[name]
+                result = {"op": name, "profiles": count, "profiles_bytes": profiles_bytes}
+                if via:
+                    result["via"] = via
+                before = Counter(bot.highrise.calls)
+                result.update(summarize(measure(run, iterations, budget)))
+                result["highrise_calls"] = dict(bot.highrise.calls - before)
+                results.append(result)
+                print(f"{count:>8} {name:>20}  {result['ops_per_s']:>9} ops/s  p50 {result['p50_ms']:>10} ms  "
+                      f"p99 {result['p99_ms']:>10} ms  ({result['samples']} samples)")
+        finally:
+            loop.close()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="profile counts to test")
+    parser.add_argument('--op', action='append', choices=['on_message', 'add_xp', 'get_leaderboard', 'check_achievements',
+                                                          'claim_event_reward', 'leaderboard_route'],
+                        help="operation to measure, repeatable (default: all)")
+    parser.add_argument('--iterations', type=int, default=200, help="samples per operation and size")
+    parser.add_argument('--budget', type=float, default=10.0, help="seconds per operation and size before stopping early")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    ops = args.op or ['on_message', 'add_xp', 'get_leaderboard', 'check_achievements',
+                      'claim_event_reward', 'leaderboard_route']
+    results = []
+    for count in args.sizes:
+        results.extend(run_size(count, ops, args.iterations, args.budget, args.seed))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                "started": datetime.now(timezone.utc).isoformat(),
+                "python": sys.version.split()[0],
+                "iterations": args.iterations,
+                "budget": args.budget,
+                "seed": args.seed,
+                "results": results
+            }, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,354 @@
+"""Replay load test: a chat trace driven through ChatHandler and EventHandler offline.
+
+A trace is a JSON-lines file, one event per line, in time order:
+
+    {"t": 0.0, "type": "join", "user_id": "user0000001", "username": "User1"}
+    {"t": 0.4, "type": "chat", "user_id": "user0000001", "message": "hi all"}
+    {"t": 1.2, "type": "vote", "user_id": "user0000001", "choice": "A"}
+    {"t": 2.0, "type": "emote", "user_id": "user0000001", "emote": "wave"}
+    {"t": 9.5, "type": "leave", "user_id": "user0000001", "username": "User1"}
+
+chat messages go to ChatHandler.on_message as sent (commands included),
+emotes as "!loop <emote>" (stopped again by a later "!stop" chat line or at
+the end of the replay), joins and leaves to EventHandler. Votes go to a
+PollEngine holding one open poll (options A-D) and are answered with a
+whisper the way the room's -vote command answers them. Without --trace a
+synthetic trace is generated.
+
+The handlers run against synthetic profiles in a temporary data directory and
+a stand-in highrise client that counts calls and answers after --api-latency
+seconds. Events of one user are handled in order by the same worker; up to
+--concurrency workers run at once. The trace is replayed as fast as possible,
+or at --speed times its own pace. Reported: events/s, p50/p95/p99 handler
+latency overall and per event type, every highrise call made (startup and the
+closing checkpoint included), and bytes written per data file (the sqlite
+warnings store is not counted).
+
+    python bench/replay.py --profiles 10000 --events 5000 --concurrency 8
+    python bench/replay.py --trace busy_event.jsonl --speed 10 --output replay.json
+    python bench/replay.py --events 2000 --write-trace synthetic.jsonl
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import zlib
+from collections import Counter, defaultdict
+from types import SimpleNamespace
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT)
+
+from hot_paths import (FakeBot, percentile, redirect_data, user_id_for, write_data)  # noqa: E402
+from bot.core import profile_manager  # noqa: E402
+from bot.handlers.chat import ChatHandler  # noqa: E402
+from bot.handlers.events import EventHandler  # noqa: E402
+from bot.utils import change_feed, modlog, roles, session_tracker, xp_limiter  # noqa: E402
+from bot.utils.poll_engine import PollEngine  # noqa: E402
+
+EVENT_TYPES = ('chat', 'vote', 'emote', 'join', 'leave')
+# Modules whose file writes are counted
+PERSISTENCE_MODULES = (profile_manager, change_feed, session_tracker, roles, modlog)
+
+SYNTHETIC_MIX = {'chat': 0.78, 'vote': 0.08, 'emote': 0.04, 'join': 0.05, 'leave': 0.05}
+SYNTHETIC_RATE = 5.0  # events per second of trace time
+# The room fills to this share of the trace's users before the mix applies
+SYNTHETIC_OCCUPANCY = 0.5
+SYNTHETIC_COMMAND_SHARE = 0.1  # chat lines that are commands
+SYNTHETIC_COMMANDS = ['!events', '!event', '!stop', '!claim bench_event']
+SYNTHETIC_EMOTES = ['wave', 'dance', 'laugh', 'clap']
+SYNTHETIC_PHRASES = ['hi all', 'lol', 'nice', 'brb', 'what song is this', 'gg', 'hello', 'same',
+                     'who wants to play', 'love this room']
+# Share of trace users without a profile (they earn nothing but still cost a lookup)
+SYNTHETIC_GUESTS = 0.1
+REPLAY_ROOM = "replay_room"
+REPLAY_POLL_OPTIONS = ['Red', 'Green', 'Blue', 'Yellow']
+
+def synthetic_trace(events, profiles, users, seed=0):
+    """A trace of `events` events from `users` users joining, chatting, voting, emoting and leaving."""
+    rng = random.Random(seed)
+    user_ids = [user_id_for(rng.randrange(profiles)) if rng.random() >= SYNTHETIC_GUESTS
+                else f"guest{i:05d}" for i in range(users)]
+    user_ids = list(dict.fromkeys(user_ids))
+    present = set()
+    occupancy = max(1, int(len(user_ids) * SYNTHETIC_OCCUPANCY))
+    kinds, weights = zip(*SYNTHETIC_MIX.items())
+    trace = []
+    t = 0.0
+    while len(trace) < events:
+        t += rng.expovariate(SYNTHETIC_RATE)
+        kind = rng.choices(kinds, weights)[0]
+        if kind == 'join' or len(present) < occupancy:
+            absent = [user_id for user_id in user_ids if user_id not in present]
+            if not absent:
+                continue
+            user_id = rng.choice(absent)
+            present.add(user_id)
+            kind = 'join'
+        else:
+            user_id = rng.choice(sorted(present))
+        event = {"t": round(t, 3), "type": kind, "user_id": user_id}
+        if kind in ('join', 'leave'):
+            event["username"] = user_id.capitalize()
+            if kind == 'leave':
+                present.discard(user_id)
+        elif kind == 'chat':
+            if rng.random() < SYNTHETIC_COMMAND_SHARE:
+                event["message"] = rng.choice(SYNTHETIC_COMMANDS)
+            else:
+                event["message"] = f"{rng.choice(SYNTHETIC_PHRASES)} {rng.randrange(1000)}"
+        elif kind == 'vote':
+            event["choice"] = rng.choice('ABCD')
+        else:
+            event["emote"] = rng.choice(SYNTHETIC_EMOTES)
+        trace.append(event)
+    return trace
+
+def load_trace(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        trace = [json.loads(line) for line in f if line.strip()]
+    for i, event in enumerate(trace):
+        if event.get("type") not in EVENT_TYPES or "user_id" not in event:
+            raise ValueError(f"{path}:{i + 1}: expected a type in {EVENT_TYPES} and a user_id")
+    return trace
+
+def save_trace(trace, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        for event in trace:
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+class _CountingFile:
+    def __init__(self, f, counter, name):
+        self._f = f
+        self._counter = counter
+        self._name = name
+
+    def write(self, data):
+        self._counter[self._name] += len(data.encode('utf-8')) if isinstance(data, str) else len(data)
+        return self._f.write(data)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return self._f.__exit__(*exc)
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+class WriteCounter:
+    """Counts bytes written per file name by shadowing `open` in the given modules."""
+
+    def __init__(self, modules):
+        self.modules = modules
+        self.bytes = Counter()
+
+    def open(self, path, mode='r', *args, **kwargs):
+        f = open(path, mode, *args, **kwargs)
+        if any(flag in mode for flag in 'wax+'):
+            # Temporary files count toward the file they replace
+            name = os.path.basename(path)
+            return _CountingFile(f, self.bytes, name[:-4] if name.endswith('.tmp') else name)
+        return f
+
+    def __enter__(self):
+        for module in self.modules:
+            module.open = self.open
+        return self
+
+    def __exit__(self, *exc):
+        for module in self.modules:
+            del module.open
+
+class TraceClockLimiter(xp_limiter.XPRateLimiter):
+    """The XP limiter on the trace's clock, so a fast replay is limited like the original traffic."""
+
+    now = 0.0
+
+    def allow(self, user_id, message, now=None):
+        return super().allow(user_id, message, self.now if now is None else now)
+
+class Replay:
+    def __init__(self, bot, chat_handler, event_handler, polls, limiter, concurrency, speed):
+        self.bot = bot
+        self.chat = chat_handler
+        self.events = event_handler
+        self.polls = polls
+        self.limiter = limiter
+        self.concurrency = concurrency
+        self.speed = speed
+        self.latencies = defaultdict(list)  # event type -> seconds
+        self.errors = Counter()
+
+    def _message(self, event):
+        kind = event["type"]
+        if kind == 'emote':
+            return f"!loop {event.get('emote', 'wave')}"
+        return event.get("message", "")
+
+    async def dispatch(self, event):
+        kind = event["type"]
+        user_id = event["user_id"]
+        self.limiter.now = event.get("t", 0.0)
+        if kind == 'join':
+            user = SimpleNamespace(id=user_id, username=event.get("username", user_id))
+            self.bot.highrise.room_users.append((user, None))
+            await self.events.on_user_join(user)
+        elif kind == 'leave':
+            user = SimpleNamespace(id=user_id, username=event.get("username", user_id))
+            self.bot.highrise.room_users = [entry for entry in self.bot.highrise.room_users if entry[0].id != user_id]
+            await self.events.on_user_leave(user)
+        elif kind == 'vote':
+            await self.vote(user_id, event.get("choice", "A"))
+        else:
+            await self.chat.on_message(user_id, self._message(event))
+
+    async def vote(self, user_id, choice):
+        # Same engine call and replies as the room's -vote command
+        status = self.polls.vote(REPLAY_ROOM, user_id, choice)
+        if status == "ok":
+            await self.bot.highrise.send_whisper(user_id, f"✅ Vote recorded: {choice.strip()}")
+        elif status == "duplicate":
+            await self.bot.highrise.send_whisper(user_id, "❌ You already voted in this poll!")
+        elif status == "invalid":
+            labels = " / ".join(entry["label"] for entry in self.polls.results(REPLAY_ROOM)["options"])
+            await self.bot.highrise.send_whisper(user_id, f"❌ Vote must be one of: {labels}")
+        else:
+            await self.bot.highrise.send_whisper(user_id, "❌ No active poll to vote on!")
+
+    async def _worker(self, queue):
+        while True:
+            event = await queue.get()
+            if event is None:
+                return
+            started = time.perf_counter()
+            try:
+                await self.dispatch(event)
+            except Exception as e:
+                self.errors[f"{event['type']}: {type(e).__name__}: {e}"] += 1
+            self.latencies[event["type"]].append(time.perf_counter() - started)
+
+    async def run(self, trace):
+        # Each user always lands on the same worker, so their events stay in order
+        queues = [asyncio.Queue() for _ in range(self.concurrency)]
+        workers = [asyncio.create_task(self._worker(queue)) for queue in queues]
+        started = time.perf_counter()
+        first = trace[0].get("t", 0.0) if trace else 0.0
+        for event in trace:
+            if self.speed:
+                delay = (event.get("t", 0.0) - first) / self.speed - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            queues[zlib.crc32(event["user_id"].encode('utf-8')) % self.concurrency].put_nowait(event)
+            # Let workers start while the dispatcher is still feeding them
+            await asyncio.sleep(0)
+        for queue in queues:
+            queue.put_nowait(None)
+        await asyncio.gather(*workers)
+        elapsed = time.perf_counter() - started
+        for task in list(self.chat.emote_manager.user_tasks.values()):
+            task.cancel()
+        return elapsed
+
+def latency_summary(samples):
+    samples = sorted(samples)
+    ms = lambda seconds: round(seconds * 1000, 3)
+    return {
+        "events": len(samples),
+        "p50_ms": ms(percentile(samples, 50)),
+        "p95_ms": ms(percentile(samples, 95)),
+        "p99_ms": ms(percentile(samples, 99)),
+        "max_ms": ms(samples[-1]) if samples else 0.0
+    }
+
+async def replay(trace, profiles, concurrency, speed, api_latency, seed):
+    with tempfile.TemporaryDirectory(prefix='bench-replay-') as data_dir:
+        redirect_data(data_dir)
+        write_data(data_dir, profiles, seed)
+        bot = FakeBot(api_latency)
+        chat_handler = ChatHandler(bot)
+        event_handler = EventHandler(bot)
+        event_handler.sessions.path = session_tracker.SESSIONS_FILE
+        limiter = xp_limiter._limiter = TraceClockLimiter()
+        polls = PollEngine(lambda text: bot.highrise.chat(text))
+        runner = Replay(bot, chat_handler, event_handler, polls, limiter, concurrency, speed)
+        with WriteCounter(PERSISTENCE_MODULES) as writes:
+            await event_handler.on_start()
+            # Open for the whole replay; closed below without a final announcement
+            polls.create(REPLAY_ROOM, "Replay poll", REPLAY_POLL_OPTIONS, "replay", "Replay", duration=24 * 60 * 60)
+            elapsed = await runner.run(trace)
+            # The checkpoint the bot would run next, for the sessions the trace left open
+            started = time.perf_counter()
+            event_handler.sessions.checkpoint()
+            checkpoint_ms = round((time.perf_counter() - started) * 1000, 3)
+        polls.close(REPLAY_ROOM)
+        if event_handler._checkpoint_task is not None:
+            event_handler._checkpoint_task.cancel()
+        await asyncio.sleep(0)
+
+    all_latencies = [sample for samples in runner.latencies.values() for sample in samples]
+    return {
+        "events": len(trace),
+        "profiles": profiles,
+        "concurrency": concurrency,
+        "speed": speed,
+        "api_latency": api_latency,
+        "elapsed_s": round(elapsed, 3),
+        "events_per_s": round(len(trace) / elapsed, 1) if elapsed else 0.0,
+        "latency": latency_summary(all_latencies),
+        "by_type": {kind: latency_summary(samples) for kind, samples in sorted(runner.latencies.items())},
+        "highrise_calls": dict(bot.highrise.calls.most_common()),
+        "bytes_written": dict(writes.bytes.most_common()),
+        "bytes_written_total": sum(writes.bytes.values()),
+        "checkpoint_ms": checkpoint_ms,
+        "xp_limiter": dict(limiter.stats),
+        "polls": dict(polls.stats),
+        "errors": dict(runner.errors.most_common())
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--trace', help="JSON-lines trace to replay (default: a synthetic one)")
+    parser.add_argument('--events', type=int, default=500, help="synthetic trace length")
+    parser.add_argument('--users', type=int, default=200, help="distinct users in the synthetic trace")
+    parser.add_argument('--profiles', type=int, default=1000, help="synthetic profiles in the data directory")
+    parser.add_argument('--concurrency', type=int, default=4, help="events handled at once")
+    parser.add_argument('--speed', type=float, default=0.0,
+                        help="replay at this multiple of the trace's pace (default 0: as fast as possible)")
+    parser.add_argument('--api-latency', type=float, default=0.0, help="seconds each highrise call takes")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--write-trace', help="save the synthetic trace to this file")
+    parser.add_argument('--output', help="also write the results as JSON to this file")
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    if args.trace:
+        trace = load_trace(args.trace)
+    else:
+        trace = synthetic_trace(args.events, args.profiles, args.users, args.seed)
+        if args.write_trace:
+            save_trace(trace, args.write_trace)
+
+    result = asyncio.run(replay(trace, args.profiles, args.concurrency, args.speed, args.api_latency, args.seed))
+    result["trace"] = args.trace or "synthetic"
+    latency = result["latency"]
+    print(f"{result['events']} events in {result['elapsed_s']} s: {result['events_per_s']} events/s  "
+          f"p50 {latency['p50_ms']} ms  p95 {latency['p95_ms']} ms  p99 {latency['p99_ms']} ms")
+    for kind, summary in result["by_type"].items():
+        print(f"  {kind:>6} {summary['events']:>7}  p50 {summary['p50_ms']:>9} ms  p99 {summary['p99_ms']:>9} ms")
+    print(f"highrise calls: {result['highrise_calls']}")
+    print(f"bytes written: {result['bytes_written_total']} {result['bytes_written']}")
+    if result["errors"]:
+        print(f"errors: {result['errors']}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 from bot.core import profile_manager
 from bot.utils import achievements_manager
+from bot.utils import roles
 
 class AchievementCommands:
     def __init__(self, bot):
@@ -47,9 +48,4 @@ class AchievementCommands:
         return f"{achievement['name']} - {description}\nStatus: {progress}"
 
     async def is_admin(self, user_id):
-        # Placeholder for admin check logic
-        # Replace with your actual admin role check
-        profile = profile_manager.get_profile(user_id)
-        if profile and profile.get("role") in ["admin", "owner"]:
-            return True
-        return False
+        return roles.require_role(user_id, "admin")
@@ -1,10 +1,12 @@
 import re
-import json
-import os
 import time
 from bot.utils import roles
+from bot.utils import warnings_store
 
-WARNINGS_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'warnings.json')
+# Auto-mute a user who collects this many warnings within the window
+WARN_ESCALATION_THRESHOLD = 3
+WARN_ESCALATION_WINDOW = 24 * 60 * 60  # seconds
+WARN_ESCALATION_MUTE_MINUTES = 30
 
 class AdminCommands:
     def __init__(self, bot):
@@ -34,17 +36,6 @@ class AdminCommands:
         else:
             return "Unknown command."
 
-    def load_warnings(self):
-        try:
-            with open(WARNINGS_FILE, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-
-    def save_warnings(self, warnings):
-        with open(WARNINGS_FILE, 'w') as f:
-            json.dump(warnings, f, indent=2)
-
     async def warn(self, caller_id, args):
         if not roles.require_role(caller_id, "admin"):
             return "You do not have permission to warn users."
@@ -52,18 +43,20 @@ class AdminCommands:
             return "Usage: !warn @user [reason]"
         target_user = self.parse_mention(args[0])
         reason = " ".join(args[1:]) if len(args) > 1 else "No reason provided"
-        warnings = self.load_warnings()
-        user_warnings = warnings.get(target_user, [])
-        user_warnings.append({
-            "reason": reason,
-            "by": caller_id,
-            "time": int(time.time())
-        })
-        warnings[target_user] = user_warnings
-        self.save_warnings(warnings)
+        warnings_store.add_warning(target_user, reason, caller_id)
         from bot.utils import modlog
         modlog.log_action("warn", caller_id, target_user, reason)
-        return f"User @{target_user} has been warned. Reason: {reason}"
+        msg = f"User @{target_user} has been warned. Reason: {reason}"
+
+        recent = warnings_store.count_warnings(target_user, window=WARN_ESCALATION_WINDOW)
+        # Escalate once per mute: further warnings while the auto-mute runs add nothing
+        if recent >= WARN_ESCALATION_THRESHOLD and self.muted_users.get(target_user, 0) <= time.time():
+            self.muted_users[target_user] = time.time() + WARN_ESCALATION_MUTE_MINUTES * 60
+            window_hours = WARN_ESCALATION_WINDOW // 3600
+            modlog.log_action("mute", caller_id, target_user,
+                              f"Auto-mute: {recent} warnings in {window_hours}h", duration=WARN_ESCALATION_MUTE_MINUTES)
+            msg += f"\nUser @{target_user} has been auto-muted for {WARN_ESCALATION_MUTE_MINUTES} minutes ({recent} warnings in {window_hours}h)."
+        return msg
 
     async def warnings(self, caller_id, args):
         if not roles.require_role(caller_id, "admin"):
@@ -71,8 +64,7 @@ class AdminCommands:
         if len(args) < 1:
             return "Usage: !warnings @user"
         target_user = self.parse_mention(args[0])
-        warnings = self.load_warnings()
-        user_warnings = warnings.get(target_user, [])
+        user_warnings = warnings_store.get_warnings(target_user)
         if not user_warnings:
             return f"User @{target_user} has no warnings."
         msg_lines = [f"Warnings for @{target_user}:"]
@@ -87,10 +79,7 @@ class AdminCommands:
         if len(args) < 1:
             return "Usage: !clearwarns @user"
         target_user = self.parse_mention(args[0])
-        warnings = self.load_warnings()
-        if target_user in warnings:
-            del warnings[target_user]
-            self.save_warnings(warnings)
+        if warnings_store.clear_warnings(target_user):
             from bot.utils import modlog
             modlog.log_action("clearwarn", caller_id, target_user)
             return f"Warnings for @{target_user} have been cleared."
@@ -122,6 +111,16 @@ class AdminCommands:
         modlog.log_action("mute", caller_id, target_user, duration=minutes)
         return f"User @{target_user} has been muted for {minutes} minutes."
 
+    def is_muted(self, user_id, now=None):
+        """True while a !mute or warn auto-mute on user_id runs; expired mutes are dropped."""
+        unmute_time = self.muted_users.get(user_id)
+        if unmute_time is None:
+            return False
+        if unmute_time <= (now or time.time()):
+            del self.muted_users[user_id]
+            return False
+        return True
+
     def parse_mention(self, mention):
         if mention.startswith('@'):
             return mention[1:]
@@ -1,4 +1,3 @@
-from bot.core import profile_manager
 from bot.utils import daily_rewards
 import datetime
 
@@ -7,27 +6,21 @@ class DailyRewardsCommands:
         self.bot = bot
 
     async def daily(self, user_id):
-        if not profile_manager.has_profile(user_id):
-            return "You need to create a profile to claim daily rewards."
-
-        can_claim, result = daily_rewards.can_claim_daily(user_id)
-        if not can_claim:
-            next_claim_time = datetime.datetime.fromtimestamp(result)
-            return f"You have already claimed your daily reward. Next claim available at {next_claim_time.strftime('%Y-%m-%d %H:%M:%S')}."
-
-        success, reward = daily_rewards.claim_daily(user_id)
+        # One call checks, updates the streak and credits the coins
+        success, result = daily_rewards.claim_daily(user_id)
         if success:
-            return f"Daily reward claimed! You received {reward} coins. Keep your streak going!"
-        else:
-            return "Failed to claim daily reward. Please try again later."
+            return f"Daily reward claimed! You received {result} coins. Keep your streak going!"
+        if isinstance(result, str):
+            return "You need to create a profile to claim daily rewards."
+        next_claim_time = datetime.datetime.fromtimestamp(result)
+        return f"You have already claimed your daily reward. Next claim available at {next_claim_time.strftime('%Y-%m-%d %H:%M:%S')}."
 
     async def streak(self, user_id):
-        if not profile_manager.has_profile(user_id):
+        streak = daily_rewards.get_streak(user_id)
+        if streak is None:
             return "You need to create a profile to view your streak."
 
-        profile = profile_manager.get_profile(user_id)
-        daily_streak = profile.get("daily_streak", 0)
-        next_claim_time = daily_rewards.get_next_claim_time(user_id)
-        next_claim_str = next_claim_time.strftime('%Y-%m-%d %H:%M:%S') if next_claim_time else "N/A"
+        daily_streak, next_claim = streak
+        next_claim_str = datetime.datetime.fromtimestamp(next_claim).strftime('%Y-%m-%d %H:%M:%S')
 
         return f"Your current daily streak is {daily_streak} days. Next claim available at {next_claim_str}."
@@ -1,5 +1,6 @@
 from bot.core import profile_manager
 from bot.utils import emote_manager
+from bot.utils import roles
 from bot.utils.xp_manager import add_xp
 import asyncio
 
@@ -21,13 +22,9 @@ class ItemUsageCommands:
             await self.emote_manager.play_emote(user_id, "happy")
             effect_msg = "You used a 🌹 Rose and performed a happy emote!"
         elif item_id == "vip-token":
-            # Grant VIP role (assuming role management elsewhere)
-            profile = profile_manager.get_profile(user_id)
-            if profile:
-                profile["role"] = "vip"
-                profiles = profile_manager.load_profiles()
-                profiles[user_id] = profile
-                profile_manager.save_profiles(profiles)
+            # Grant VIP role without demoting admin/owner users
+            if roles.get_level(user_id) < roles.ROLE_HIERARCHY["vip"]:
+                roles.set_role(user_id, "vip")
             effect_msg = "You used a 🎟️ VIP Token and gained VIP role!"
         elif item_id == "xp-book":
             # Add 100 XP
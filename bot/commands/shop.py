@@ -1,6 +1,7 @@
 import json
 import os
 from bot.core import profile_manager
+from bot.utils import roles
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'data')
 SHOP_ITEMS_FILE = os.path.join(DATA_DIR, 'shop_items.json')
@@ -68,8 +69,7 @@ class ShopCommands:
 
     async def gift(self, user_id, target_user_id, item_id):
         # Admin only command
-        profile = profile_manager.get_profile(user_id)
-        if not profile or profile.get("role") not in ["admin", "owner"]:
+        if not roles.require_role(user_id, "admin"):
             return "You do not have permission to use this command."
 
         if not profile_manager.has_profile(target_user_id):
@@ -1,4 +1,5 @@
 from bot.core import profile_manager
+from bot.utils import roles
 
 class WalletCommands:
     def __init__(self, bot):
@@ -29,8 +30,7 @@ class WalletCommands:
 
     async def give(self, user_id, target_user_id, amount):
         # Admin only command
-        profile = profile_manager.get_profile(user_id)
-        if not profile or profile.get("role") not in ["admin", "owner"]:
+        if not roles.require_role(user_id, "admin"):
             return "You do not have permission to use this command."
 
         if not profile_manager.has_profile(target_user_id):
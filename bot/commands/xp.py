@@ -1,4 +1,4 @@
-from bot.utils.xp_manager import get_xp, calculate_level, get_leaderboard
+from bot.utils.xp_manager import get_xp, level_progress, get_leaderboard
 from ..core.profile_manager import has_profile
 
 def generate_progress_bar(percentage):
@@ -15,10 +15,9 @@ class XPCommands:
         if not has_profile(user_id):
             return "You need to create a profile to view your XP and level."
 
-        xp, level = get_xp(user_id)
-        next_level_xp = (level + 1) * 100
-        progress = (xp - (level * 100)) / 100 if level > 0 else xp / 100
-        progress = max(0, min(progress, 1))  # Clamp between 0 and 1
+        xp, _ = get_xp(user_id)
+        # Same curve that assigns levels, so the bar always matches the level shown
+        level, _, _, progress = level_progress(xp)
 
         progress_bar = generate_progress_bar(progress)
         percent_display = int(progress * 100)
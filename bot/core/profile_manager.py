@@ -1,8 +1,10 @@
 import json
 import os
 from threading import Lock
+from bot.utils import change_feed
 
 PROFILES_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'profiles.json')
+PROFILE_READ_CHUNK = 64 * 1024
 _lock = Lock()
 
 def load_profiles():
@@ -12,11 +14,85 @@ def load_profiles():
     except (FileNotFoundError, json.JSONDecodeError):
         return {}
 
+def iter_profiles(chunk_size=PROFILE_READ_CHUNK):
+    """Yield (user_id, profile) pairs from profiles.json, reading it in chunks.
+
+    Only one profile is decoded at a time, so memory stays bounded by the largest
+    profile rather than the whole file. Stops quietly on a missing or corrupt file.
+    """
+    decoder = json.JSONDecoder()
+    try:
+        f = open(PROFILES_FILE, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        return
+    with f:
+        buf = f.read(chunk_size)
+        eof = len(buf) < chunk_size
+        pos = _skip_ws(buf, 0)
+        if pos >= len(buf) or buf[pos] != '{':
+            return
+        pos += 1
+        while True:
+            try:
+                # An entry only counts once the separator after it has been read,
+                # so a value cut off at the chunk boundary is never mistaken for whole
+                user_id, end = decoder.raw_decode(buf, _skip_ws(buf, pos))
+                end = _skip_ws(buf, end)
+                if buf[end] != ':':
+                    return
+                profile, end = decoder.raw_decode(buf, _skip_ws(buf, end + 1))
+                end = _skip_ws(buf, end)
+                separator = buf[end]
+            except (json.JSONDecodeError, IndexError):
+                # Incomplete entry (read more) or the closing brace / corrupt data at EOF
+                if eof:
+                    return
+                chunk = f.read(chunk_size)
+                eof = len(chunk) < chunk_size
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+            yield user_id, profile
+            if separator != ',':
+                return
+            pos = end + 1
+
+def _skip_ws(buf, pos):
+    while pos < len(buf) and buf[pos] in ' \t\r\n':
+        pos += 1
+    return pos
+
 def save_profiles(profiles):
     with _lock:
         with open(PROFILES_FILE, 'w') as f:
             json.dump(profiles, f, indent=2)
 
+def update_profiles(updates):
+    """Apply several profile changes with one load and one save.
+
+    `updates` maps user_id -> fn(profile), which edits the profile in place and
+    returns a dict of changed fields to publish (or None to leave it unchanged).
+    Users without a profile are skipped. Returns {user_id: fields} for the
+    profiles that changed.
+    """
+    if not updates:
+        return {}
+    profiles = load_profiles()
+    changed = {}
+    for user_id, update in updates.items():
+        profile = profiles.get(user_id)
+        if profile is None:
+            continue
+        fields = update(profile)
+        if fields is not None:
+            changed[user_id] = fields
+    if changed:
+        save_profiles(profiles)
+        for user_id, fields in changed.items():
+            if fields:
+                change_feed.publish_profile(user_id, **fields)
+    return changed
+
 def has_profile(user_id):
     profiles = load_profiles()
     return user_id in profiles
@@ -46,6 +122,7 @@ def create_profile(user_id, name, birthday=None, age=None):
         }
     }
     save_profiles(profiles)
+    change_feed.publish_profile(user_id, name=name, level=1, xp=0, messages=0, time_spent=0, coins=0)
     return True
 
 def delete_profile(user_id):
@@ -53,6 +130,7 @@ def delete_profile(user_id):
     if user_id in profiles:
         del profiles[user_id]
         save_profiles(profiles)
+        change_feed.publish("profile_deleted", user_id=user_id)
         return True
     return False
 
@@ -98,6 +176,7 @@ def add_coins(user_id, amount):
     user["wallet"] = wallet
     profiles[user_id] = user
     save_profiles(profiles)
+    change_feed.publish_profile(user_id, coins=wallet["coins"])
     return True
 
 def remove_coins(user_id, amount):
@@ -113,6 +192,7 @@ def remove_coins(user_id, amount):
     user["wallet"] = wallet
     profiles[user_id] = user
     save_profiles(profiles)
+    change_feed.publish_profile(user_id, coins=wallet["coins"])
     return True
 
 def transfer_coins(from_id, to_id, amount):
@@ -134,4 +214,6 @@ def transfer_coins(from_id, to_id, amount):
     profiles[from_id] = from_user
     profiles[to_id] = to_user
     save_profiles(profiles)
+    change_feed.publish_profile(from_id, coins=from_wallet["coins"])
+    change_feed.publish_profile(to_id, coins=to_wallet["coins"])
     return True
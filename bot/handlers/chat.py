@@ -3,8 +3,11 @@ import logging
 from ..core import profile_manager
 from ..utils.xp_manager import add_xp
 from ..utils import achievements_manager
-from ..commands.admin import AdminHandler
+from ..commands.admin import AdminCommands
 from ..utils import emote_manager
+from ..utils import roles
+from ..utils import change_feed
+from ..utils import xp_limiter
 import asyncio
 
 logger = logging.getLogger(__name__)
@@ -12,13 +15,13 @@ logger = logging.getLogger(__name__)
 class ChatHandler:
     def __init__(self, bot):
         self.bot = bot
-        self.admin_handler = AdminHandler(bot)
+        self.admin_handler = AdminCommands(bot)
         self.emote_manager = emote_manager.EmoteManager(bot)
         self.muted_users = set()  # Optional: track muted users here
 
     async def on_message(self, user_id: str, message: str):
-        # Ignore messages from muted users (optional)
-        if user_id in self.muted_users:
+        # Ignore messages from muted users, including !mute and warn auto-mutes until they run out
+        if user_id in self.muted_users or self.admin_handler.is_muted(user_id):
             logger.info(f"Ignored message from muted user {user_id}")
             return
 
@@ -30,8 +33,13 @@ class ChatHandler:
 
         # If user has a profile, add XP and increment messages count
         if profile_manager.has_profile(user_id):
-            xp, level = add_xp(user_id, 1)
-            logger.info(f"Added 1 XP to user {user_id}. Total XP: {xp}, Level: {level}")
+            # Spam and floods earn no XP; decided in memory, but the message still counts
+            allowed, reason = xp_limiter.allow(user_id, message)
+            if allowed:
+                xp, level = add_xp(user_id, 1)
+                logger.info(f"Added 1 XP to user {user_id}. Total XP: {xp}, Level: {level}")
+            else:
+                logger.debug(f"No XP for message from user {user_id}: {reason}")
 
             # Increment messages count in profile stats
             profile = profile_manager.get_profile(user_id)
@@ -42,6 +50,7 @@ class ChatHandler:
                 profiles = profile_manager.load_profiles()
                 profiles[user_id] = profile
                 profile_manager.save_profiles(profiles)
+                change_feed.publish_profile(user_id, messages=stats['messages'])
 
             # Check and unlock achievements
             newly_unlocked = achievements_manager.check_and_unlock_achievements(user_id)
@@ -87,8 +96,7 @@ class ChatHandler:
 
         if message.startswith('!measureemotes'):
             # Admin only command
-            profile = profile_manager.get_profile(user_id)
-            if not profile or profile.get('role') not in ['admin', 'owner']:
+            if not roles.require_role(user_id, 'admin'):
                 logger.info(f"User {user_id} unauthorized to use !measureemotes")
                 return
             durations = await self.emote_manager.measure_emotes(user_id)
@@ -133,7 +141,8 @@ class ChatHandler:
 
         # For other commands, delegate to admin handler
         if message.startswith(('!warn', '!kick', '!mute', '!clearwarn')):
-            response = await self.admin_handler.handle_admin_command(user_id, message)
+            parts = message.split()
+            response = await self.admin_handler.handle_command(user_id, parts[0], parts[1:])
             logger.info(f"Admin command response: {response}")
         else:
             # Handle other commands or ignore
@@ -1,47 +1,80 @@
-from datetime import datetime
+import asyncio
 import logging
 from bot.utils.xp_manager import add_xp
 from bot.core import profile_manager
-from bot.core import profile_manager
+from bot.utils import daily_rewards
+from bot.utils import roles
+from bot.utils import session_tracker
 
 logger = logging.getLogger(__name__)
 
 class EventHandler:
     def __init__(self, bot):
         self.bot = bot
-        self.join_times = {}
+        self.sessions = session_tracker.SessionTracker()
+        self._checkpoint_task = None
+
+    async def on_start(self, session_metadata=None):
+        """Reconcile sessions with the users already in the room and start periodic checkpoints"""
+        # Users present at connect time never get on_user_join, so pick them all up at once
+        # One-time move of pre-roles.json inline roles, kept out of the join path
+        roles.migrate_profile_roles()
+        present = await self._room_user_ids()
+        resumed = set(self.sessions.recover(present))
+        opened = self.sessions.open_many([user_id for user_id in present if user_id not in resumed])
+        self._register_joins(opened)
+        logger.info(f"Startup reconciliation: {len(present)} users present, {len(resumed)} sessions resumed, {len(opened)} opened")
+        if self._checkpoint_task is None:
+            self._checkpoint_task = asyncio.create_task(self._checkpoint_loop())
+
+    async def _checkpoint_loop(self):
+        while True:
+            await asyncio.sleep(session_tracker.CHECKPOINT_INTERVAL)
+            try:
+                credited = self.sessions.checkpoint()
+                if credited:
+                    logger.info(f"Session checkpoint credited {sum(credited.values())} minutes to {len(credited)} users")
+            except Exception as e:
+                logger.error(f"Session checkpoint failed: {e}")
+            try:
+                # Only lapsed streaks are touched; the expiry index says which
+                expired = daily_rewards.expire_streaks()
+                if expired:
+                    logger.info(f"Daily streaks expired for {len(expired)} users")
+            except Exception as e:
+                logger.error(f"Daily streak expiry failed: {e}")
+
+    async def _room_user_ids(self):
+        try:
+            room_users = (await self.bot.highrise.get_room_users()).content
+        except Exception as e:
+            logger.error(f"Could not fetch room users: {e}")
+            return []
+        return [room_user.id for room_user, _ in room_users]
+
+    def _register_joins(self, user_ids):
+        """Count a room join for users found at startup, who never reach the join handlers, in one write"""
+        def joined(profile):
+            stats = profile.setdefault("stats", {})
+            stats["room_joins"] = stats.get("room_joins", 0) + 1
+            return {"room_joins": stats["room_joins"]}
+
+        profile_manager.update_profiles({user_id: joined for user_id in user_ids})
 
     async def on_user_join(self, user):
-        """Record join time for session tracking"""
-        self.join_times[user.id] = datetime.utcnow()
-        logger.info(f"User {user.id} joined at {self.join_times[user.id]}")
+        """Open a session for time tracking (room_joins is counted by welcome_cache.record_join)"""
+        if self.sessions.open(user.id):
+            logger.info(f"User {user.id} joined, session opened")
 
         # Optional: send welcome message or log
 
     async def on_user_leave(self, user):
-        """Calculate session duration and add XP"""
-        join_time = self.join_times.pop(user.id, None)
-        if join_time is None:
-            logger.warning(f"No join time recorded for user {user.id} on leave")
-            return
-
-        leave_time = datetime.utcnow()
-        session_duration = (leave_time - join_time).total_seconds() / 60  # minutes
-        xp_to_add = int(session_duration)  # 1 XP per full minute
-
-        if profile_manager.has_profile(user.id) and xp_to_add > 0:
-            xp, level = add_xp(user.id, xp_to_add)
-            logger.info(f"Added {xp_to_add} XP to user {user.id} for session. Total XP: {xp}, Level: {level}")
-
-            # Update time_spent in profile stats
-            profile = profile_manager.get_profile(user.id)
-            if profile:
-                stats = profile.get('stats', {})
-                stats['time_spent'] = stats.get('time_spent', 0) + xp_to_add
-                profile['stats'] = stats
-                profiles = profile_manager.load_profiles()
-                profiles[user.id] = profile
-                profile_manager.save_profiles(profiles)
+        """Close the session and credit the minutes not yet credited by a checkpoint"""
+        minutes = self.sessions.close(user.id)
+        if minutes is None:
+            logger.warning(f"No open session for user {user.id} on leave")
+        elif minutes > 0:
+            logger.info(f"Credited {minutes} session minutes to user {user.id} on leave")
 
     async def on_game_correct_answer(self, user_id):
         if profile_manager.has_profile(user_id):
@@ -1,5 +1,6 @@
 import logging
 from bot.core import profile_manager
+from bot.utils import change_feed
 
 logger = logging.getLogger(__name__)
 
@@ -47,5 +48,6 @@ def check_and_unlock_achievements(user_id):
         user["achievements"] = unlocked
         profiles[user_id] = user
         profile_manager.save_profiles(profiles)
+        change_feed.publish("achievement", user_id=user_id, achievements=unlocked)
 
     return newly_unlocked
@@ -0,0 +1,136 @@
+import time
+import unicodedata
+
+# Per-user pending answers are dropped after this long even if nobody clears them
+ANSWER_TTL = 5 * 60.0
+# Room-wide questions stay open this long unless someone answers first
+ROOM_QUESTION_TTL = 60.0
+
+_EDGE_PUNCTUATION = " \t.,!?;:'\"()"
+
+def normalize_answer(text):
+    """Casefolded, accent-stripped, whitespace-collapsed form used for matching."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split()).strip(_EDGE_PUNCTUATION)
+
+class PendingAnswer:
+    """An open question: who may answer, what is correct, and who to hand answers to.
+
+    `answers` are the correct answers and their aliases. `attempts` are other
+    messages that still count as an answer (e.g. the A-D choices of a trivia
+    question); None means any message from the user does.
+    """
+
+    def __init__(self, kind, owner, on_answer, answers=(), attempts=None, ttl=ANSWER_TTL):
+        self.kind = kind
+        self.owner = owner  # user_id, or None for a room-wide question
+        self.on_answer = on_answer  # async callable(user, message) -> True if the message was consumed
+        self.answers = frozenset(normalize_answer(answer) for answer in answers)
+        self.attempts = None if attempts is None else frozenset(normalize_answer(attempt) for attempt in attempts)
+        # ttl=None: open until cleared, for questions whose owner tracks expiry itself
+        self.expires_at = float("inf") if ttl is None else time.monotonic() + ttl
+        self.winner = None
+        self.closed = False
+
+    def accepts(self, normalized):
+        return self.attempts is None or normalized in self.answers or normalized in self.attempts
+
+    def is_correct(self, normalized):
+        return normalized in self.answers
+
+class AnswerRegistry:
+    """Everything currently waiting for an answer, indexed for one lookup per message.
+
+    Per-user questions are keyed by user_id (then kind, in registration order);
+    room-wide questions are indexed by each normalized correct answer (oldest
+    first when several share an answer). Users with
+    nothing pending cost one dict lookup, and messages are only normalized when
+    something could match.
+    """
+
+    def __init__(self):
+        self.by_user = {}  # user_id -> {kind: PendingAnswer}
+        self.room_answers = {}  # normalized answer -> [room-wide PendingAnswer, ...] in the order asked
+        self.stats = {"lookups": 0, "matches": 0, "room_wins": 0}
+
+    def expect(self, user_id, kind, on_answer, answers=(), attempts=None, ttl=ANSWER_TTL):
+        """Route user_id's answers for `kind` to on_answer (replacing an earlier one).
+
+        ttl=None keeps the entry until it is cleared or replaced.
+        """
+        pending = PendingAnswer(kind, user_id, on_answer, answers, attempts, ttl)
+        self.by_user.setdefault(user_id, {})[kind] = pending
+        return pending
+
+    def clear(self, user_id, kind=None):
+        if kind is None:
+            self.by_user.pop(user_id, None)
+            return
+        pending = self.by_user.get(user_id)
+        if pending is not None:
+            pending.pop(kind, None)
+            if not pending:
+                del self.by_user[user_id]
+
+    def ask_room(self, kind, answers, on_correct, ttl=ROOM_QUESTION_TTL):
+        """Open a room-wide question; the first user to send a correct answer wins."""
+        question = PendingAnswer(kind, None, on_correct, answers, (), ttl)
+        if not question.answers:
+            raise ValueError("A room question needs at least one answer")
+        for answer in question.answers:
+            self.room_answers.setdefault(answer, []).append(question)
+        return question
+
+    def close_room(self, question):
+        """Close a room-wide question; True if it was still open (nobody had won)."""
+        if question.closed:
+            return False
+        question.closed = True
+        for answer in question.answers:
+            questions = self.room_answers.get(answer)
+            if questions is not None and question in questions:
+                questions.remove(question)
+                if not questions:
+                    del self.room_answers[answer]
+        return True
+
+    def claim(self, question, user_id):
+        """Make user_id the winner of a room-wide question, unless someone already is.
+
+        Check and close happen without awaiting, so of several correct answers
+        handled concurrently exactly one claim succeeds.
+        """
+        if question.closed or question.expires_at < time.monotonic():
+            self.close_room(question)
+            return False
+        self.close_room(question)
+        question.winner = user_id
+        self.stats["room_wins"] += 1
+        return True
+
+    def match(self, user_id, message):
+        """Pending questions this message answers, per-user ones first; usually empty."""
+        self.stats["lookups"] += 1
+        pending = self.by_user.get(user_id)
+        if pending is None and not self.room_answers:
+            return []
+        normalized = normalize_answer(message)
+        now = time.monotonic()
+        matches = []
+        if pending is not None:
+            for kind, entry in list(pending.items()):
+                if entry.expires_at < now:
+                    self.clear(user_id, kind)
+                elif entry.accepts(normalized):
+                    matches.append(entry)
+        for question in list(self.room_answers.get(normalized, ())):
+            if question.expires_at < now:
+                self.close_room(question)
+            else:
+                matches.append(question)
+        if matches:
+            self.stats["matches"] += 1
+        return matches
+
+answer_registry = AnswerRegistry()
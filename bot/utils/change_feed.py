@@ -0,0 +1,99 @@
+import json
+import logging
+import os
+import time
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'data')
+CHANGES_FILE = os.path.join(DATA_DIR, 'changes.jsonl')
+
+# The feed only needs to cover reconnect gaps, so it is truncated once it grows past this
+MAX_FEED_BYTES = 4 * 1024 * 1024
+
+_lock = Lock()
+_listeners = []
+
+def publish(kind, **data):
+    """Append a change event to the feed shared with the dashboard process."""
+    event = {"type": kind, "time": time.time()}
+    event.update(data)
+    line = (json.dumps(event, ensure_ascii=False) + "\n").encode('utf-8')
+    with _lock:
+        try:
+            if os.path.getsize(CHANGES_FILE) + len(line) > MAX_FEED_BYTES:
+                # Readers notice the new file and ask their clients to resync
+                os.replace(CHANGES_FILE, CHANGES_FILE + '.1')
+        except FileNotFoundError:
+            pass
+        with open(CHANGES_FILE, 'ab') as f:
+            f.write(line)
+    for listener in list(_listeners):
+        try:
+            listener(event)
+        except Exception as e:
+            logger.error(f"Change feed listener failed: {e}")
+    return event
+
+def publish_profile(user_id, **fields):
+    return publish("profile", user_id=user_id, fields=fields)
+
+def subscribe(listener):
+    """Call listener(event) for every event published from this process."""
+    _listeners.append(listener)
+
+def unsubscribe(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+class FeedReader:
+    """Tails the change feed from a position given as an event id ("<inode>:<offset>")."""
+
+    def __init__(self, last_event_id=None):
+        self.file_id = None
+        self.offset = None
+        self.needs_reset = False
+        if last_event_id:
+            try:
+                file_id, offset = last_event_id.split(':', 1)
+                self.file_id, self.offset = int(file_id), int(offset)
+            except ValueError:
+                self.needs_reset = True
+
+    def poll(self):
+        """Return a list of (event_id, event) appended since the last poll.
+
+        A ("reset", None) item is returned when the reader's position is no longer
+        in the feed (truncated or unknown id) and the client must refetch everything.
+        """
+        try:
+            st = os.stat(CHANGES_FILE)
+        except FileNotFoundError:
+            return []
+        items = []
+        if self.offset is None:
+            # New subscriber: start from the current end of the feed
+            self.file_id, self.offset = st.st_ino, st.st_size
+        elif self.file_id != st.st_ino or st.st_size < self.offset:
+            self.needs_reset = True
+            self.file_id, self.offset = st.st_ino, 0
+        if self.needs_reset:
+            self.needs_reset = False
+            items.append(("reset", None))
+        if st.st_size == self.offset:
+            return items
+        with open(CHANGES_FILE, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(st.st_size - self.offset)
+        end = data.rfind(b'\n') + 1
+        position = self.offset
+        for line in data[:end].split(b'\n')[:-1]:
+            position += len(line) + 1
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            items.append((f"{self.file_id}:{position}", event))
+        self.offset += end
+        return items
@@ -1,59 +1,246 @@
+import heapq
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
+from threading import RLock
 from bot.core import profile_manager
+from bot.utils import change_feed
 
 DAILY_REWARD_BASE = 10  # base coins rewarded per claim
 DAILY_CLAIM_INTERVAL = 24 * 60 * 60  # 24 hours in seconds
+# A claim within this long of the previous one continues the streak
+STREAK_WINDOW = 2 * DAILY_CLAIM_INTERVAL
 
-def can_claim_daily(user_id):
-    profile = profile_manager.get_profile(user_id)
-    if not profile:
-        return False, "No profile found."
-
-    last_claim = profile.get("last_daily_claim", 0)
-    now = time.time()
-    if now - last_claim >= DAILY_CLAIM_INTERVAL:
-        return True, None
-    else:
-        next_claim_time = last_claim + DAILY_CLAIM_INTERVAL
-        return False, next_claim_time
+def _heap_until(heap, limit):
+    """Entries of a heap with a time <= limit, without popping (children of a later entry are later too)."""
+    stack = [0] if heap else []
+    while stack:
+        i = stack.pop()
+        if heap[i][0] > limit:
+            continue
+        yield heap[i]
+        stack.extend(child for child in (2 * i + 1, 2 * i + 2) if child < len(heap))
 
-def claim_daily(user_id):
-    profile = profile_manager.get_profile(user_id)
-    if not profile:
-        return False, "No profile found."
+class DailyRewards:
+    """Daily claims with an in-memory index of when each user can claim next.
+
+    Claim deadlines and streak-expiry deadlines sit in two min-heaps of
+    (time, user_id). Entries are never updated in place; a newer claim pushes
+    new entries and the old ones are skipped when they surface. Users whose
+    next claim time has passed move to the `ready` set, so "who can claim
+    now" is a set lookup. The index is built from one pass over the profiles
+    and kept current from this process's claims and the change feed.
+    """
+
+    def __init__(self):
+        # Re-entrant: profile writes publish change feed events back into on_change
+        self.lock = RLock()
+        self.claims = {}  # user_id -> (last_daily_claim, daily_streak)
+        self.ready = set()
+        self._next_claims = []  # heap of (next claim time, user_id)
+        self._expiries = []  # heap of (streak expiry time, user_id)
+        self.loaded = False
+        change_feed.subscribe(self.on_change)
+
+    def warm(self):
+        claims = {}
+        for user_id, profile in profile_manager.iter_profiles():
+            claims[user_id] = (profile.get("last_daily_claim", 0), profile.get("daily_streak", 0))
+        next_claims = [(last + DAILY_CLAIM_INTERVAL, user_id) for user_id, (last, _) in claims.items()]
+        expiries = [(last + STREAK_WINDOW, user_id) for user_id, (last, streak) in claims.items() if streak]
+        heapq.heapify(next_claims)
+        heapq.heapify(expiries)
+        with self.lock:
+            self.claims = claims
+            self.ready = set()
+            self._next_claims = next_claims
+            self._expiries = expiries
+            self.loaded = True
+
+    def _ensure_loaded(self):
+        if not self.loaded:
+            self.warm()
+
+    def _index(self, user_id, last_claim, streak):
+        # Caller holds the lock
+        self.claims[user_id] = (last_claim, streak)
+        self.ready.discard(user_id)
+        heapq.heappush(self._next_claims, (last_claim + DAILY_CLAIM_INTERVAL, user_id))
+        if streak:
+            heapq.heappush(self._expiries, (last_claim + STREAK_WINDOW, user_id))
+
+    def _advance(self, now):
+        # Caller holds the lock: move users whose claim time has come into `ready`
+        heap = self._next_claims
+        while heap and heap[0][0] <= now:
+            when, user_id = heapq.heappop(heap)
+            claim = self.claims.get(user_id)
+            if claim is not None and claim[0] + DAILY_CLAIM_INTERVAL == when:
+                self.ready.add(user_id)
+
+    def claimable_now(self, now=None):
+        """User ids who can claim right now (e.g. for reminders)."""
+        self._ensure_loaded()
+        with self.lock:
+            self._advance(now or time.time())
+            return set(self.ready)
+
+    def can_claim(self, user_id, now=None):
+        """(True, None), (False, next claim timestamp) or (False, "No profile found.")."""
+        self._ensure_loaded()
+        now = now or time.time()
+        with self.lock:
+            claim = self.claims.get(user_id)
+            if claim is None:
+                return False, "No profile found."
+            next_claim = claim[0] + DAILY_CLAIM_INTERVAL
+        if now >= next_claim:
+            return True, None
+        return False, next_claim
+
+    def streak(self, user_id, now=None):
+        """(current streak, next claim timestamp); a lapsed streak counts as 0. None without a profile."""
+        self._ensure_loaded()
+        now = now or time.time()
+        with self.lock:
+            claim = self.claims.get(user_id)
+        if claim is None:
+            return None
+        last_claim, streak = claim
+        if now - last_claim > STREAK_WINDOW:
+            streak = 0
+        return streak, last_claim + DAILY_CLAIM_INTERVAL
+
+    def claim(self, user_id, now=None):
+        """Claim the daily reward: streak update and coin credit land in one profile write.
 
-    can_claim, next_claim_time = can_claim_daily(user_id)
-    if not can_claim:
-        return False, next_claim_time
+        Returns (True, reward), (False, next claim timestamp) or (False, "No profile found.").
+        Eligibility is re-checked on the freshly loaded profile inside the write.
+        """
+        self._ensure_loaded()
+        now = now or time.time()
+        result = {}
 
-    now = time.time()
-    last_claim = profile.get("last_daily_claim", 0)
-    daily_streak = profile.get("daily_streak", 0)
+        def apply(profile):
+            last_claim = profile.get("last_daily_claim", 0)
+            if now - last_claim < DAILY_CLAIM_INTERVAL:
+                result["next_claim"] = last_claim + DAILY_CLAIM_INTERVAL
+                result["last_claim"] = last_claim
+                result["streak"] = profile.get("daily_streak", 0)
+                return None
+            streak = profile.get("daily_streak", 0) + 1 if now - last_claim <= STREAK_WINDOW else 1
+            reward = DAILY_REWARD_BASE * streak
+            wallet = profile.setdefault("wallet", {})
+            wallet["coins"] = wallet.get("coins", 0) + reward
+            profile["last_daily_claim"] = now
+            profile["daily_streak"] = streak
+            result.update(reward=reward, streak=streak)
+            return {"coins": wallet["coins"], "daily_streak": streak}
 
-    # Check if claim is within 48 hours to continue streak, else reset
-    if now - last_claim <= 2 * DAILY_CLAIM_INTERVAL:
-        daily_streak += 1
-    else:
-        daily_streak = 1
+        with self.lock:
+            changed = profile_manager.update_profiles({user_id: apply})
+            if user_id in changed:
+                self._index(user_id, now, result["streak"])
+                return True, result["reward"]
+            if "next_claim" in result:
+                # Another process claimed first; catch the index up with the file
+                if self.claims.get(user_id, (None,))[0] != result["last_claim"]:
+                    self._index(user_id, result["last_claim"], result["streak"])
+                return False, result["next_claim"]
+            self.claims.pop(user_id, None)
+            self.ready.discard(user_id)
+            return False, "No profile found."
 
-    reward = DAILY_REWARD_BASE * daily_streak
+    def streaks_expiring(self, within, now=None):
+        """{user_id: expiry timestamp} for streaks that lapse within `within` seconds unless claimed."""
+        self._ensure_loaded()
+        now = now or time.time()
+        with self.lock:
+            expiring = {}
+            for when, user_id in _heap_until(self._expiries, now + within):
+                claim = self.claims.get(user_id)
+                if when > now and claim is not None and claim[1] and claim[0] + STREAK_WINDOW == when:
+                    expiring[user_id] = when
+            return expiring
 
-    # Update profile data
-    profile["last_daily_claim"] = now
-    profile["daily_streak"] = daily_streak
+    def expire_streaks(self, now=None):
+        """Reset the streaks whose window has passed, in one profile write; returns the user ids."""
+        self._ensure_loaded()
+        now = now or time.time()
+        with self.lock:
+            expired = []
+            while self._expiries and self._expiries[0][0] < now:
+                when, user_id = heapq.heappop(self._expiries)
+                claim = self.claims.get(user_id)
+                if claim is not None and claim[1] and claim[0] + STREAK_WINDOW == when:
+                    expired.append(user_id)
 
-    profiles = profile_manager.load_profiles()
-    profiles[user_id] = profile
-    profile_manager.save_profiles(profiles)
+            current = {}  # user_id -> (last_daily_claim, daily_streak) of profiles left alone
 
-    return True, reward
+            def reset(user_id):
+                def apply(profile):
+                    # Skip profiles claimed again since the index was built
+                    last_claim = profile.get("last_daily_claim", 0)
+                    streak = profile.get("daily_streak", 0)
+                    if not streak or now - last_claim <= STREAK_WINDOW:
+                        current[user_id] = (last_claim, streak)
+                        return None
+                    profile["daily_streak"] = 0
+                    return {"daily_streak": 0}
+                return apply
+
+            updates = {user_id: reset(user_id) for user_id in expired}
+            changed = profile_manager.update_profiles(updates)
+            for user_id in expired:
+                if user_id in changed:
+                    last_claim, _ = self.claims[user_id]
+                    self.claims[user_id] = (last_claim, 0)
+                elif user_id in current:
+                    # Claimed by another process; catch the index up with the file
+                    self._index(user_id, *current[user_id])
+                else:
+                    self.claims.pop(user_id, None)
+                    self.ready.discard(user_id)
+            return list(changed)
+
+    def on_change(self, event):
+        kind = event.get("type")
+        user_id = event.get("user_id")
+        with self.lock:
+            if not self.loaded:
+                return
+            if kind == "profile_deleted":
+                self.claims.pop(user_id, None)
+                self.ready.discard(user_id)
+            elif kind == "profile" and user_id not in self.claims and "name" in event.get("fields", {}):
+                # A new profile can claim straight away
+                self.claims[user_id] = (0, 0)
+                self.ready.add(user_id)
+
+_rewards = DailyRewards()
+
+def can_claim_daily(user_id):
+    return _rewards.can_claim(user_id)
+
+def claim_daily(user_id):
+    return _rewards.claim(user_id)
 
 def get_next_claim_time(user_id):
-    profile = profile_manager.get_profile(user_id)
-    if not profile:
+    streak = _rewards.streak(user_id)
+    if streak is None:
         return None
+    return datetime.fromtimestamp(streak[1])
+
+def get_streak(user_id):
+    return _rewards.streak(user_id)
+
+def claimable_now():
+    return _rewards.claimable_now()
+
+def streaks_expiring(within):
+    return _rewards.streaks_expiring(within)
+
+def expire_streaks():
+    return _rewards.expire_streaks()
 
-    last_claim = profile.get("last_daily_claim", 0)
-    next_claim = last_claim + DAILY_CLAIM_INTERVAL
-    return datetime.fromtimestamp(next_claim)
+def warm():
+    _rewards.warm()
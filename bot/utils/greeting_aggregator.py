@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Joins/leaves arriving within WINDOW seconds of the first one are sent together.
+# More than GROUP_THRESHOLD of one kind become a single grouped message naming
+# at most GROUP_NAMES users; fewer are sent as their individual messages.
+WINDOW = 3.0
+GROUP_THRESHOLD = 3
+GROUP_NAMES = 3
+
+GROUP_TEMPLATES = {
+    "join": "👋✨ Welcome back {names}! ✨",
+    "leave": "👋 Goodbye {names}, thanks for visiting! 🌟"
+}
+
+def join_names(names, limit=GROUP_NAMES):
+    """'A, B, C and 12 others' style list."""
+    shown = list(names[:limit])
+    others = len(names) - len(shown)
+    if others > 0:
+        return f"{', '.join(shown)} and {others} other{'s' if others != 1 else ''}"
+    if len(shown) == 1:
+        return shown[0]
+    return f"{', '.join(shown[:-1])} and {shown[-1]}"
+
+class GreetingAggregator:
+    """Debounces room welcome/farewell messages so join storms send a few grouped lines."""
+
+    def __init__(self, send, window=WINDOW, threshold=GROUP_THRESHOLD, names=GROUP_NAMES, templates=None):
+        self.send = send  # async callable(text)
+        self.window = window
+        self.threshold = threshold
+        self.names = names
+        self.templates = dict(GROUP_TEMPLATES, **(templates or {}))
+        self.pending = {}  # kind -> [(name, individual message)]
+        self._flush_tasks = {}
+        self._sent_times = deque()
+        self.stats = {"events": 0, "messages_sent": 0, "grouped": 0}
+
+    async def add(self, kind, name, message):
+        """Queue `message` for `name`; it goes out individually or as part of a group."""
+        self.stats["events"] += 1
+        self.pending.setdefault(kind, []).append((name, message))
+        if kind not in self._flush_tasks:
+            self._flush_tasks[kind] = asyncio.create_task(self._flush_later(kind))
+
+    async def _flush_later(self, kind):
+        try:
+            await asyncio.sleep(self.window)
+        finally:
+            self._flush_tasks.pop(kind, None)
+        await self.flush(kind)
+
+    async def flush(self, kind=None):
+        """Send what is queued now (for one kind, or all of them)."""
+        kinds = [kind] if kind is not None else list(self.pending)
+        for k in kinds:
+            items = self.pending.pop(k, [])
+            if not items:
+                continue
+            if len(items) > self.threshold:
+                names = join_names([name for name, _ in items], self.names)
+                self.stats["grouped"] += 1
+                await self._send(self.templates[k].format(names=names))
+            else:
+                for _, message in items:
+                    await self._send(message)
+
+    async def close(self):
+        for task in list(self._flush_tasks.values()):
+            task.cancel()
+        self._flush_tasks.clear()
+        await self.flush()
+
+    async def _send(self, text):
+        try:
+            await self.send(text)
+        except Exception as e:
+            logger.error(f"Failed to send greeting: {e}")
+            return
+        self.stats["messages_sent"] += 1
+        self._sent_times.append(time.monotonic())
+
+    def messages_per_minute(self):
+        cutoff = time.monotonic() - 60
+        while self._sent_times and self._sent_times[0] < cutoff:
+            self._sent_times.popleft()
+        return len(self._sent_times)
@@ -0,0 +1,143 @@
+import json
+import os
+from bisect import bisect_right
+
+try:
+    import numpy
+except ImportError:  # optional: vectorized level lookups for rebalancing
+    numpy = None
+
+LEVEL_CURVE_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'level_curve.json')
+
+# Level L is reached at 100 * L XP, everything below 200 XP is level 1: the original max(1, xp // 100)
+DEFAULT_CURVE = {"type": "linear", "xp_per_level": 100}
+# Thresholds precomputed up front; formula curves extend the table when XP goes past it
+PRECOMPUTED_LEVELS = 1000
+# Formula curves stop growing the table here; higher levels are searched on the formula itself
+MAX_TABLE_LEVELS = 100000
+
+class LevelCurve:
+    """Cumulative XP thresholds per level, with bisect lookups.
+
+    thresholds[i] is the total XP needed for level i + 2; level 1 needs nothing.
+    Formula curves (linear, quadratic) are unbounded and grow the table on
+    demand up to MAX_TABLE_LEVELS; table curves stop at their last level.
+    Formula coefficients are validated up front so thresholds increase forever.
+    """
+
+    def __init__(self, config):
+        self.config = dict(config)
+        kind = self.config.get("type")
+        if kind == "linear":
+            per_level = self.config.get("xp_per_level", 100)
+            offset = self.config.get("offset", 0)
+            if per_level <= 0:
+                raise ValueError("xp_per_level must be positive")
+            self._formula = lambda level: per_level * level + offset
+        elif kind == "quadratic":
+            a, b, c = (self.config.get(key, 0) for key in ("a", "b", "c"))
+            # With a, b >= 0 and one of them positive every level needs more XP than the one before
+            if a < 0 or b < 0 or not (a or b):
+                raise ValueError("Quadratic curves need a >= 0 and b >= 0, not both 0")
+            self._formula = lambda level: a * level * level + b * level + c
+        elif kind == "table":
+            self._formula = None
+        else:
+            raise ValueError(f"Unknown level curve type: {kind!r}")
+
+        if self._formula is None:
+            self.thresholds = [int(xp) for xp in self.config.get("thresholds", [])]
+        else:
+            self.thresholds = [int(self._formula(level)) for level in range(2, PRECOMPUTED_LEVELS + 2)]
+        if any(later <= earlier for earlier, later in zip(self.thresholds, self.thresholds[1:])):
+            raise ValueError("Level thresholds must be strictly increasing")
+        if self.thresholds and self.thresholds[0] <= 0:
+            raise ValueError("Level 2 must need more than 0 XP")
+        self._array = None
+
+    @property
+    def max_level(self):
+        """Highest level, or None for an unbounded formula curve."""
+        return len(self.thresholds) + 1 if self._formula is None else None
+
+    def _cover(self, xp):
+        # Grow a formula curve's table until it reaches past xp or holds MAX_TABLE_LEVELS levels
+        if self._formula is None or xp < self.thresholds[-1]:
+            return
+        level = len(self.thresholds) + 2
+        while self.thresholds[-1] <= xp and level <= MAX_TABLE_LEVELS:
+            end = min(level * 2, MAX_TABLE_LEVELS + 2)
+            self.thresholds.extend(int(self._formula(next_level)) for next_level in range(level, end))
+            level = end
+        self._array = None
+
+    def _past_table(self, xp):
+        return self._formula is not None and xp >= self.thresholds[-1]
+
+    def _formula_level(self, xp):
+        # Highest level whose formula threshold is <= xp, for XP past the table's last level
+        low = len(self.thresholds) + 1
+        high = low * 2
+        while int(self._formula(high)) <= xp:
+            low, high = high, high * 2
+        while high - low > 1:
+            middle = (low + high) // 2
+            if int(self._formula(middle)) <= xp:
+                low = middle
+            else:
+                high = middle
+        return low
+
+    def level(self, xp):
+        self._cover(xp)
+        if self._past_table(xp):
+            return self._formula_level(xp)
+        return 1 + bisect_right(self.thresholds, xp)
+
+    def xp_for_level(self, level):
+        """Total XP needed to reach `level` (None past a table curve's last level)."""
+        if level <= 1:
+            return 0
+        if level - 2 >= len(self.thresholds):
+            return None if self._formula is None else int(self._formula(level))
+        return self.thresholds[level - 2]
+
+    def progress(self, xp):
+        """(level, xp into the level, xp the level spans, fraction done); span is None at the max level."""
+        level = self.level(xp)
+        start = self.xp_for_level(level)
+        end = self.xp_for_level(level + 1)
+        if end is None:
+            return level, xp - start, None, 1.0
+        span = end - start
+        return level, xp - start, span, min(max((xp - start) / span, 0.0), 1.0)
+
+    def levels(self, xps):
+        """Levels for many XP values at once; vectorized with numpy when it is installed."""
+        xps = list(xps)
+        if not xps:
+            return []
+        self._cover(max(xps))
+        if numpy is None:
+            levels = [1 + bisect_right(self.thresholds, xp) for xp in xps]
+        else:
+            if self._array is None:
+                self._array = numpy.asarray(self.thresholds)
+            levels = (numpy.searchsorted(self._array, numpy.asarray(xps), side="right") + 1).tolist()
+        if self._past_table(max(xps)):
+            levels = [self._formula_level(xp) if self._past_table(xp) else level for level, xp in zip(levels, xps)]
+        return levels
+
+def load_curve():
+    try:
+        with open(LEVEL_CURVE_FILE, 'r') as f:
+            return LevelCurve(json.load(f))
+    except (FileNotFoundError, ValueError):
+        # ValueError covers both unparsable JSON and a curve that fails validation
+        return LevelCurve(DEFAULT_CURVE)
+
+def save_curve(curve):
+    tmp_path = LEVEL_CURVE_FILE + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(curve.config, f, indent=2)
+    os.replace(tmp_path, LEVEL_CURVE_FILE)
@@ -1,26 +1,241 @@
+import calendar
+import gzip
 import json
 import os
-from datetime import datetime
+import shutil
+from datetime import datetime, timedelta
 from threading import Lock
+from bot.utils import change_feed
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'data')
+MODLOG_FILE = os.path.join(DATA_DIR, 'modlog.jsonl')
+LEGACY_MODLOG_FILE = os.path.join(DATA_DIR, 'modlog.json')
+INDEX_FILE = os.path.join(DATA_DIR, 'modlog_index.json')
+SEGMENT_PREFIX = 'modlog-'
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# The active segment is rotated once it would grow past MAX_SEGMENT_BYTES or
+# once its first entry is older than MAX_SEGMENT_AGE seconds (None disables).
+MAX_SEGMENT_BYTES = 1024 * 1024
+MAX_SEGMENT_AGE = 7 * 24 * 60 * 60
+COMPRESS_SEGMENTS = True
 
-MODLOG_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'modlog.json')
 file_lock = Lock()
+_segment_started = None  # epoch seconds of the first entry in the active segment
+_legacy_checked = False
 
 def log_action(action, by, target, reason="", duration=None):
-    log_entry = {
-        "action": action,
-        "by": by,
-        "target": target,
-        "reason": reason,
-        "duration": duration,
-        "time": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
-    }
+    global _segment_started
+    with file_lock:
+        # Stamped under the lock so the file stays in time order for the query's bisects
+        now = datetime.utcnow()
+        log_entry = {
+            "action": action,
+            "by": by,
+            "target": target,
+            "reason": reason,
+            "duration": duration,
+            "time": now.strftime(TIME_FORMAT)
+        }
+        line = (json.dumps(log_entry, ensure_ascii=False) + "\n").encode('utf-8')
+        _migrate_legacy()
+        _maybe_rotate(calendar.timegm(now.utctimetuple()), len(line))
+        with open(MODLOG_FILE, 'ab') as f:
+            f.write(line)
+        if _segment_started is None:
+            _segment_started = calendar.timegm(now.utctimetuple())
+    change_feed.publish("modlog", entry=log_entry)
+    return log_entry
+
+def rotate():
+    """Close the active segment and start a new one. Returns the segment path or None."""
     with file_lock:
+        return _rotate_active()
+
+def list_segments():
+    """Rotated segment paths, newest first."""
+    try:
+        names = os.listdir(DATA_DIR)
+    except FileNotFoundError:
+        return []
+    segments = [n for n in names if n.startswith(SEGMENT_PREFIX) and (n.endswith('.jsonl') or n.endswith('.jsonl.gz'))]
+    # While a segment is being sealed both forms exist for a moment; the .gz is already complete
+    present = set(segments)
+    segments = [n for n in segments if n + '.gz' not in present]
+    segments.sort(key=_segment_stamp, reverse=True)
+    return [os.path.join(DATA_DIR, n) for n in segments]
+
+def ensure_migrated():
+    with file_lock:
+        _migrate_legacy()
+
+def iter_entries():
+    """Stream log entries newest-first across the active and rotated segments."""
+    ensure_migrated()
+    yield from iter_segment(MODLOG_FILE)
+    for path in list_segments():
+        yield from iter_segment(path)
+
+def iter_segment(path):
+    """Stream the entries of a single segment newest-first."""
+    try:
+        if path.endswith('.gz'):
+            with gzip.open(path, 'rb') as f:
+                lines = f.read().split(b'\n')
+            lines.reverse()
+        else:
+            lines = _read_lines_reversed(path)
+        for line in lines:
+            entry = _parse_line(line)
+            if entry is not None:
+                yield entry
+    except FileNotFoundError:
+        # Segment was sealed after it was listed; read the compressed copy that replaced it
+        if not path.endswith('.gz'):
+            yield from iter_segment(path + '.gz')
+
+def load_index():
+    """Per-segment summaries (time range and target/moderator/action sets) keyed by file name."""
+    try:
+        with open(INDEX_FILE, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def summarize(entries):
+    summary = {"first": None, "last": None, "count": 0, "targets": set(), "by": set(), "actions": set()}
+    for entry in entries:
+        entry_time = entry.get("time", "")
+        if summary["first"] is None or entry_time < summary["first"]:
+            summary["first"] = entry_time
+        if summary["last"] is None or entry_time > summary["last"]:
+            summary["last"] = entry_time
+        summary["count"] += 1
+        summary["targets"].add(entry.get("target"))
+        summary["by"].add(entry.get("by"))
+        summary["actions"].add(entry.get("action"))
+    for key in ("targets", "by", "actions"):
+        summary[key] = sorted(v for v in summary[key] if v is not None)
+    return summary
+
+def parse_time(value):
+    try:
+        return calendar.timegm(datetime.strptime(value, TIME_FORMAT).utctimetuple())
+    except (TypeError, ValueError):
+        return None
+
+def _parse_line(line):
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        # Partially written line from a crash; skip it
+        return None
+
+def _read_lines_reversed(path, block_size=64 * 1024):
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        remainder = b''
+        while pos > 0:
+            size = min(block_size, pos)
+            pos -= size
+            f.seek(pos)
+            lines = (f.read(size) + remainder).split(b'\n')
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                yield line
+        yield remainder
+
+def _segment_stamp(name):
+    return name[len(SEGMENT_PREFIX):].split('.', 1)[0]
+
+def _segment_path(when):
+    while True:
+        stamp = when.strftime("%Y%m%dT%H%M%S%f")
+        path = os.path.join(DATA_DIR, f"{SEGMENT_PREFIX}{stamp}.jsonl")
+        if not os.path.exists(path) and not os.path.exists(path + '.gz'):
+            return path
+        when += timedelta(microseconds=1)
+
+def _active_started():
+    global _segment_started
+    if _segment_started is None:
         try:
-            with open(MODLOG_FILE, 'r') as f:
-                logs = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            logs = []
-        logs.append(log_entry)
-        with open(MODLOG_FILE, 'w') as f:
-            json.dump(logs, f, indent=2)
+            with open(MODLOG_FILE, 'rb') as f:
+                entry = _parse_line(f.readline())
+        except FileNotFoundError:
+            entry = None
+        if entry:
+            _segment_started = parse_time(entry.get("time"))
+    return _segment_started
+
+def _maybe_rotate(now, incoming):
+    try:
+        size = os.path.getsize(MODLOG_FILE)
+    except FileNotFoundError:
+        return
+    if size == 0:
+        return
+    started = _active_started()
+    too_big = size + incoming > MAX_SEGMENT_BYTES
+    too_old = MAX_SEGMENT_AGE is not None and started is not None and now - started >= MAX_SEGMENT_AGE
+    if too_big or too_old:
+        _rotate_active()
+
+def _rotate_active():
+    global _segment_started
+    try:
+        if os.path.getsize(MODLOG_FILE) == 0:
+            return None
+    except FileNotFoundError:
+        return None
+    path = _segment_path(datetime.utcnow())
+    os.replace(MODLOG_FILE, path)
+    _segment_started = None
+    return _seal_segment(path)
+
+def _seal_segment(path):
+    summary = summarize(iter_segment(path))
+    if COMPRESS_SEGMENTS:
+        # Compressed under a name list_segments ignores, then renamed into place whole
+        tmp_path = path + '.gz.tmp'
+        with open(path, 'rb') as src, gzip.open(tmp_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp_path, path + '.gz')
+        os.remove(path)
+        path += '.gz'
+    _record_summary(os.path.basename(path), summary)
+    return path
+
+def _record_summary(name, summary):
+    index = load_index()
+    index[name] = summary
+    tmp_file = INDEX_FILE + '.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump(index, f)
+    os.replace(tmp_file, INDEX_FILE)
+
+def _migrate_legacy():
+    """Move entries from the old single-array modlog.json into a rotated segment."""
+    global _legacy_checked
+    if _legacy_checked:
+        return
+    _legacy_checked = True
+    try:
+        with open(LEGACY_MODLOG_FILE, 'r') as f:
+            logs = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return
+    if logs:
+        logs.sort(key=lambda x: x.get('time', ''))
+        last = parse_time(logs[-1].get('time')) or 0
+        path = _segment_path(datetime.utcfromtimestamp(last))
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            for entry in logs:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(path + '.tmp', path)
+        _seal_segment(path)
+    os.replace(LEGACY_MODLOG_FILE, LEGACY_MODLOG_FILE + '.migrated')
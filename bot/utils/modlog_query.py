@@ -0,0 +1,205 @@
+import os
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from threading import Lock
+
+from bot.utils import modlog
+
+SEGMENT_CACHE_SIZE = 4  # decoded rotated segments kept in memory for paging
+
+class ModlogIndex:
+    """Query layer over the modlog segments.
+
+    The active segment is tailed incrementally and indexed in memory by target,
+    moderator and action. Rotated segments are only opened when their summary in
+    the modlog index says they can contain matching entries.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self._segment_cache = OrderedDict()  # path -> (mtime, entries oldest-first, times)
+        self._reset_active()
+
+    def _reset_active(self):
+        self._active_id = None
+        self._offset = 0
+        self._entries = []
+        self._times = []
+        self._by_target = {}
+        self._by_moderator = {}
+        self._by_action = {}
+
+    def _refresh_active(self):
+        try:
+            st = os.stat(modlog.MODLOG_FILE)
+        except FileNotFoundError:
+            self._reset_active()
+            return
+        active_id = (st.st_dev, st.st_ino)
+        if active_id != self._active_id or st.st_size < self._offset:
+            # The active segment was rotated away; start over on the new file
+            self._reset_active()
+            self._active_id = active_id
+        if st.st_size == self._offset:
+            return
+        with open(modlog.MODLOG_FILE, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read(st.st_size - self._offset)
+        # Only consume complete lines; a partial trailing write is picked up next time
+        end = data.rfind(b'\n') + 1
+        self._offset += end
+        for line in data[:end].split(b'\n'):
+            entry = modlog._parse_line(line)
+            if entry is None:
+                continue
+            idx = len(self._entries)
+            self._entries.append(entry)
+            self._times.append(entry.get("time", ""))
+            self._by_target.setdefault(entry.get("target"), []).append(idx)
+            self._by_moderator.setdefault(entry.get("by"), []).append(idx)
+            self._by_action.setdefault(entry.get("action"), []).append(idx)
+
+    def _active_candidates(self, target, by, action, lo, hi):
+        postings = []
+        if target is not None:
+            postings.append(self._by_target.get(target, []))
+        if by is not None:
+            postings.append(self._by_moderator.get(by, []))
+        if action is not None:
+            postings.append(self._by_action.get(action, []))
+        if not postings:
+            return range(hi - 1, lo - 1, -1)
+        # Walk the shortest posting list and check the other filters per entry
+        shortest = min(postings, key=len)
+        start = bisect_left(shortest, lo)
+        stop = bisect_left(shortest, hi)
+        return (shortest[i] for i in range(stop - 1, start - 1, -1))
+
+    def _segment_entries(self, path):
+        try:
+            mtime = os.path.getmtime(path)
+        except FileNotFoundError:
+            if path.endswith('.gz'):
+                return [], []
+            # Sealed since it was listed
+            return self._segment_entries(path + '.gz')
+        cached = self._segment_cache.get(path)
+        if cached and cached[0] == mtime:
+            self._segment_cache.move_to_end(path)
+            return cached[1], cached[2]
+        entries = list(modlog.iter_segment(path))
+        entries.reverse()
+        times = [e.get("time", "") for e in entries]
+        self._segment_cache[path] = (mtime, entries, times)
+        while len(self._segment_cache) > SEGMENT_CACHE_SIZE:
+            self._segment_cache.popitem(last=False)
+        return entries, times
+
+    def query(self, target=None, by=None, action=None, before=None, since=None, until=None, limit=50):
+        """Return up to `limit` entries newest-first.
+
+        `before` is the paging cursor from next_cursor(): "TIME~N" continues after
+        the first N matching entries at TIME, so entries sharing a second are never
+        skipped; a bare time is exclusive. `since` and `until` bound the time range
+        inclusively. Times use the modlog format, e.g. 2024-07-01T12:00:00Z.
+        """
+        results = []
+        if limit <= 0:
+            return results
+        before, skip = parse_cursor(before)
+        seen_at_cursor = 0
+
+        def matches(entry):
+            nonlocal seen_at_cursor
+            if not ((target is None or entry.get("target") == target)
+                    and (by is None or entry.get("by") == by)
+                    and (action is None or entry.get("action") == action)):
+                return False
+            if skip and entry.get("time") == before and seen_at_cursor < skip:
+                # Already returned on an earlier page
+                seen_at_cursor += 1
+                return False
+            return True
+
+        def time_bounds(times):
+            lo = bisect_left(times, since) if since else 0
+            hi = len(times)
+            if until:
+                hi = bisect_right(times, until, 0, hi)
+            if before:
+                hi = min(hi, bisect_right(times, before) if skip is not None else bisect_left(times, before))
+            return lo, hi
+
+        modlog.ensure_migrated()
+        with self.lock:
+            self._refresh_active()
+            lo, hi = time_bounds(self._times)
+            for idx in self._active_candidates(target, by, action, lo, hi):
+                entry = self._entries[idx]
+                if matches(entry):
+                    results.append(entry)
+                    if len(results) >= limit:
+                        return results
+
+            summaries = modlog.load_index()
+            for path in modlog.list_segments():
+                summary = summaries.get(os.path.basename(path))
+                if since and summary and summary.get("last") and summary["last"] < since:
+                    # This and every older segment lie entirely before the requested range
+                    break
+                if summary and not _segment_may_match(summary, target, by, action, before, skip is not None,
+                                                      since, until):
+                    continue
+                entries, times = self._segment_entries(path)
+                lo, hi = time_bounds(times)
+                for idx in range(hi - 1, lo - 1, -1):
+                    if matches(entries[idx]):
+                        results.append(entries[idx])
+                        if len(results) >= limit:
+                            return results
+        return results
+
+def parse_cursor(before):
+    """(time, entries at that time already seen) from "TIME~N"; (time, None) for a bare exclusive time."""
+    if not before:
+        return None, None
+    cursor_time, sep, seen = before.rpartition('~')
+    if not sep or not seen.isdigit():
+        return before, None
+    return cursor_time, int(seen)
+
+def next_cursor(entries, before=None):
+    """Cursor for the page after `entries`, a page returned by query(before=before)."""
+    if not entries:
+        return before
+    last_time = entries[-1].get("time", "")
+    seen = sum(1 for entry in entries if entry.get("time") == last_time)
+    cursor_time, previous = parse_cursor(before)
+    if cursor_time == last_time and previous:
+        # The whole page shared the cursor's second
+        seen += previous
+    return f"{last_time}~{seen}"
+
+def _segment_may_match(summary, target, by, action, before, inclusive, since, until):
+    first, last = summary.get("first"), summary.get("last")
+    if not summary.get("count"):
+        return False
+    if before and first and (first > before if inclusive else first >= before):
+        return False
+    if until and first and first > until:
+        return False
+    if since and last and last < since:
+        return False
+    if target is not None and target not in summary.get("targets", []):
+        return False
+    if by is not None and by not in summary.get("by", []):
+        return False
+    if action is not None and action not in summary.get("actions", []):
+        return False
+    return True
+
+_index = ModlogIndex()
+
+def query(target=None, by=None, action=None, before=None, since=None, until=None, limit=50):
+    """Entries newest-first; page with before=next_cursor(previous page, previous before)."""
+    return _index.query(target=target, by=by, action=action, before=before, since=since, until=until, limit=limit)
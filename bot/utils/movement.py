@@ -0,0 +1,281 @@
+import asyncio
+import logging
+import math
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Where the bot stands relative to the target (x, z), as the old follow loop did
+FOLLOW_OFFSET = (-1.0, -1.0)
+# walk_to is skipped while the new follow point is closer than this to the last one sent
+MIN_DISPLACEMENT = 0.75
+# Lead the target by this many seconds of its recent velocity, at most MAX_LEAD units.
+# Move events carry the clicked destination, which already leads the avatar, so
+# bench/follow_sim.py measures extra lead as overshoot; it is off by default.
+PREDICTION_HORIZON = 0.0
+MAX_LEAD = 2.0
+VELOCITY_SAMPLES = 4
+# Samples older than this no longer say anything about where the target is heading
+VELOCITY_STALE = 3.0
+# Without movement events, re-check that the target is still in the room this often
+IDLE_CHECK_INTERVAL = 5.0
+# Circle pattern: distance from the center, degrees per step and seconds between steps
+CIRCLE_RADIUS = 2.0
+CIRCLE_STEP_DEGREES = 30
+CIRCLE_INTERVAL = 2.0
+# Patrol pattern: seconds from walking to one point until walking to the next
+PATROL_DWELL = 4.0
+
+def has_coordinates(position):
+    # AnchorPosition (sitting on furniture) has no coordinates to walk to
+    return position is not None and hasattr(position, 'x')
+
+class MotionTracker:
+    """Recent positions of one user, for estimating where they are heading."""
+
+    def __init__(self, samples=VELOCITY_SAMPLES):
+        self.samples = deque(maxlen=samples)  # (time, x, z)
+
+    def add(self, when, x, z):
+        self.samples.append((when, x, z))
+
+    def velocity(self, now):
+        if len(self.samples) < 2 or now - self.samples[-1][0] > VELOCITY_STALE:
+            return 0.0, 0.0
+        t0, x0, z0 = self.samples[0]
+        t1, x1, z1 = self.samples[-1]
+        if t1 <= t0:
+            return 0.0, 0.0
+        return (x1 - x0) / (t1 - t0), (z1 - z0) / (t1 - t0)
+
+    def predict(self, now, horizon, max_lead=MAX_LEAD):
+        """Last position moved `horizon` seconds along the recent velocity (lead capped at max_lead)."""
+        _, x, z = self.samples[-1]
+        vx, vz = self.velocity(now)
+        lead_x, lead_z = vx * horizon, vz * horizon
+        lead = math.hypot(lead_x, lead_z)
+        if lead > max_lead:
+            lead_x, lead_z = lead_x * max_lead / lead, lead_z * max_lead / lead
+        return x + lead_x, z + lead_z
+
+class Follower:
+    """Keeps the bot next to a user, driven by the user's movement events.
+
+    The room state's move events wake the follower; a walk_to is only issued when
+    the follow point moved at least `min_displacement`; with a non-zero `horizon`
+    it also leads the target along its recent velocity. Stops when the target leaves the room.
+    """
+
+    def __init__(self, bot, room_state, target_id, offset=FOLLOW_OFFSET, min_displacement=MIN_DISPLACEMENT,
+                 horizon=PREDICTION_HORIZON, idle_interval=IDLE_CHECK_INTERVAL, on_walk=None):
+        self.bot = bot
+        self.room_state = room_state
+        self.target_id = target_id
+        self.offset = offset
+        self.min_displacement = min_displacement
+        self.horizon = horizon
+        self.idle_interval = idle_interval
+        self.on_walk = on_walk  # called with each position walked to
+        self.motion = MotionTracker()
+        self.last_goal = None
+        self.active = False
+        self.stats = {"events": 0, "walks": 0, "skipped": 0}
+        self._wake = asyncio.Event()
+
+    def _on_move(self, user_id, position):
+        if user_id != self.target_id or not has_coordinates(position):
+            return
+        self.stats["events"] += 1
+        self.motion.add(asyncio.get_running_loop().time(), position.x, position.z)
+        self._wake.set()
+
+    def stop(self):
+        self.active = False
+        self._wake.set()
+
+    async def steps(self):
+        """Positions to walk to, one per follow point worth moving to.
+
+        The caller does the walking; this is the follow pattern run by the
+        MovementScheduler, and run() drives it directly.
+        """
+        entry = await self.room_state.lookup(self.target_id)
+        if entry is None:
+            return
+        self.active = True
+        loop = asyncio.get_running_loop()
+        if has_coordinates(entry[1]):
+            self.motion.add(loop.time(), entry[1].x, entry[1].z)
+        self.room_state.add_move_listener(self._on_move)
+        try:
+            position = self._next_position(entry[1])
+            if position is not None:
+                yield position
+            while self.active:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.idle_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                if not self.active:
+                    break
+                if not self.room_state.is_present(self.target_id):
+                    logger.info(f"Follow target {self.target_id} left the room")
+                    break
+                position = self._next_position(self.room_state.position(self.target_id))
+                if position is not None:
+                    yield position
+        finally:
+            self.active = False
+            self.room_state.remove_move_listener(self._on_move)
+
+    async def run(self):
+        async for position in self.steps():
+            await self.bot.highrise.walk_to(position)
+            if self.on_walk:
+                self.on_walk(position)
+
+    def _next_position(self, target_position):
+        if not has_coordinates(target_position) or not self.motion.samples:
+            return None
+        x, z = self.motion.predict(asyncio.get_running_loop().time(), self.horizon)
+        goal = (x + self.offset[0], z + self.offset[1])
+        if self.last_goal is not None and math.dist(goal, self.last_goal) < self.min_displacement:
+            self.stats["skipped"] += 1
+            return None
+        self.last_goal = goal
+        self.stats["walks"] += 1
+        return type(target_position)(goal[0], target_position.y, goal[1], target_position.facing)
+
+async def circle(room_state, target_ids, position_type, radius=CIRCLE_RADIUS, step_degrees=CIRCLE_STEP_DEGREES,
+                 interval=CIRCLE_INTERVAL):
+    """Orbit the users in target_ids (their midpoint when there are several).
+
+    Users who leave drop out of the orbit; the pattern ends when none are left.
+    """
+    angle = 0
+    for target_id in target_ids:
+        await room_state.lookup(target_id)
+    while True:
+        positions = [room_state.position(target_id) for target_id in target_ids]
+        positions = [position for position in positions if has_coordinates(position)]
+        if not positions:
+            logger.info("Circle targets left the room")
+            return
+        center_x = sum(position.x for position in positions) / len(positions)
+        center_z = sum(position.z for position in positions) / len(positions)
+        y = positions[0].y
+        yield position_type(center_x + radius * math.cos(math.radians(angle)), y,
+                            center_z + radius * math.sin(math.radians(angle)), "FrontRight")
+        angle = (angle + step_degrees) % 360
+        await asyncio.sleep(interval)
+
+async def patrol(points, dwell=PATROL_DWELL, rounds=None):
+    """Walk the points in order, back to the first after the last; `rounds` limits the laps."""
+    lap = 0
+    while rounds is None or lap < rounds:
+        for point in points:
+            yield point
+            await asyncio.sleep(dwell)
+        lap += 1
+
+class MovementScheduler:
+    """The one task that moves the bot, running one pattern at a time.
+
+    A pattern is an async generator of positions; it keeps its own state and
+    pacing, and the scheduler does the walk_to calls. Starting a pattern cancels
+    the running one and waits for it to finish, so two patterns never move the
+    bot at once. Step timing is kept per pattern name.
+    """
+
+    def __init__(self, bot, on_walk=None):
+        self.bot = bot
+        self.on_walk = on_walk  # called with each position walked to
+        self.name = None
+        self.task = None
+        self.timings = {}  # pattern name -> step counters
+        self._lock = asyncio.Lock()
+
+    @property
+    def active(self):
+        return self.task is not None and not self.task.done()
+
+    async def start(self, name, pattern):
+        """Run `pattern` (an async generator of positions) in place of the current one."""
+        async with self._lock:
+            await self._cancel()
+            self.name = name
+            self.task = asyncio.create_task(self._run(name, pattern))
+            return self.task
+
+    async def stop(self):
+        """Cancel the running pattern and wait until it has cleaned up."""
+        async with self._lock:
+            await self._cancel()
+
+    async def _cancel(self):
+        task = self.task
+        if task is None:
+            return
+        if not task.done():
+            task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        if self.task is task:
+            self.task = None
+            self.name = None
+
+    async def _run(self, name, pattern):
+        loop = asyncio.get_running_loop()
+        timing = self.timings.setdefault(name, {"runs": 0, "steps": 0, "errors": 0, "walk_total": 0.0,
+                                                "walk_max": 0.0, "interval_total": 0.0, "intervals": 0})
+        timing["runs"] += 1
+        last_step = None
+        try:
+            async for position in pattern:
+                started = loop.time()
+                if last_step is not None:
+                    timing["interval_total"] += started - last_step
+                    timing["intervals"] += 1
+                last_step = started
+                try:
+                    await self.bot.highrise.walk_to(position)
+                except Exception as e:
+                    timing["errors"] += 1
+                    logger.error(f"Movement pattern {name} failed to walk: {e}")
+                    continue
+                elapsed = loop.time() - started
+                timing["steps"] += 1
+                timing["walk_total"] += elapsed
+                timing["walk_max"] = max(timing["walk_max"], elapsed)
+                if self.on_walk:
+                    self.on_walk(position)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Movement pattern {name} stopped: {e}")
+        finally:
+            await pattern.aclose()
+            if self.task is asyncio.current_task():
+                self.task = None
+                self.name = None
+
+    def step_timing(self, name=None):
+        """Steps, mean/max walk_to time and mean time between steps (seconds) for one pattern or all."""
+        names = [name] if name is not None else list(self.timings)
+        summary = {}
+        for pattern_name in names:
+            timing = self.timings.get(pattern_name)
+            if timing is None:
+                continue
+            summary[pattern_name] = {
+                "runs": timing["runs"],
+                "steps": timing["steps"],
+                "errors": timing["errors"],
+                "walk_mean": round(timing["walk_total"] / timing["steps"], 3) if timing["steps"] else 0.0,
+                "walk_max": round(timing["walk_max"], 3),
+                "interval_mean": round(timing["interval_total"] / timing["intervals"], 3) if timing["intervals"] else 0.0
+            }
+        return summary
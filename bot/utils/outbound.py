@@ -0,0 +1,187 @@
+import asyncio
+import logging
+import time
+import unicodedata
+from collections import Counter, deque
+
+try:
+    import regex
+except ImportError:  # optional: exact extended grapheme clusters via \X
+    regex = None
+
+logger = logging.getLogger(__name__)
+
+# Longest whisper the platform accepts, in characters
+MAX_MESSAGE_LENGTH = 256
+# Pause between consecutive chunks to the same user, so they arrive in order without tripping rate limits
+CHUNK_INTERVAL = 0.3
+# Whispers being sent at once, across all users
+MAX_IN_FLIGHT = 4
+
+_ZWJ = "\u200d"
+
+def _is_regional_indicator(ch):
+    return 0x1F1E6 <= ord(ch) <= 0x1F1FF
+
+def _extends_cluster(ch):
+    cp = ord(ch)
+    return (ch == _ZWJ or unicodedata.category(ch) in ("Mn", "Mc", "Me")
+            or 0xFE00 <= cp <= 0xFE0F  # variation selectors (emoji presentation)
+            or 0x1F3FB <= cp <= 0x1F3FF  # skin tone modifiers
+            or 0xE0020 <= cp <= 0xE007F)  # tag characters (subdivision flags)
+
+def graphemes(text):
+    """Split text into user-perceived characters, so emoji and accents are never cut apart."""
+    if regex is not None:
+        return regex.findall(r"\X", text)
+    clusters = []
+    for ch in text:
+        if clusters and (_extends_cluster(ch) or clusters[-1].endswith(_ZWJ)
+                         or (len(clusters[-1]) == 1 and _is_regional_indicator(clusters[-1])
+                             and _is_regional_indicator(ch))):
+            clusters[-1] += ch
+        else:
+            clusters.append(ch)
+    return clusters
+
+def _split_line(line, limit):
+    """Pieces of one line within limit: at spaces where possible, else between graphemes."""
+    if len(line) <= limit:
+        yield line
+        return
+    current = ""
+    for word in line.split(" "):
+        candidate = f"{current} {word}" if current else word
+        if len(candidate) <= limit:
+            current = candidate
+            continue
+        if current:
+            yield current
+            current = ""
+        if len(word) <= limit:
+            current = word
+            continue
+        for cluster in graphemes(word):
+            if current and len(current) + len(cluster) > limit:
+                yield current
+                current = ""
+            current += cluster
+    if current:
+        yield current
+
+def split_text(text, limit=MAX_MESSAGE_LENGTH):
+    """Chunks of at most `limit` characters, breaking at newlines, then spaces, then graphemes."""
+    if len(text) <= limit:
+        return [text]
+    chunks = []
+    current = None
+    for line in text.split("\n"):
+        for piece in _split_line(line, limit):
+            if current is None:
+                current = piece
+            elif len(current) + 1 + len(piece) <= limit:
+                current = f"{current}\n{piece}"
+            else:
+                chunks.append(current)
+                current = piece
+    if current:
+        chunks.append(current)
+    # A chunk starting with the blank line that separated it from the previous one
+    return [chunk.lstrip("\n") for chunk in chunks if chunk.strip()]
+
+class Outbound:
+    """Whisper delivery: texts split once into chunks, sent in order per user with pacing.
+
+    Static texts (help menus) are registered once and their chunks reused.
+    whisper() queues the chunks and returns a future for their delivery, so a
+    command handler does not wait out the pacing between chunks; one worker per
+    recipient keeps their whispers in order, and at most MAX_IN_FLIGHT sends run
+    at the same time overall.
+    """
+
+    def __init__(self, limit=MAX_MESSAGE_LENGTH, interval=CHUNK_INTERVAL, in_flight=MAX_IN_FLIGHT):
+        self.limit = limit
+        self.interval = interval
+        self.in_flight = in_flight
+        self.static = {}  # name -> tuple of chunks
+        self.queues = {}  # user_id -> deque of (bot, chunks, future)
+        self._semaphore = None
+        self.stats = {"whispers": 0, "chunks": 0, "static_hits": 0, "failed": 0}
+        self.chunks_per_whisper = Counter()
+
+    def register_static(self, name, text):
+        """Split a fixed text now; later whispers of `name` reuse the chunks."""
+        self.static[name] = tuple(split_text(text, self.limit))
+        return self.static[name]
+
+    def chunks(self, text):
+        return split_text(text, self.limit)
+
+    async def whisper(self, bot, user_id, text=None, static=None, wait=False):
+        """Queue a whisper of `text` (or of the registered static text `static`).
+
+        Returns a future resolved with the number of chunks delivered; with wait=True
+        it is awaited before returning.
+        """
+        if static is not None:
+            chunks = self.static[static]
+            self.stats["static_hits"] += 1
+        else:
+            chunks = self.chunks(text)
+        self.stats["whispers"] += 1
+        self.stats["chunks"] += len(chunks)
+        self.chunks_per_whisper[len(chunks)] += 1
+        future = asyncio.get_running_loop().create_future()
+        queue = self.queues.get(user_id)
+        if queue is None:
+            queue = self.queues[user_id] = deque()
+            queue.append((bot, chunks, future))
+            asyncio.create_task(self._drain(user_id, queue))
+        else:
+            queue.append((bot, chunks, future))
+        if wait:
+            await future
+        return future
+
+    async def _drain(self, user_id, queue):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.in_flight)
+        last_sent = None
+        try:
+            while queue:
+                bot, chunks, future = queue[0]
+                delivered = 0
+                for chunk in chunks:
+                    if last_sent is not None:
+                        delay = self.interval - (time.monotonic() - last_sent)
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                    try:
+                        async with self._semaphore:
+                            await bot.highrise.send_whisper(user_id, chunk)
+                        delivered += 1
+                    except Exception as e:
+                        self.stats["failed"] += 1
+                        logger.error(f"Failed to whisper {user_id}: {e}")
+                    last_sent = time.monotonic()
+                queue.popleft()
+                if not future.done():
+                    future.set_result(delivered)
+        finally:
+            if self.queues.get(user_id) is queue:
+                del self.queues[user_id]
+            for _, _, future in queue:
+                if not future.done():
+                    future.cancel()
+
+    def metrics(self):
+        whispers = self.stats["whispers"]
+        return dict(
+            self.stats,
+            chunks_per_whisper=round(self.stats["chunks"] / whispers, 2) if whispers else 0.0,
+            max_chunks=max(self.chunks_per_whisper, default=0),
+            distribution=dict(sorted(self.chunks_per_whisper.items())),
+            queued_users=len(self.queues)
+        )
+
+outbound = Outbound()
@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+OPTION_LABELS = "ABCDEFGHIJ"
+MAX_OPTIONS = len(OPTION_LABELS)
+# Polls close on their own after this many seconds unless closed earlier
+DEFAULT_DURATION = 5 * 60.0
+# Votes arriving within this many seconds share one results broadcast
+BROADCAST_INTERVAL = 5.0
+
+class Poll:
+    """One poll: options, who has voted, and a running count per option."""
+
+    def __init__(self, question, options, creator_id, creator, duration):
+        self.question = question
+        self.options = list(options)
+        self.creator_id = creator_id
+        self.creator = creator
+        self.created_at = time.time()
+        self.closes_at = self.created_at + duration
+        self.voters = set()
+        self.counts = [0] * len(self.options)
+        self.total = 0
+        self._choices = {}  # label, number and casefolded option text -> index
+        for index in range(len(self.options)):
+            self._choices[OPTION_LABELS[index].casefold()] = index
+            self._choices[str(index + 1)] = index
+        for index, option in enumerate(self.options):
+            # An option named like another option's label or number could never be voted for by name
+            key = option.strip().casefold()
+            if self._choices.get(key, index) != index:
+                raise ValueError(f"Option '{option}' is the same as another option or its letter/number")
+            self._choices[key] = index
+
+    def option_index(self, choice):
+        return self._choices.get(choice.strip().casefold())
+
+    def vote(self, user_id, index):
+        if user_id in self.voters:
+            return False
+        self.voters.add(user_id)
+        self.counts[index] += 1
+        self.total += 1
+        return True
+
+    def results(self):
+        options = []
+        for index, option in enumerate(self.options):
+            count = self.counts[index]
+            options.append({
+                "label": OPTION_LABELS[index],
+                "option": option,
+                "votes": count,
+                "percent": round(count * 100 / self.total, 1) if self.total else 0.0
+            })
+        top = max(self.counts)
+        winners = [entry for entry in options if entry["votes"] == top] if top else []
+        return {
+            "question": self.question,
+            "creator": self.creator,
+            "options": options,
+            "total_votes": self.total,
+            "winners": winners,
+            "closes_at": self.closes_at
+        }
+
+def format_results(results, title="📊 Current Results"):
+    lines = [title, f"❓ {results['question']}"]
+    for entry in results["options"]:
+        lines.append(f"{entry['label']}) {entry['option']}: {entry['votes']} votes ({entry['percent']}%)")
+    lines.append(f"📈 Total votes: {results['total_votes']}")
+    return "\n".join(lines)
+
+def format_winner(results):
+    winners = results["winners"]
+    if not winners:
+        return "🤷 No votes were cast."
+    if len(winners) == 1:
+        return f"🏆 {winners[0]['label']} ({winners[0]['option']}) WINS!"
+    return f"🤝 IT'S A TIE between {', '.join(entry['label'] for entry in winners)}!"
+
+class PollEngine:
+    """Polls per room with one vote per user and throttled results broadcasts.
+
+    A vote only updates the poll's counters; results go out to the room at most
+    once per `broadcast_interval`, covering every vote since the last broadcast.
+    Each poll closes itself after its duration and announces the final results.
+    """
+
+    def __init__(self, send, broadcast_interval=BROADCAST_INTERVAL, duration=DEFAULT_DURATION):
+        self.send = send  # async callable(text) that chats to the room
+        self.broadcast_interval = broadcast_interval
+        self.duration = duration
+        self.polls = {}  # room_id -> Poll
+        self._broadcast_tasks = {}
+        self._close_tasks = {}
+        self._last_broadcast = {}
+        self.stats = {"votes": 0, "rejected": 0, "broadcasts": 0}
+
+    def has_active_poll(self, room_id):
+        return room_id in self.polls
+
+    def create(self, room_id, question, options, creator_id, creator, duration=None):
+        """Start a poll; returns it, or None when the room already has one.
+
+        Raises ValueError for a bad option count or options that collide with each other's labels.
+        """
+        if room_id in self.polls:
+            return None
+        if not 2 <= len(options) <= MAX_OPTIONS:
+            raise ValueError(f"A poll needs between 2 and {MAX_OPTIONS} options")
+        poll = Poll(question, options, creator_id, creator, duration or self.duration)
+        self.polls[room_id] = poll
+        self._close_tasks[room_id] = asyncio.create_task(self._close_later(room_id, poll))
+        return poll
+
+    def vote(self, room_id, user_id, choice):
+        """Record a vote: returns "ok", "duplicate", "invalid" or "no_poll"."""
+        poll = self.polls.get(room_id)
+        if poll is None:
+            return "no_poll"
+        index = poll.option_index(choice)
+        if index is None:
+            return "invalid"
+        if not poll.vote(user_id, index):
+            self.stats["rejected"] += 1
+            return "duplicate"
+        self.stats["votes"] += 1
+        self._schedule_broadcast(room_id)
+        return "ok"
+
+    def results(self, room_id):
+        poll = self.polls.get(room_id)
+        return poll.results() if poll else None
+
+    def _schedule_broadcast(self, room_id):
+        if room_id in self._broadcast_tasks:
+            return
+        elapsed = time.monotonic() - self._last_broadcast.get(room_id, float("-inf"))
+        delay = max(0.0, self.broadcast_interval - elapsed)
+        self._broadcast_tasks[room_id] = asyncio.create_task(self._broadcast_later(room_id, delay))
+
+    async def _broadcast_later(self, room_id, delay):
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self._broadcast_tasks.pop(room_id, None)
+        results = self.results(room_id)
+        if results is None:
+            return
+        self._last_broadcast[room_id] = time.monotonic()
+        self.stats["broadcasts"] += 1
+        await self._send(format_results(results))
+
+    async def _close_later(self, room_id, poll):
+        await asyncio.sleep(max(0.0, poll.closes_at - time.time()))
+        if self.polls.get(room_id) is not poll:
+            return
+        results = self.close(room_id)
+        await self._send(f"{format_results(results, '⏰ POLL CLOSED')}\n{format_winner(results)}")
+
+    def close(self, room_id):
+        """End the room's poll and return its final results, or None if there is none."""
+        poll = self.polls.pop(room_id, None)
+        if poll is None:
+            return None
+        for tasks in (self._broadcast_tasks, self._close_tasks):
+            task = tasks.pop(room_id, None)
+            if task is not None and task is not asyncio.current_task():
+                task.cancel()
+        self._last_broadcast.pop(room_id, None)
+        return poll.results()
+
+    async def _send(self, text):
+        try:
+            await self.send(text)
+        except Exception as e:
+            logger.error(f"Failed to send poll message: {e}")
@@ -1,15 +1,41 @@
 import json
+import logging
 import os
+import time
+from threading import Lock
+from bot.core import profile_manager
+from bot.utils import change_feed
+
+logger = logging.getLogger(__name__)
 
 ROLES_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'roles.json')
 
+# Each role has its own rank, so require_role(uid, "vip") does not admit trusted users
 ROLE_HIERARCHY = {
     "user": 1,
     "trusted": 2,
-    "admin": 3,
-    "owner": 4
+    "vip": 3,
+    "admin": 4,
+    "owner": 5
 }
 
+# roles.json list name -> role, highest precedence first
+ROLE_LISTS = [
+    ("owners", "owner"),
+    ("admins", "admin"),
+    ("vips", "vip"),
+    ("trusted", "trusted")
+]
+
+# Inline profile roles carried into roles.json by migrate_profile_roles; admin and owner never are
+MIGRATED_PROFILE_ROLES = ("trusted", "vip")
+
+# How often (seconds) get_role re-stats roles.json to pick up edits from other processes
+MTIME_CHECK_INTERVAL = 1.0
+
+_lock = Lock()
+_cache = {"built": False, "mtime": None, "checked_at": 0.0, "roles": {}}
+
 def load_roles():
     try:
         with open(ROLES_FILE, 'r') as f:
@@ -18,22 +44,99 @@ def load_roles():
         return {"owners": [], "admins": [], "trusted": []}
 
 def save_roles(roles):
-    with open(ROLES_FILE, 'w') as f:
-        json.dump(roles, f, indent=2)
+    with _lock:
+        with open(ROLES_FILE, 'w') as f:
+            json.dump(roles, f, indent=2)
+        _build_cache(roles, _file_mtime())
+
+def _file_mtime():
+    try:
+        return os.stat(ROLES_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def _build_cache(roles, mtime):
+    by_user = {}
+    # Walk lowest precedence first so higher roles overwrite
+    for list_name, role in reversed(ROLE_LISTS):
+        for user_id in roles.get(list_name, []):
+            by_user[user_id] = role
+    _cache["roles"] = by_user
+    _cache["built"] = True
+    _cache["mtime"] = mtime
+    _cache["checked_at"] = time.monotonic()
+
+def _refresh():
+    now = time.monotonic()
+    if _cache["built"] and now - _cache["checked_at"] < MTIME_CHECK_INTERVAL:
+        return
+    with _lock:
+        mtime = _file_mtime()
+        if not _cache["built"] or mtime != _cache["mtime"]:
+            _build_cache(load_roles(), mtime)
+        else:
+            _cache["checked_at"] = now
+
+def invalidate():
+    with _lock:
+        _cache["built"] = False
 
 def get_role(user_id):
+    _refresh()
+    return _cache["roles"].get(user_id, "user")
+
+def get_level(user_id):
+    return ROLE_HIERARCHY.get(get_role(user_id), 0)
+
+def set_role(user_id, role):
+    """Put user_id in the list for `role` (removing it from the others). "user" clears all roles."""
+    set_roles({user_id: role})
+
+def set_roles(assignments):
+    """Apply several user_id -> role changes with one load and save of roles.json."""
+    if not assignments:
+        return
     roles = load_roles()
-    if user_id in roles.get("owners", []):
-        return "owner"
-    elif user_id in roles.get("admins", []):
-        return "admin"
-    elif user_id in roles.get("trusted", []):
-        return "trusted"
-    else:
-        return "user"
+    for user_id, role in assignments.items():
+        for list_name, list_role in ROLE_LISTS:
+            members = roles.get(list_name, [])
+            if user_id in members:
+                members.remove(user_id)
+            if list_role == role:
+                members.append(user_id)
+                roles[list_name] = members
+    save_roles(roles)
+    for user_id in assignments:
+        change_feed.publish_profile(user_id, role=get_role(user_id))
 
 def require_role(user_id, minimum_level):
-    user_role = get_role(user_id)
-    user_level = ROLE_HIERARCHY.get(user_role, 0)
+    user_level = get_level(user_id)
     required_level = ROLE_HIERARCHY.get(minimum_level, 0)
     return user_level >= required_level
+
+def migrate_profile_roles():
+    """Move roles left inline in profiles (from before roles.json) into roles.json, once.
+
+    Only trusted and vip are carried over, and only for users roles.json has no
+    role for; a legacy admin or owner is logged and must be granted explicitly.
+    The field is removed from every profile, so later runs find nothing to do.
+    Returns the assignments made.
+    """
+    legacy = {user_id: profile["role"] for user_id, profile in profile_manager.iter_profiles() if "role" in profile}
+    if not legacy:
+        return {}
+    assignments = {}
+    for user_id, role in legacy.items():
+        if role in MIGRATED_PROFILE_ROLES and get_role(user_id) == "user":
+            assignments[user_id] = role
+        elif role in ("admin", "owner") and get_role(user_id) != role:
+            logger.warning(f"Not migrating inline {role} role of {user_id}; grant it in roles.json if still wanted")
+
+    def drop_role(profile):
+        profile.pop("role", None)
+        return {}
+
+    set_roles(assignments)
+    profile_manager.update_profiles({user_id: drop_role for user_id in legacy})
+    logger.info(f"Migrated inline profile roles: {len(assignments)} assigned, {len(legacy)} profiles cleaned")
+    return assignments
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# A lookup miss only falls back to get_room_users if the last refresh is older than this
+MISS_REFRESH_INTERVAL = 5.0
+# Without any refresh for this long the view is re-seeded on the next read, in case events were missed
+MAX_AGE = 10 * 60.0
+
+def normalize_username(username):
+    return username.strip().lstrip('@').casefold()
+
+class RoomState:
+    """Who is in the room and where, kept current from join/leave/move events.
+
+    Holds user_id -> (user, position) and username -> user_id. get_room_users is
+    only called to seed the view, when it is older than MAX_AGE, or when a lookup
+    misses and the last refresh is older than MISS_REFRESH_INTERVAL.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.users = {}  # user_id -> (User, Position or AnchorPosition)
+        self.ids_by_name = {}  # normalized username -> user_id
+        self.refreshed_at = None
+        self.api_calls = 0
+        self._refresh_lock = asyncio.Lock()
+        self._move_listeners = []
+
+    def on_join(self, user, position=None):
+        self.users[user.id] = (user, position)
+        self.ids_by_name[normalize_username(user.username)] = user.id
+
+    def on_leave(self, user):
+        entry = self.users.pop(user.id, None)
+        username = entry[0].username if entry else getattr(user, 'username', None)
+        if username and self.ids_by_name.get(normalize_username(username)) == user.id:
+            del self.ids_by_name[normalize_username(username)]
+
+    def on_move(self, user, destination):
+        self.users[user.id] = (user, destination)
+        self.ids_by_name.setdefault(normalize_username(user.username), user.id)
+        for listener in list(self._move_listeners):
+            try:
+                listener(user.id, destination)
+            except Exception as e:
+                logger.error(f"Room state move listener failed: {e}")
+
+    def add_move_listener(self, listener):
+        """Call listener(user_id, position) on every move event."""
+        self._move_listeners.append(listener)
+
+    def remove_move_listener(self, listener):
+        if listener in self._move_listeners:
+            self._move_listeners.remove(listener)
+
+    async def refresh(self):
+        """Re-seed the whole view from one get_room_users call."""
+        async with self._refresh_lock:
+            self.api_calls += 1
+            room_users = (await self.bot.highrise.get_room_users()).content
+            self.users = {user.id: (user, position) for user, position in room_users}
+            self.ids_by_name = {normalize_username(user.username): user.id for user, _ in room_users}
+            self.refreshed_at = time.monotonic()
+
+    async def _ensure_seeded(self):
+        if self.refreshed_at is None or time.monotonic() - self.refreshed_at > MAX_AGE:
+            await self.refresh()
+
+    async def _refresh_on_miss(self):
+        if self.refreshed_at is None or time.monotonic() - self.refreshed_at > MISS_REFRESH_INTERVAL:
+            await self.refresh()
+            return True
+        return False
+
+    async def lookup(self, user_id):
+        """(user, position) for a user in the room, or None."""
+        await self._ensure_seeded()
+        entry = self.users.get(user_id)
+        if entry is None and await self._refresh_on_miss():
+            entry = self.users.get(user_id)
+        return entry
+
+    async def find_by_username(self, username):
+        """The User with this username (case-insensitive, '@' optional), or None."""
+        await self._ensure_seeded()
+        key = normalize_username(username)
+        user_id = self.ids_by_name.get(key)
+        if user_id is None and await self._refresh_on_miss():
+            user_id = self.ids_by_name.get(key)
+        entry = self.users.get(user_id) if user_id else None
+        return entry[0] if entry else None
+
+    def position(self, user_id):
+        """Last known position without any API call, or None."""
+        entry = self.users.get(user_id)
+        return entry[1] if entry else None
+
+    def is_present(self, user_id):
+        return user_id in self.users
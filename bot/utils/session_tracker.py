@@ -0,0 +1,130 @@
+import json
+import logging
+import os
+import time
+from threading import Lock
+from bot.core import profile_manager
+from bot.utils import xp_manager
+
+logger = logging.getLogger(__name__)
+
+SESSIONS_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'sessions.json')
+
+# Open sessions are credited and written to SESSIONS_FILE this often (seconds)
+CHECKPOINT_INTERVAL = 5 * 60
+
+# A user still in the room after a restart this soon after the last checkpoint
+# keeps their session, and the downtime counts as time spent
+RESUME_GRACE = CHECKPOINT_INTERVAL
+
+class SessionTracker:
+    """Room sessions credited incrementally and checkpointed to disk.
+
+    Each checkpoint credits the whole minutes every open session has accrued
+    (1 XP and 1 minute of time_spent per minute) in one batched profile update.
+    The remaining seconds carry over. A crash loses at most one interval.
+    """
+
+    def __init__(self, path=SESSIONS_FILE):
+        self.path = path
+        self.lock = Lock()
+        self.sessions = {}  # user_id -> {"joined": epoch, "credited_until": epoch}
+
+    def is_open(self, user_id):
+        return user_id in self.sessions
+
+    def open(self, user_id, now=None):
+        return bool(self.open_many([user_id], now))
+
+    def open_many(self, user_ids, now=None):
+        """Start sessions for users that do not have one; returns the newly opened ids."""
+        now = time.time() if now is None else now
+        opened = []
+        with self.lock:
+            for user_id in user_ids:
+                if user_id not in self.sessions:
+                    self.sessions[user_id] = {"joined": now, "credited_until": now}
+                    opened.append(user_id)
+        return opened
+
+    def close(self, user_id, now=None):
+        """End a session and credit its uncredited whole minutes. None if no session was open."""
+        now = time.time() if now is None else now
+        with self.lock:
+            session = self.sessions.pop(user_id, None)
+            if session is None:
+                return None
+            # Saved before crediting, so a crash in between cannot credit the session twice on recovery
+            self._save(self.sessions, now)
+        minutes = int((now - session["credited_until"]) // 60)
+        self._credit({user_id: minutes})
+        return minutes
+
+    def checkpoint(self, now=None):
+        """Credit accrued minutes for all open sessions and save them.
+
+        Returns {user_id: minutes} for the users with a profile that were credited.
+        """
+        now = time.time() if now is None else now
+        minutes_by_user = {}
+        with self.lock:
+            for user_id, session in self.sessions.items():
+                minutes = int((now - session["credited_until"]) // 60)
+                if minutes > 0:
+                    session["credited_until"] += minutes * 60
+                    minutes_by_user[user_id] = minutes
+        credited = self._credit(minutes_by_user)
+        with self.lock:
+            # The sessions as they are now, so a close during the credit is not undone
+            self._save(self.sessions, now)
+        return {user_id: minutes_by_user[user_id] for user_id in credited}
+
+    def recover(self, present_user_ids=(), now=None):
+        """Reconcile the checkpoint left by the previous run.
+
+        Sessions of users in `present_user_ids` resume if the restart came within
+        RESUME_GRACE of the checkpoint; all others are closed at the checkpoint time.
+        Returns the ids of the resumed sessions.
+        """
+        now = time.time() if now is None else now
+        try:
+            with open(self.path, 'r') as f:
+                saved = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return []
+        saved_at = saved.get("saved_at", now)
+        present = set(present_user_ids)
+        resumed = []
+        closing = {}
+        with self.lock:
+            for user_id, session in saved.get("sessions", {}).items():
+                if user_id in present and now - saved_at <= RESUME_GRACE:
+                    self.sessions.setdefault(user_id, session)
+                    resumed.append(user_id)
+                else:
+                    closing[user_id] = int((saved_at - session["credited_until"]) // 60)
+        self._credit(closing)
+        with self.lock:
+            self._save(self.sessions, now)
+        if saved.get("sessions"):
+            logger.info(f"Recovered sessions: {len(resumed)} resumed, {len(closing)} closed")
+        return resumed
+
+    def _credit(self, minutes_by_user):
+        def credit(minutes):
+            def update(profile):
+                stats = profile.setdefault("stats", {})
+                xp, level = xp_manager.apply_xp(stats, minutes)
+                stats["time_spent"] = stats.get("time_spent", 0) + minutes
+                return {"xp": xp, "level": level, "time_spent": stats["time_spent"]}
+            return update
+
+        updates = {user_id: credit(minutes) for user_id, minutes in minutes_by_user.items() if minutes > 0}
+        return profile_manager.update_profiles(updates)
+
+    def _save(self, sessions, now):
+        # Caller holds the lock, so saves land in the order the sessions changed
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({"saved_at": now, "sessions": sessions}, f)
+        os.replace(tmp_path, self.path)
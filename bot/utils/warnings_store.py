@@ -0,0 +1,84 @@
+import json
+import os
+import sqlite3
+import time
+from threading import Lock
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'data')
+WARNINGS_DB = os.path.join(DATA_DIR, 'warnings.db')
+LEGACY_WARNINGS_FILE = os.path.join(DATA_DIR, 'warnings.json')
+
+_lock = Lock()
+_conn = None
+
+def _connect():
+    global _conn
+    if _conn is None:
+        conn = sqlite3.connect(WARNINGS_DB, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS warnings ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " user_id TEXT NOT NULL,"
+            " reason TEXT NOT NULL,"
+            " by TEXT NOT NULL,"
+            " time INTEGER NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_warnings_user_time ON warnings (user_id, time)")
+        _import_legacy(conn)
+        conn.commit()
+        _conn = conn
+    return _conn
+
+def _import_legacy(conn):
+    """Load the old user_id -> [warning, ...] warnings.json once, then set it aside."""
+    try:
+        with open(LEGACY_WARNINGS_FILE, 'r') as f:
+            legacy = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return
+    rows = [
+        (user_id, w.get("reason", ""), w.get("by", ""), int(w.get("time", 0)))
+        for user_id, user_warnings in legacy.items()
+        for w in user_warnings
+    ]
+    if rows:
+        conn.executemany("INSERT INTO warnings (user_id, reason, by, time) VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+    os.replace(LEGACY_WARNINGS_FILE, LEGACY_WARNINGS_FILE + '.migrated')
+
+def add_warning(user_id, reason, by, when=None):
+    when = int(time.time()) if when is None else int(when)
+    with _lock:
+        conn = _connect()
+        conn.execute("INSERT INTO warnings (user_id, reason, by, time) VALUES (?, ?, ?, ?)", (user_id, reason, by, when))
+        conn.commit()
+    return {"reason": reason, "by": by, "time": when}
+
+def get_warnings(user_id):
+    with _lock:
+        rows = _connect().execute(
+            "SELECT reason, by, time FROM warnings WHERE user_id = ? ORDER BY time, id", (user_id,)
+        ).fetchall()
+    return [{"reason": reason, "by": by, "time": when} for reason, by, when in rows]
+
+def count_warnings(user_id, window=None, now=None):
+    """Number of warnings for a user, optionally only those issued in the last `window` seconds."""
+    with _lock:
+        conn = _connect()
+        if window is None:
+            row = conn.execute("SELECT COUNT(*) FROM warnings WHERE user_id = ?", (user_id,)).fetchone()
+        else:
+            since = (time.time() if now is None else now) - window
+            row = conn.execute(
+                "SELECT COUNT(*) FROM warnings WHERE user_id = ? AND time >= ?", (user_id, int(since))
+            ).fetchone()
+    return row[0]
+
+def clear_warnings(user_id):
+    with _lock:
+        conn = _connect()
+        cursor = conn.execute("DELETE FROM warnings WHERE user_id = ?", (user_id,))
+        conn.commit()
+    return cursor.rowcount
@@ -0,0 +1,171 @@
+from datetime import datetime
+from threading import Lock
+from bot.core import profile_manager
+from bot.utils import achievements_manager
+from bot.utils import change_feed
+from bot.utils import roles
+
+# Most impressive first; the welcome message shows the best achievement a user has
+ACHIEVEMENT_PRIORITY = [
+    "engage-time24h", "engage-join100", "engage-chat500",
+    "admin-helper", "vip-status", "loop-master",
+    "social-butterfly", "emote-enthusiast", "engage-time6h",
+    "engage-join25", "engage-chat200", "engage-time1h",
+    "engage-join5", "engage-chat50", "engage-chat10",
+    "profile-viewer", "first-emote", "help-seeker", "first-profile",
+    "time_spent_10h", "hundred_messages", "level_5", "first_message"
+]
+ACHIEVEMENT_RANK = {achievement_id: rank for rank, achievement_id in enumerate(ACHIEVEMENT_PRIORITY)}
+
+def format_total_time(seconds):
+    total_seconds = int(seconds)
+    if total_seconds >= 3600:
+        return f"{total_seconds // 3600}h {(total_seconds % 3600) // 60}m"
+    if total_seconds >= 60:
+        return f"{total_seconds // 60}m"
+    return f"{total_seconds}s"
+
+def top_achievement(achievements):
+    """Title of the highest ranked achievement, or of the first one when none is ranked."""
+    best = None
+    best_rank = None
+    for position, achievement in enumerate(achievements):
+        if isinstance(achievement, dict):
+            achievement_id = achievement.get("id", "")
+        else:
+            achievement_id = achievement
+        rank = (ACHIEVEMENT_RANK.get(achievement_id, len(ACHIEVEMENT_RANK)), position)
+        if best_rank is None or rank < best_rank:
+            best, best_rank = achievement, rank
+    if best is None:
+        return None
+    if isinstance(best, dict):
+        return best.get("title", "Achievement Unlocked")
+    return achievements_manager.ACHIEVEMENTS.get(best, {}).get("name", best)
+
+class WelcomeCache:
+    """Per-user welcome cards (name, role, visits, formatted time, top achievement).
+
+    Cards are built once from a single pass over the profiles and then kept
+    current from this process's change feed events, so join and leave handling
+    reads one card instead of loading profiles, roles and achievements separately.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.cards = {}
+        self.loaded = False
+        change_feed.subscribe(self.on_change)
+
+    def warm(self):
+        cards = {}
+        for user_id, profile in profile_manager.iter_profiles():
+            cards[user_id] = self._build_card(profile)
+        with self.lock:
+            self.cards = cards
+            self.loaded = True
+
+    def _build_card(self, profile):
+        stats = profile.get("stats", {})
+        return {
+            "name": profile.get("name", ""),
+            "visits": stats.get("room_joins", 0),
+            "time": format_total_time(stats.get("total_time", 0)),
+            "level": stats.get("level", 1),
+            "xp": stats.get("xp", 0),
+            "messages": stats.get("messages", 0),
+            "last_seen": stats.get("last_seen"),
+            "top_achievement": top_achievement(profile.get("achievements", []))
+        }
+
+    def get_card(self, user_id):
+        """A copy of the user's card, or None when they have no profile."""
+        if not self.loaded:
+            self.warm()
+        with self.lock:
+            card = self.cards.get(user_id)
+            if card is None:
+                return None
+            card = dict(card)
+        card["role"] = roles.get_role(user_id)
+        return card
+
+    def record_join(self, user_id, now=None):
+        """Save the visit (room_joins, last_seen) and return the card to show for this join.
+
+        The returned card keeps the previous `last_seen`; the stored card picks up
+        the new values from the change feed event the profile write publishes.
+        Time spent is read from the profile here, since the leave handler that
+        adds to `total_time` does not publish it.
+        """
+        if not self.loaded:
+            self.warm()
+        now = now or datetime.utcnow()
+        with self.lock:
+            card = self.cards.get(user_id)
+            if card is None:
+                return None
+            shown = dict(card)
+        previous = {}
+
+        def visit(profile):
+            stats = profile.setdefault("stats", {})
+            previous["last_seen"] = stats.get("last_seen")
+            previous["time"] = format_total_time(stats.get("total_time", 0))
+            stats["room_joins"] = stats.get("room_joins", 0) + 1
+            stats["last_seen"] = now.isoformat()
+            return {"room_joins": stats["room_joins"], "last_seen": stats["last_seen"]}
+
+        changed = profile_manager.update_profiles({user_id: visit})
+        if user_id not in changed:
+            return None
+        with self.lock:
+            card = self.cards.get(user_id)
+            if card is not None:
+                card["time"] = previous["time"]
+        shown["time"] = previous["time"]
+        shown["visits"] = changed[user_id]["room_joins"]
+        shown["last_seen"] = previous["last_seen"]
+        shown["role"] = roles.get_role(user_id)
+        return shown
+
+    def on_change(self, event):
+        kind = event.get("type")
+        user_id = event.get("user_id")
+        with self.lock:
+            if not self.loaded:
+                return
+            if kind == "profile_deleted":
+                self.cards.pop(user_id, None)
+            elif kind == "levels_rebalanced":
+                # Every level may have moved; rebuild the cards on next use
+                self.loaded = False
+            elif kind == "achievement":
+                card = self.cards.get(user_id)
+                if card is not None:
+                    card["top_achievement"] = top_achievement(event.get("achievements", []))
+            elif kind == "profile":
+                fields = event.get("fields", {})
+                card = self.cards.get(user_id)
+                if card is None:
+                    if "name" not in fields:
+                        return
+                    card = self.cards[user_id] = self._build_card({})
+                for field in ("name", "level", "xp", "messages", "last_seen"):
+                    if field in fields:
+                        card[field] = fields[field]
+                if "room_joins" in fields:
+                    card["visits"] = fields["room_joins"]
+                if "total_time" in fields:
+                    card["time"] = format_total_time(fields["total_time"])
+
+_cache = WelcomeCache()
+
+def get_card(user_id):
+    return _cache.get_card(user_id)
+
+def record_join(user_id, now=None):
+    return _cache.record_join(user_id, now)
+
+def warm():
+    _cache.warm()
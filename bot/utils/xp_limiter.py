@@ -0,0 +1,85 @@
+import time
+import zlib
+from collections import OrderedDict, deque
+from threading import Lock
+
+# At most this many messages per user earn XP in any WINDOW seconds
+XP_MESSAGES_PER_WINDOW = 6
+WINDOW = 60.0
+# A message matching one of the user's last DUPLICATE_HISTORY messages earns nothing
+DUPLICATE_HISTORY = 5
+# Users silent for this long are forgotten; at most MAX_TRACKED_USERS are kept at all
+IDLE_EVICT = 10 * 60.0
+MAX_TRACKED_USERS = 10000
+
+def message_hash(message):
+    """Hash of the message with case and repeated whitespace ignored."""
+    return zlib.crc32(" ".join(message.casefold().split()).encode('utf-8'))
+
+class _UserWindow:
+    def __init__(self, limit, history):
+        self.times = deque(maxlen=limit)  # ring buffer of XP-eligible message times
+        self.hashes = deque(maxlen=history)
+        self.last_seen = 0.0
+
+class XPRateLimiter:
+    """Decides in memory whether a chat message earns XP, before any profile I/O.
+
+    Each user has a ring buffer of the times of their last `limit` rewarded
+    messages (the sliding window) and the hashes of their last few messages.
+    Users are kept in least-recently-seen order, so idle ones are evicted from
+    the front and the total stays under `max_users`.
+    """
+
+    def __init__(self, limit=XP_MESSAGES_PER_WINDOW, window=WINDOW, history=DUPLICATE_HISTORY,
+                 idle=IDLE_EVICT, max_users=MAX_TRACKED_USERS):
+        self.limit = limit
+        self.window = window
+        self.history = history
+        self.idle = idle
+        self.max_users = max_users
+        self.lock = Lock()
+        self.users = OrderedDict()  # user_id -> _UserWindow, least recently seen first
+        self.stats = {"allowed": 0, "rate_limited": 0, "duplicates": 0, "evicted": 0}
+
+    def allow(self, user_id, message, now=None):
+        """(True, None) if the message earns XP, else (False, "rate_limited" or "duplicate")."""
+        if now is None:
+            now = time.monotonic()
+        digest = message_hash(message)
+        with self.lock:
+            state = self.users.get(user_id)
+            if state is None:
+                state = self.users[user_id] = _UserWindow(self.limit, self.history)
+            else:
+                self.users.move_to_end(user_id)
+            state.last_seen = now
+            self._evict(now)
+            if digest in state.hashes:
+                self.stats["duplicates"] += 1
+                return False, "duplicate"
+            state.hashes.append(digest)
+            if len(state.times) == self.limit and now - state.times[0] < self.window:
+                self.stats["rate_limited"] += 1
+                return False, "rate_limited"
+            state.times.append(now)
+            self.stats["allowed"] += 1
+            return True, None
+
+    def _evict(self, now):
+        # Caller holds the lock
+        users = self.users
+        while users:
+            user_id, state = next(iter(users.items()))
+            if len(users) <= self.max_users and now - state.last_seen < self.idle:
+                break
+            del users[user_id]
+            self.stats["evicted"] += 1
+
+_limiter = XPRateLimiter()
+
+def allow(user_id, message):
+    return _limiter.allow(user_id, message)
+
+def stats():
+    return dict(_limiter.stats, tracked_users=len(_limiter.users))
@@ -2,8 +2,11 @@ import json
 import os
 from threading import Lock
 from bot.core import profile_manager
+from bot.utils import change_feed
+from bot.utils import level_curve
 
 _lock = Lock()
+_curve = level_curve.load_curve()
 
 def load_user_stats():
     profiles = profile_manager.load_profiles()
@@ -14,18 +17,59 @@ def save_user_stats(profiles):
         profile_manager.save_profiles(profiles)
 
 def calculate_level(xp):
-    # Level formula: level = floor(xp / 100)
-    return max(1, xp // 100)
+    # Level thresholds come from data/level_curve.json (default: max(1, xp // 100))
+    return _curve.level(xp)
+
+def level_progress(xp):
+    """(level, xp into the level, xp the level spans or None at the max level, fraction done)."""
+    return _curve.progress(xp)
+
+def get_level_curve():
+    return _curve
+
+def set_level_curve(config):
+    """Switch to a new level curve, save it, and rebalance every user's level."""
+    global _curve
+    curve = level_curve.LevelCurve(config)
+    level_curve.save_curve(curve)
+    _curve = curve
+    return rebalance_levels()
+
+def rebalance_levels():
+    """Recompute all stored levels from the current curve with one load and one save.
+
+    Publishes a single levels_rebalanced event rather than one per user; returns
+    {user_id: new level} for the levels that changed.
+    """
+    profiles = load_user_stats()
+    user_ids = list(profiles)
+    levels = _curve.levels(profiles[user_id].get('stats', {}).get('xp', 0) for user_id in user_ids)
+    changed = {}
+    for user_id, level in zip(user_ids, levels):
+        stats = profiles[user_id].setdefault('stats', {})
+        if stats.get('level') != level:
+            stats['level'] = level
+            changed[user_id] = level
+    if changed:
+        save_user_stats(profiles)
+        change_feed.publish("levels_rebalanced", changed=len(changed), curve=_curve.config)
+    return changed
+
+def apply_xp(stats, amount):
+    """Add XP to a profile's stats dict in place and recompute its level."""
+    stats['xp'] = stats.get('xp', 0) + amount
+    stats['level'] = calculate_level(stats['xp'])
+    return stats['xp'], stats['level']
 
 def add_xp(user_id, amount):
     profiles = load_user_stats()
     user = profiles.get(user_id, {})
     stats = user.get('stats', {})
-    stats['xp'] = stats.get('xp', 0) + amount
-    stats['level'] = calculate_level(stats['xp'])
+    apply_xp(stats, amount)
     user['stats'] = stats
     profiles[user_id] = user
     save_user_stats(profiles)
+    change_feed.publish_profile(user_id, xp=stats['xp'], level=stats['level'])
     return stats['xp'], stats['level']
 
 def get_xp(user_id):
@@ -10,14 +10,71 @@ from ..commands.achievements import AchievementsHandler
 from ..commands.stats import StatsHandler
 from ..commands.games import GameCommands
 from ..utils.teleport_manager import teleport_manager
-from ..utils.message_chunker import MessageChunker
+from ..utils.room_state import RoomState
+from ..utils.movement import Follower, MovementScheduler, circle, patrol
+from ..utils.outbound import outbound
 import asyncio
 from highrise.models import Position
 from ..commands.time_stats import TimeStatsHandler
-from ..utils.poll_manager import poll_manager
+from ..utils.answer_registry import answer_registry, ROOM_QUESTION_TTL
+from ..utils.xp_manager import add_xp
+from ..utils.poll_engine import PollEngine, MAX_OPTIONS, format_results, format_winner
 
 logger = logging.getLogger(__name__)
 
+TRIVIA_CHOICES = ("A", "B", "C", "D")
+ROOM_QUESTION_XP = 25
+
+# do not add or remove anything to help unless the usre explictly says to do so
+HELP_TEXT = (
+    "🤖 Bot Commands\n"
+    "📝 Whisper 'hi' to create profile\n"
+    "📩 Send me a DM for private help!\n\n"
+    "🎮 Games: -games -trivia -coinflip\n"
+    "📊 Profile: -profile -stats\n"
+    "🎭 Emotes: Type 1-182\n"
+    "🔄 Loop: !loop 12 45\n"
+    "⏹️ Stop: -stop\n"
+    "💕 Romance: !ship !marry !love !trust\n"
+    "📍 Teleport: -tp -listtp\n"
+    "❓ !relationshiphelp for more\n"
+    "➕Check BIO for more❤️\n"
+)
+ADMIN_HELP_TEXT = (
+    "🛡️ ADMIN COMMANDS\n\n"
+    "👥 User: !promote !demote !addvip !adminlist\n"
+    "⚡ Mod: !mute !kick !warn !clearwarn\n"
+    "📍 Manage: -createtp -deletetp\n"
+    "📢 Other: !announce !totalusers !invite !myrole\n"
+    "🧪 Test: !testdm !dmtest @user [message]\n\n"
+    "Plus all VIP commands: teleports, roleinfo, etc."
+)
+VIP_HELP_TEXT = (
+    "⭐ VIP COMMANDS\n\n"
+    "📢 !announce\n"
+    "👥 !roleinfo @user\n"
+    "📍 -tp -listtp\n"
+    "📍 -summon @user/-summon bot\n"
+    "📍 -goto @user/-goto bot\n"
+    "📍 -teleport (x,y,z)\n"
+    "📍 -locate @user\n"
+    "🤖 !follow !unfollow\n"
+    "🔄 !circle !uncircle\n\n"
+    "Plus user commands"
+)
+OWNER_HELP_TEXT = (
+    "👑 OWNER COMMANDS\n\n"
+    "🔧 System: !learning !measureemotes !testemotes\n"
+    "🤖 Bot: !setbotpos !botpos !resetbotpos\n"
+    "🎭 Emotes: !loopall !duration b1-b182\n"
+    "👥 Users: All admin/vip commands\n\n"
+    "Plus all user commands: -games -profile etc."
+)
+
+# Split once here; every help whisper reuses the chunks
+for _name, _text in (("help", HELP_TEXT), ("admin_help", ADMIN_HELP_TEXT), ("vip_help", VIP_HELP_TEXT), ("owner_help", OWNER_HELP_TEXT)):
+    outbound.register_static(_name, _text)
+
 
 class ChatHandler:
     """Handles basic chat and emote commands"""
@@ -32,13 +89,13 @@ class ChatHandler:
         self.default_position = Position(16.5, 0.1, 14, "FrontRight")  # set the bots default location to 16.5,0.1,14
         self.bot_position = self.default_position
         self.time_handler = TimeStatsHandler(bot)
+        # Shared view of who is in the room and where; fed by the event handler
+        self.room_state = RoomState(bot)
 
-        # Follow and circle state with locks for thread safety
-        self.following_user = None
-        self.follow_active = False
-        self.circling_user = None
-        self.circle_active = False
-        self._movement_lock = asyncio.Lock()  # Prevent concurrent movement commands
+        # One scheduler task moves the bot; follow/circle/patrol are patterns it runs
+        self.movement = MovementScheduler(bot, on_walk=self._set_bot_position)
+        # Polls with coalesced results broadcasts
+        self.polls = PollEngine(lambda text: self.bot.highrise.chat(text))
 
     async def on_chat(self, user: User, message: str) -> None:
         """Handle all chat messages and route commands"""
@@ -58,27 +115,15 @@ class ChatHandler:
         """Process chat commands"""
         try:
             message_lower = message.lower().strip()
+            # Command word alone, for commands that take arguments ("!patrol" but not "!patrolling")
+            command_word = message_lower.split(maxsplit=1)[0] if message_lower else ""
 
             # PRIORITY 1: Check for pending game answers FIRST (before any other processing)
 
-            # Check for trivia answers (they use A,B,C,D format)
-            from ..utils.trivia_manager import trivia_manager
-            if trivia_manager.has_pending_question(user.id):
-                if message.upper() in ['A', 'B', 'C', 'D']:
-                    try:
-                        await trivia_manager.process_answer(self.bot, user, message)
-                    except Exception as e:
-                        logger.error(f"Error processing trivia answer: {e}")
-                    return
-
-            # Check for math answers - MUST come before emote check (no command restriction)
-            if user.id in self.game_commands.pending_math:
-                if await self.game_commands.process_math_answer(user, message):
-                    return
-
-            # Check for riddle answers - MUST come before emote check (no command restriction)
-            if user.id in self.game_commands.pending_riddles:
-                if await self.game_commands.process_riddle_answer(user, message):
+            # Trivia, math, riddle and room-wide questions: one registry lookup decides
+            # whether this message answers anything - MUST come before emote check
+            for pending in answer_registry.match(user.id, message):
+                if await self.handle_pending_answer(user, message, pending):
                     return
 
             # PRIORITY 2: Handle numbered emote commands (1-182) - before command checks
@@ -115,7 +160,7 @@ class ChatHandler:
             # Check if user has a profile (registered user) for commands
             from ..core.profile_manager import profile_exists
             if not profile_exists(user.id):
-                await self.bot.highrise.send_whisper(user.id, f"❌ You need to create a profile first!\n💌 Whisper me 'hi' to get started and create your profile! 😊")
+                await self.send_chunked_whisper(user.id, f"❌ You need to create a profile first!\n💌 Whisper me 'hi' to get started and create your profile! 😊")
                 return
 
             # Check for help command first
@@ -216,6 +261,7 @@ class ChatHandler:
                 await self.game_commands.handle_rps(user, message)
             elif message_lower in ["!trivia", "-trivia"]:
                 await self.game_commands.handle_trivia(user)
+                self.sync_pending_answers(user.id)
             elif message_lower in ["!triviastats", "-triviastats"]:
                 await self.game_commands.handle_trivia_stats(user)
             elif message_lower in ["!gamestats", "-gamestats"]:
@@ -238,20 +284,25 @@ class ChatHandler:
                 await self.game_commands.handle_fortune(user)
             elif message_lower.startswith("!math") or message_lower.startswith("-math"):
                 await self.game_commands.handle_math(user, message)
+                self.sync_pending_answers(user.id)
             elif message_lower.startswith("!riddle") or message_lower.startswith("-riddle"):
                 await self.game_commands.handle_riddle(user, message)
+                self.sync_pending_answers(user.id)
             elif message_lower in ["!quiz", "-quiz"]:
                 await self.game_commands.handle_quiz(user)
+                self.sync_pending_answers(user.id)
+            elif command_word == "!ask":
+                await self.handle_ask_command(user, message)
 
             # Poll commands
-            elif message_lower.startswith("!poll") or message_lower.startswith("-poll"):
-                await self.handle_poll_command(user, message)
-            elif message_lower.startswith("!vote") or message_lower.startswith("-vote"):
-                await self.handle_vote_command(user, message)
             elif message_lower in ["!pollresults", "-pollresults", "!results", "-results"]:
                 await self.handle_poll_results_command(user)
             elif message_lower in ["!closepoll", "-closepoll", "!endpoll", "-endpoll"]:
                 await self.handle_close_poll_command(user)
+            elif message_lower.startswith("!poll") or message_lower.startswith("-poll"):
+                await self.handle_poll_command(user, message)
+            elif message_lower.startswith("!vote") or message_lower.startswith("-vote"):
+                await self.handle_vote_command(user, message)
 
             # Teleportation commands with - prefix
             elif message_lower.startswith("-summon "):
@@ -280,10 +331,14 @@ class ChatHandler:
                 await self.handle_follow_command(user)
             elif message_lower == "!unfollow":
                 await self.handle_unfollow_command(user)
-            elif message_lower == "!circle":
-                await self.handle_circle_command(user)
+            elif message_lower == "!circle" or message_lower.startswith("!circle "):
+                await self.handle_circle_command(user, message)
             elif message_lower == "!uncircle":
                 await self.handle_uncircle_command(user)
+            elif command_word == "!patrol":
+                await self.handle_patrol_command(user, message)
+            elif message_lower == "!unpatrol":
+                await self.handle_unpatrol_command(user)
             elif message_lower == "!botpos":
                 await self.handle_botpos_command(user)
             elif message_lower.startswith("!setbotpos"):
@@ -410,7 +465,7 @@ class ChatHandler:
 
                 time_data = await weather_time_service.get_time(location)
                 formatted_message = weather_time_service.format_time_message(time_data)
-                await self.bot.highrise.send_whisper(user.id, formatted_message)
+                await self.send_chunked_whisper(user.id, formatted_message)
 
             elif message_lower.startswith('-time') or message_lower.startswith('!time'):
                 # Check if this is a location time query (has arguments) or user time stats
@@ -423,7 +478,7 @@ class ChatHandler:
                     location = " ".join(parts[1:])
                     time_data = await weather_time_service.get_time(location)
                     formatted_message = weather_time_service.format_time_message(time_data)
-                    await self.bot.highrise.send_whisper(user.id, formatted_message)
+                    await self.send_chunked_whisper(user.id, formatted_message)
                 else:
                     # Handle user's own time stats
                     await self.time_handler.handle_time_command(user, message)
@@ -437,9 +492,9 @@ class ChatHandler:
                     location = " ".join(message.split()[1:])
                     weather_data = await weather_time_service.get_weather(location)
                     formatted_message = weather_time_service.format_weather_message(weather_data)
-                    await self.bot.highrise.send_whisper(user.id, formatted_message)
+                    await self.send_chunked_whisper(user.id, formatted_message)
                 else:
-                    await self.bot.highrise.send_whisper(user.id, "❌ Please specify a location. Example: -weather New York or -weather London,UK")
+                    await self.send_chunked_whisper(user.id, "❌ Please specify a location. Example: -weather New York or -weather London,UK")
 
             elif message_lower.startswith('-stop') or message_lower.startswith('!stop'):
                 await self.handle_stop_loop(user)
@@ -500,29 +555,14 @@ class ChatHandler:
 
         except Exception as e:
             print(f"❌ Error in chat handler: {e}")
-            await self.bot.highrise.send_whisper(user.id, "❌ Something went wrong!")
-# do not add or remove anything to help unless the usre explictly says to do so
+            await self.send_chunked_whisper(user.id, "❌ Something went wrong!")
     async def send_chunked_whisper(self, user_id: str, message: str):
-        """Send a whisper message using chunking if needed"""
-        await MessageChunker.send_chunked_whisper(self.bot, user_id, message)
+        """Queue a whisper message (split into chunks if needed) behind the user's earlier whispers"""
+        await outbound.whisper(self.bot, user_id, message)
 
     async def show_help(self, user: User) -> None:
         """Show help menu - divided into chunks to prevent message length errors"""
-        help_message = (
-            "🤖 Bot Commands\n"
-            "📝 Whisper 'hi' to create profile\n"
-            "📩 Send me a DM for private help!\n\n"
-            "🎮 Games: -games -trivia -coinflip\n"
-            "📊 Profile: -profile -stats\n"
-            "🎭 Emotes: Type 1-182\n"
-            "🔄 Loop: !loop 12 45\n"
-            "⏹️ Stop: -stop\n"
-            "💕 Romance: !ship !marry !love !trust\n"
-            "📍 Teleport: -tp -listtp\n"
-            "❓ !relationshiphelp for more\n"
-            "➕Check BIO for more❤️\n"
-        )
-        await self.send_chunked_whisper(user.id, help_message)
+        await outbound.whisper(self.bot, user.id, static="help")
 
     async def show_admin_help(self, user: User) -> None:
         """Show admin-specific help commands"""
@@ -532,16 +572,7 @@ class ChatHandler:
             await self.send_chunked_whisper(user.id, "🚫 You need admin permissions to view this help.")
             return
 
-        admin_help = (
-            "🛡️ ADMIN COMMANDS\n\n"
-            "👥 User: !promote !demote !addvip !adminlist\n"
-            "⚡ Mod: !mute !kick !warn !clearwarn\n"
-            "📍 Manage: -createtp -deletetp\n"
-            "📢 Other: !announce !totalusers !invite !myrole\n"
-            "🧪 Test: !testdm !dmtest @user [message]\n\n"
-            "Plus all VIP commands: teleports, roleinfo, etc."
-        )
-        await self.send_chunked_whisper(user.id, admin_help)
+        await outbound.whisper(self.bot, user.id, static="admin_help")
 
     async def show_vip_help(self, user: User) -> None:
         """Show VIP-specific help commands"""
@@ -551,20 +582,7 @@ class ChatHandler:
             await self.send_chunked_whisper(user.id, "🚫 You need VIP permissions to view this help.")
             return
 
-        vip_help = (
-            "⭐ VIP COMMANDS\n\n"
-            "📢 !announce\n"
-            "👥 !roleinfo @user\n"
-            "📍 -tp -listtp\n"
-            "📍 -summon @user/-summon bot\n"
-            "📍 -goto @user/-goto bot\n"
-            "📍 -teleport (x,y,z)\n"
-            "📍 -locate @user\n"
-            "🤖 !follow !unfollow\n"
-            "🔄 !circle !uncircle\n\n"
-            "Plus user commands"
-        )
-        await self.send_chunked_whisper(user.id, vip_help)
+        await outbound.whisper(self.bot, user.id, static="vip_help")
 
     async def show_owner_help(self, user: User) -> None:
         """Show owner-specific help commands"""
@@ -574,19 +592,11 @@ class ChatHandler:
             await self.send_chunked_whisper(user.id, "🚫 You need owner permissions to view this help.")
             return
 
-        owner_help = (
-            "👑 OWNER COMMANDS\n\n"
-            "🔧 System: !learning !measureemotes !testemotes\n"
-            "🤖 Bot: !setbotpos !botpos !resetbotpos\n"
-            "🎭 Emotes: !loopall !duration b1-b182\n"
-            "👥 Users: All admin/vip commands\n\n"
-            "Plus all user commands: -games -profile etc."
-        )
-        await self.send_chunked_whisper(user.id, owner_help)
+        await outbound.whisper(self.bot, user.id, static="owner_help")
 
     async def show_emotes_list(self, user: User) -> None:
         """Show emotes list instruction - strict output only"""
-        await self.bot.highrise.send_whisper(user.id, "Enter a number from 1 to 182 to perform an emote.")
+        await self.send_chunked_whisper(user.id, "Enter a number from 1 to 182 to perform an emote.")
 
     async def show_profile_info(self, user: User) -> None:
         """Show profile command - call the actual profile handler"""
@@ -603,11 +613,11 @@ class ChatHandler:
 
     async def show_delete_profile(self, user: User) -> None:
         """Show delete profile command - redirect to bot's delete handler"""
-        await self.bot.highrise.send_whisper(user.id, "Delete profile feature is handled by the main bot. Whisper 'hi' to access it.")
+        await self.send_chunked_whisper(user.id, "Delete profile feature is handled by the main bot. Whisper 'hi' to access it.")
 
     async def show_info(self, user: User) -> None:
         """Show info command - basic bot info"""
-        await self.bot.highrise.send_whisper(user.id, "Simple Bot v1.0\nUse -help for commands\nUse numbers 1-182 for emote loops\nUse -stop to stop loops")
+        await self.send_chunked_whisper(user.id, "Simple Bot v1.0\nUse -help for commands\nUse numbers 1-182 for emote loops\nUse -stop to stop loops")
 
     async def handle_stop_loop(self, user: User) -> None:
         """Handle stop loop command (single, combo, and loopall sequences)"""
@@ -641,14 +651,14 @@ class ChatHandler:
                 if stopped_loopall:
                     loop_types.append("loopall")
 
-                await self.bot.highrise.send_whisper(user.id, 
+                await self.send_chunked_whisper(user.id, 
                     f"🛑 Stopped {total_stopped} emote loops!\n"
                     f"Types stopped: {', '.join(loop_types)}")
             else:
-                await self.bot.highrise.send_whisper(user.id, "❌ No active emote loops found.")
+                await self.send_chunked_whisper(user.id, "❌ No active emote loops found.")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error stopping loops: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error stopping loops: {str(e)}")
             print(f"❌ Error stopping loops for {user.username}: {e}")
 
     async def handle_combo_loop(self, user: User, message: str) -> None:
@@ -658,7 +668,7 @@ class ChatHandler:
             parts = message.split()[1:]  # Skip "!loop"
 
             if not parts:
-                await self.bot.highrise.send_whisper(user.id, 
+                await self.send_chunked_whisper(user.id, 
                     "❌ Usage: !loop <emote1> <emote2> <emote3>\n"
                     "Example: !loop 12 45 88\n"
                     "Max 10 emotes, use numbers 1-182")
@@ -680,24 +690,24 @@ class ChatHandler:
 
             # Validation checks
             if not emote_ids:
-                await self.bot.highrise.send_whisper(user.id, 
+                await self.send_chunked_whisper(user.id, 
                     "❌ No valid emote IDs found!\n"
                     "Use numbers 1-182 only")
                 return
 
             if len(emote_ids) > 10:
-                await self.bot.highrise.send_whisper(user.id, 
+                await self.send_chunked_whisper(user.id, 
                     f"❌ Too many emotes! Max 10 allowed, you provided {len(emote_ids)}")
                 return
 
             # Show warning for invalid parts
             if invalid_parts:
-                await self.bot.highrise.send_whisper(user.id, 
+                await self.send_chunked_whisper(user.id, 
                     f"⚠️ Ignored invalid inputs: {', '.join(invalid_parts)}")
 
             # Check if user already has a combo loop
             if self.emote_manager.is_combo_loop_active(user.id):
-                await self.bot.highrise.send_whisper(user.id, 
+                await self.send_chunked_whisper(user.id, 
                     "🔄 Stopping current combo loop and starting new one...")
 
             # Start the combo loop
@@ -715,7 +725,7 @@ class ChatHandler:
                 if len(emote_ids) > 5:
                     display_emotes += f" + {len(emote_ids) - 5} more"
 
-                await self.bot.highrise.send_whisper(user.id, 
+                await self.send_chunked_whisper(user.id, 
                     f"🎭 Started combo loop!\n"
                     f"Sequence: {display_emotes}\n"
                     f"Total emotes: {len(emote_ids)}\n"
@@ -723,11 +733,11 @@ class ChatHandler:
 
                 print(f"✅ {user.username} started combo loop: {emote_ids}")
             else:
-                await self.bot.highrise.send_whisper(user.id, 
+                await self.send_chunked_whisper(user.id, 
                     "❌ Failed to start combo loop!")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error starting combo loop: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error starting combo loop: {str(e)}")
             print(f"❌ Error handling combo loop for {user.username}: {e}")
 
     async def handle_duration_command(self, user: User, message: str) -> None:
@@ -735,40 +745,40 @@ class ChatHandler:
         try:
             parts = message.split()
             if len(parts) != 2:
-                await self.bot.highrise.send_whisper(user.id, 
+                await self.send_chunked_whisper(user.id, 
                     "❌ Usage: !duration <emote_id>\n"
                     "Example: !duration 12")
                 return
 
             emote_input = parts[1]
             if not emote_input.isdigit():
-                await self.bot.highrise.send_whisper(user.id, 
+                await self.send_chunked_whisper(user.id, 
                     "❌ Please provide a valid emote number (1-182)")
                 return
 
             emote_id = int(emote_input)
             if not (1 <= emote_id <= 182):
-                await self.bot.highrise.send_whisper(user.id, 
+                await self.send_chunked_whisper(user.id, 
                     "❌ Emote ID must be between 1 and 182")
                 return
 
             # Get emote name and duration
             emote_name = self.emote_manager.get_emote_name_by_id(emote_id)
             if not emote_name:
-                await self.bot.highrise.send_whisper(user.id, 
+                await self.send_chunked_whisper(user.id, 
                     f"❌ Emote #{emote_id} not found")
                 return
 
             duration = self.emote_manager.get_emote_duration(emote_name)
             learned_count = len(self.emote_manager.emote_durations)
 
-            await self.bot.highrise.send_whisper(user.id, 
+            await self.send_chunked_whisper(user.id, 
                 f"⏱️ Emote #{emote_id}: {emote_name}\n"
                 f"Duration: {duration:.1f} seconds\n"
                 f"📊 ({learned_count} emotes learned)")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error checking duration: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error checking duration: {str(e)}")
             print(f"❌ Error handling duration command for {user.username}: {e}")
 
     async def handle_measure_emotes(self, user: User) -> None:
@@ -776,10 +786,10 @@ class ChatHandler:
         try:
             # Check if user has admin permissions or is owner
             # For now, allow anyone to measure (you can add permission checks)
-            await self.bot.highrise.send_whisper(user.id, "📊 Starting emote measurement process...")
+            await self.send_chunked_whisper(user.id, "📊 Starting emote measurement process...")
             await self.emote_manager.measure_all_emotes(self)
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error measuring emotes: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error measuring emotes: {str(e)}")
             print(f"❌ Error measuring emotes: {e}")
 
     def get_all_emotes(self) -> list:
@@ -862,14 +872,14 @@ class ChatHandler:
             except Exception as emote_error:
                 error_msg = str(emote_error)
                 if "not free or owned" in error_msg:
-                    await self.bot.highrise.send_whisper(user.id, 
+                    await self.send_chunked_whisper(user.id, 
                         f"💎 Bot emote #{emote_number} is premium!")
                 else:
-                    await self.bot.highrise.send_whisper(user.id, f"❌ Bot emote error: {error_msg}")
+                    await self.send_chunked_whisper(user.id, f"❌ Bot emote error: {error_msg}")
                 print(f"❌ Bot emote error: {emote_error}")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error: {str(e)}")
             print(f"❌ Error for {user.username} bot emote: {e}")
 
     async def handle_numbered_emote_loop(self, user: User, emote_number: int) -> None:
@@ -881,26 +891,26 @@ class ChatHandler:
 
             # Check if there's already a loop running for this user
             if self.emote_manager.is_loop_active(user.id):
-                await self.bot.highrise.send_whisper(user.id, "🔄 Switching to new emote loop...")
+                await self.send_chunked_whisper(user.id, "🔄 Switching to new emote loop...")
             elif self.emote_manager.is_loop_active():
-                await self.bot.highrise.send_whisper(user.id, "⚠️ Another user has an active loop. Wait or ask them to -stop")
+                await self.send_chunked_whisper(user.id, "⚠️ Another user has an active loop. Wait or ask them to -stop")
                 return
 
             # Start the emote loop
             try:
                 success = await self.emote_manager.start_emote_loop(user.id, emote_name)
             except Exception as e:
-                await self.bot.highrise.send_whisper(user.id, f"❌ Error starting emote loop: {str(e)}")
+                await self.send_chunked_whisper(user.id, f"❌ Error starting emote loop: {str(e)}")
                 print(f"❌ Error starting emote loop for {user.username}: {e}")
                 return
 
             if success:
-                await self.bot.highrise.send_whisper(user.id, f"🎭 Started emote loop #{emote_number}!")
+                await self.send_chunked_whisper(user.id, f"🎭 Started emote loop #{emote_number}!")
             else:
-                await self.bot.highrise.send_whisper(user.id, "❌ Failed to start emote loop!")
+                await self.send_chunked_whisper(user.id, "❌ Failed to start emote loop!")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error: {str(e)}")
             print(f"❌ Error for {user.username} emote loop: {e}")
 
     async def handle_test_commands(self, user: User) -> None:
@@ -910,18 +920,16 @@ class ChatHandler:
 
             # Only allow owners to run test commands
             if not has_permission(user.id, "owner"):
-                await self.bot.highrise.send_whisper(user.id, "🚫 Only owners can use test commands.")
+                await self.send_chunked_whisper(user.id, "🚫 Only owners can use test commands.")
                 return
 
             # Create a test user object for commands that need a target
             # We'll use the bot itself as the target for most tests
             bot_user = None
             try:
-                room_users = (await self.bot.highrise.get_room_users()).content
-                for room_user, position in room_users:
-                    if room_user.id == self.bot.bot_id:
-                        bot_user = room_user
-                        break
+                entry = await self.room_state.lookup(self.bot.bot_id)
+                if entry:
+                    bot_user = entry[0]
             except Exception as e:
                 print(f"⚠️ Could not get bot user: {e}")
 
@@ -958,7 +966,7 @@ class ChatHandler:
                 ("-time America/New_York", "time"),
             ]
 
-            await self.bot.highrise.send_whisper(user.id, 
+            await self.send_chunked_whisper(user.id, 
                 f"🧪 **Test Commands Started**\n"
                 f"Testing {len(test_commands)} commands on the bot...\n"
                 f"Commands will actually execute!")
@@ -984,10 +992,10 @@ class ChatHandler:
                 except Exception as cmd_error:
                     error_count += 1
                     print(f"❌ Error testing '{command}': {cmd_error}")
-                    await self.bot.highrise.send_whisper(user.id, f"❌ Error: {command} - {str(cmd_error)}")
+                    await self.send_chunked_whisper(user.id, f"❌ Error: {command} - {str(cmd_error)}")
 
             # Send summary
-            await self.bot.highrise.send_whisper(user.id, 
+            await self.send_chunked_whisper(user.id, 
                 f"✅ **Test Commands Complete**\n"
                 f"✅ Successful: {success_count}\n"
                 f"❌ Failed: {error_count}\n"
@@ -995,20 +1003,20 @@ class ChatHandler:
                 f"Check room chat and console for results!")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Test commands error: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Test commands error: {str(e)}")
             print(f"❌ Error in test commands: {e}")
 
     async def handle_summon_command(self, user: User, message: str) -> None:
         """Handle summon command"""
         try:
             if not profile_exists(user.id):
-                await self.bot.highrise.send_whisper(user.id, "❌ You need a profile first. Whisper 'hi' to create one!")
+                await self.send_chunked_whisper(user.id, "❌ You need a profile first. Whisper 'hi' to create one!")
                 return
 
             # Check for summon bot command
             if message.lower() == "summon bot":
                 if not self.can_use_command(user.id, "summon_bot"):
-                    await self.bot.highrise.send_whisper(user.id, "🚫 You need admin permissions to summon the bot.")
+                    await self.send_chunked_whisper(user.id, "🚫 You need admin permissions to summon the bot.")
                     return
                 await teleport_manager.summon_bot_to_user(self.bot, user)
                 return
@@ -1016,36 +1024,36 @@ class ChatHandler:
             # Check for summon @username command
             if message.startswith("summon @"):
                 target_username = message[8:].strip()  # Extract username
-                target_user = await teleport_manager.get_user_by_username(self.bot, target_username)
+                target_user = await self.room_state.find_by_username(target_username)
 
                 if not target_user:
-                    await self.bot.highrise.send_whisper(user.id, f"❌ User @{target_username} not found.")
+                    await self.send_chunked_whisper(user.id, f"❌ User @{target_username} not found.")
                     return
 
                 if not self.can_use_command(user.id, "summon"):
-                     await self.bot.highrise.send_whisper(user.id, "🚫 You need admin permissions to use this command.")
+                     await self.send_chunked_whisper(user.id, "🚫 You need admin permissions to use this command.")
                      return
 
                 await teleport_manager.summon_user_to_user(self.bot, user, target_user)
                 return
 
-            await self.bot.highrise.send_whisper(user.id, "❌ Usage: -summon @username or -summon bot")
+            await self.send_chunked_whisper(user.id, "❌ Usage: -summon @username or -summon bot")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error with summon command: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error with summon command: {str(e)}")
             logger.error(f"Error in summon command: {e}")
 
     async def handle_goto_command(self, user: User, message: str) -> None:
         """Handle goto command"""
         try:
             if not profile_exists(user.id):
-                await self.bot.highrise.send_whisper(user.id, "❌ You need a profile first. Whisper 'hi' to create one!")
+                await self.send_chunked_whisper(user.id, "❌ You need a profile first. Whisper 'hi' to create one!")
                 return
 
             # Check for goto bot command
             if message.lower() == "goto bot":
                 if not self.can_use_command(user.id, "goto_bot"):
-                    await self.bot.highrise.send_whisper(user.id, "🚫 You need admin permissions to teleport to the bot.")
+                    await self.send_chunked_whisper(user.id, "🚫 You need admin permissions to teleport to the bot.")
                     return
                 await teleport_manager.teleport_user_to_bot(self.bot, user)
                 return
@@ -1053,36 +1061,36 @@ class ChatHandler:
             # Check for goto @username command
             if message.startswith("goto @"):
                 target_username = message[6:].strip()  # Extract username
-                target_user = await teleport_manager.get_user_by_username(self.bot, target_username)
+                target_user = await self.room_state.find_by_username(target_username)
 
                 if not target_user:
-                    await self.bot.highrise.send_whisper(user.id, f"❌ User @{target_username} not found.")
+                    await self.send_chunked_whisper(user.id, f"❌ User @{target_username} not found.")
                     return
 
                 if not self.can_use_command(user.id, "goto"):
-                     await self.bot.highrise.send_whisper(user.id, "🚫 You need admin permissions to use this command.")
+                     await self.send_chunked_whisper(user.id, "🚫 You need admin permissions to use this command.")
                      return
 
                 await teleport_manager.teleport_user_to_user(self.bot, user, target_user)
                 return
 
-            await self.bot.highrise.send_whisper(user.id, "❌ Usage: -goto @username or -goto bot")
+            await self.send_chunked_whisper(user.id, "❌ Usage: -goto @username or -goto bot")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error with goto command: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error with goto command: {str(e)}")
             logger.error(f"Error in goto command: {e}")
 
     async def handle_teleport_command(self, user: User, message: str) -> None:
         """Handle teleport command"""
         try:
             if not profile_exists(user.id):
-                await self.bot.highrise.send_whisper(user.id, "❌ You need a profile first. Whisper 'hi' to create one!")
+                await self.send_chunked_whisper(user.id, "❌ You need a profile first. Whisper 'hi' to create one!")
                 return
 
             # Check for teleport bot command
             if message.lower() == "teleport bot":
                 if not self.can_use_command(user.id, "teleport_bot"):
-                    await self.bot.highrise.send_whisper(user.id, "🚫 You need admin permissions to teleport to the bot.")
+                    await self.send_chunked_whisper(user.id, "🚫 You need admin permissions to teleport to the bot.")
                     return
                 await teleport_manager.teleport_user_to_bot(self.bot, user)
                 return
@@ -1095,12 +1103,12 @@ class ChatHandler:
                     try:
                         x, y, z = float(parts[2]), float(parts[3]), float(parts[4])
                         if not self.can_use_command(user.id, "teleport"):
-                            await self.bot.highrise.send_whisper(user.id, "🚫 You need admin permissions to use this command.")
+                            await self.send_chunked_whisper(user.id, "🚫 You need admin permissions to use this command.")
                             return
                         await teleport_manager.handle_teleport_user_to_coordinates(self.bot, user, username, x, y, z)
                         return
                     except ValueError:
-                        await self.bot.highrise.send_whisper(user.id, "❌ Invalid coordinates. Please use numbers only.")
+                        await self.send_chunked_whisper(user.id, "❌ Invalid coordinates. Please use numbers only.")
                         return
 
             # Check for teleport x y z command (without parentheses)
@@ -1109,119 +1117,128 @@ class ChatHandler:
                 try:
                     x, y, z = float(parts[1]), float(parts[2]), float(parts[3])
                     if not self.can_use_command(user.id, "teleport"):
-                        await self.bot.highrise.send_whisper(user.id, "🚫 You need admin permissions to use this command.")
+                        await self.send_chunked_whisper(user.id, "🚫 You need admin permissions to use this command.")
                         return
                     await teleport_manager.handle_teleport_user_to_coordinates(self.bot, user, user.username, x, y, z)
                     return
                 except ValueError:
-                    await self.bot.highrise.send_whisper(user.id, "❌ Invalid coordinates. Please use numbers only.")
+                    await self.send_chunked_whisper(user.id, "❌ Invalid coordinates. Please use numbers only.")
                     return
 
             # Check for teleport (x, y, z) command
             if message.startswith("teleport ("):
                 if not self.can_use_command(user.id, "teleport"):
-                     await self.bot.highrise.send_whisper(user.id, "🚫 You need admin permissions to use this command.")
+                     await self.send_chunked_whisper(user.id, "🚫 You need admin permissions to use this command.")
                      return
                 await teleport_manager.handle_teleport_coordinates(self.bot, user, message)
                 return
 
-            await self.bot.highrise.send_whisper(user.id, "❌ Usage: -teleport (x,y,z), -teleport x y z, or -teleport @username x y z")
+            await self.send_chunked_whisper(user.id, "❌ Usage: -teleport (x,y,z), -teleport x y z, or -teleport @username x y z")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error with teleport command: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error with teleport command: {str(e)}")
             logger.error(f"Error in teleport command: {e}")
 
     async def handle_locate_command(self, user: User, message: str) -> None:
         """Handle locate command"""
         try:
             if not profile_exists(user.id):
-                await self.bot.highrise.send_whisper(user.id, "❌ You need a profile first. Whisper 'hi' to create one!")
+                await self.send_chunked_whisper(user.id, "❌ You need a profile first. Whisper 'hi' to create one!")
                 return
 
             # Check for locate @username command
             if message.startswith("locate @"):
                 target_username = message[8:].strip()  # Extract username
-                target_user = await teleport_manager.get_user_by_username(self.bot, target_username)
+                target_user = await self.room_state.find_by_username(target_username)
 
                 if not target_user:
-                    await self.bot.highrise.send_whisper(user.id, f"❌ User @{target_username} not found.")
+                    await self.send_chunked_whisper(user.id, f"❌ User @{target_username} not found.")
                     return
 
                 if not self.can_use_command(user.id, "locate"):
-                     await self.bot.highrise.send_whisper(user.id, "🚫 You need admin permissions to use this command.")
+                     await self.send_chunked_whisper(user.id, "🚫 You need admin permissions to use this command.")
                      return
-                await teleport_manager.handle_locate_user(self.bot, user, message)
+
+                # Answer from the room state; no second room list fetch
+                position = self.room_state.position(target_user.id)
+                if position is not None and hasattr(position, 'x'):
+                    await self.send_chunked_whisper(user.id,
+                        f"📍 @{target_user.username} is at ({position.x:.1f}, {position.y:.1f}, {position.z:.1f}) facing {position.facing}")
+                elif position is not None:
+                    await self.send_chunked_whisper(user.id, f"📍 @{target_user.username} is sitting on an object")
+                else:
+                    await self.send_chunked_whisper(user.id, f"📍 @{target_user.username} is in the room, position unknown")
                 return
 
-            await self.bot.highrise.send_whisper(user.id, "❌ Usage: -locate @username")
+            await self.send_chunked_whisper(user.id, "❌ Usage: -locate @username")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error with locate command: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error with locate command: {str(e)}")
             logger.error(f"Error in locate command: {e}")
 
     async def handle_create_teleport(self, user: User, message: str) -> None:
         """Handle create teleport command"""
         try:
             if not profile_exists(user.id):
-                await self.bot.highrise.send_whisper(user.id, "❌ You need a profile first. Whisper 'hi' to create one!")
+                await self.send_chunked_whisper(user.id, "❌ You need a profile first. Whisper 'hi' to create one!")
                 return
 
             # Check for create teleport command
             parts = message.split()
             if len(parts) < 2:
-                await self.bot.highrise.send_whisper(user.id, "❌ Usage: -createtp <name>")
+                await self.send_chunked_whisper(user.id, "❌ Usage: -createtp <name>")
                 return
 
             name = parts[1].strip()
 
             if not self.can_use_command(user.id, "createtp"):
-                await self.bot.highrise.send_whisper(user.id, "🚫 You need admin permissions to use this command.")
+                await self.send_chunked_whisper(user.id, "🚫 You need admin permissions to use this command.")
                 return
 
             await teleport_manager.create_teleport(self.bot, user, name)
             return
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error with create teleport command: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error with create teleport command: {str(e)}")
             logger.error(f"Error in create teleport command: {e}")
 
     async def handle_delete_teleport(self, user: User, message: str) -> None:
         """Handle delete teleport command"""
         try:
             if not profile_exists(user.id):
-                await self.bot.highrise.send_whisper(user.id, "❌ You need a profile first. Whisper 'hi' to create one!")
+                await self.send_chunked_whisper(user.id, "❌ You need a profile first. Whisper 'hi' to create one!")
                 return
 
             # Check for delete teleport command
             parts = message.split()
             if len(parts) < 2:
-                await self.bot.highrise.send_whisper(user.id, "❌ Usage: -deletetp <name>")
+                await self.send_chunked_whisper(user.id, "❌ Usage: -deletetp <name>")
                 return
 
             name = parts[1].strip()
 
             if not self.can_use_command(user.id, "deletetp"):
-                await self.bot.highrise.send_whisper(user.id, "🚫 You need admin permissions to use this command.")
+                await self.send_chunked_whisper(user.id, "🚫 You need admin permissions to use this command.")
                 return
 
             await teleport_manager.delete_teleport(self.bot, user, name)
             return
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error with delete teleport command: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error with delete teleport command: {str(e)}")
             logger.error(f"Error in delete teleport command: {e}")
 
     async def handle_teleport_to(self, user: User, message: str) -> None:
         """Handle teleport to command"""
         try:
             if not profile_exists(user.id):
-                await self.bot.highrise.send_whisper(user.id, "❌ You need a profile first. Whisper 'hi' to create one!")
+                await self.send_chunked_whisper(user.id, "❌ You need a profile first. Whisper 'hi' to create one!")
                 return
 
             # Check for teleport to command
             parts = message.split()
             if len(parts) < 2:
-                await self.bot.highrise.send_whisper(user.id, "❌ Usage: -tp <name> or -tp @username <name>")
+                await self.send_chunked_whisper(user.id, "❌ Usage: -tp <name> or -tp @username <name>")
                 return
 
             # Check if targeting another user: -tp @username locationname
@@ -1230,7 +1247,7 @@ class ChatHandler:
                 location_name = " ".join(parts[2:]).strip()  # Join remaining parts for location name
 
                 if not self.can_use_command(user.id, "tp"):
-                    await self.bot.highrise.send_whisper(user.id, "🚫 You need VIP permissions to teleport others to locations.")
+                    await self.send_chunked_whisper(user.id, "🚫 You need VIP permissions to teleport others to locations.")
                     return
 
                 await teleport_manager.teleport_user_to_location(self.bot, user, username, location_name)
@@ -1240,60 +1257,60 @@ class ChatHandler:
             location_name = " ".join(parts[1:]).strip()  # Join all parts for location name
 
             if not self.can_use_command(user.id, "tp"):
-                await self.bot.highrise.send_whisper(user.id, "🚫 You need user permissions to use teleport locations.")
+                await self.send_chunked_whisper(user.id, "🚫 You need user permissions to use teleport locations.")
                 return
 
             await teleport_manager.teleport_to(self.bot, user, location_name)
             return
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error with teleport to command: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error with teleport to command: {str(e)}")
             logger.error(f"Error in teleport to command: {e}")
 
     async def handle_list_teleports(self, user: User) -> None:
         """Handle list teleports command"""
         try:
             if not profile_exists(user.id):
-                await self.bot.highrise.send_whisper(user.id, "❌ You need a profile first. Whisper 'hi' to create one!")
+                await self.send_chunked_whisper(user.id, "❌ You need a profile first. Whisper 'hi' to create one!")
                 return
 
             if not self.can_use_command(user.id, "listtp"):
-                await self.bot.highrise.send_whisper(user.id, "🚫 You need admin permissions to use this command.")
+                await self.send_chunked_whisper(user.id, "🚫 You need admin permissions to use this command.")
                 return
 
             await teleport_manager.list_teleports(self.bot, user)
             return
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error with list teleports command: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error with list teleports command: {str(e)}")
             logger.error(f"Error in list teleports command: {e}")
 
     async def handle_learning_mode(self, user: User, enabled: bool) -> None:
         """Handle learning mode command"""
         try:
             if not self.can_use_command(user.id, "learning"):
-                await self.bot.highrise.send_whisper(user.id, "🚫 You need owner permissions to use this command.")
+                await self.send_chunked_whisper(user.id, "🚫 You need owner permissions to use this command.")
                 return
 
             if enabled:
                 self.emote_manager.learning_mode = True
-                await self.bot.highrise.send_whisper(user.id, "✅ Learning mode enabled.")
+                await self.send_chunked_whisper(user.id, "✅ Learning mode enabled.")
             else:
                 self.emote_manager.learning_mode = False
-                await self.bot.highrise.send_whisper(user.id, "✅ Learning mode disabled.")
+                await self.send_chunked_whisper(user.id, "✅ Learning mode disabled.")
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error with learning mode command: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error with learning mode command: {str(e)}")
             logger.error(f"Error in learning mode command: {e}")
 
     async def handle_learning_status(self, user: User) -> None:
         """Handle learning status command"""
         try:
             if not self.can_use_command(user.id, "learnstatus"):
-                await self.bot.highrise.send_whisper(user.id, "🚫 You need owner permissions to use this command.")
+                await self.send_chunked_whisper(user.id, "🚫 You need owner permissions to use this command.")
                 return
-            await self.bot.highrise.send_whisper(user.id, f"✅ Learning mode is {'enabled' if self.emote_manager.learning_mode else 'disabled'}.")
+            await self.send_chunked_whisper(user.id, f"✅ Learning mode is {'enabled' if self.emote_manager.learning_mode else 'disabled'}.")
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error with learning status command: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error with learning status command: {str(e)}")
             logger.error(f"Error in learning status command: {e}")
 
     def can_use_command(self, user_id: str, command: str) -> bool:
@@ -1318,8 +1335,11 @@ class ChatHandler:
                 "circle": "vip",    # VIP+ can use circle command
                 "unfollow": "vip",  # VIP+ can use unfollow command
                 "uncircle": "vip",  # VIP+ can use uncircle command
+                "patrol": "vip",    # VIP+ can use patrol command
+                "unpatrol": "vip",  # VIP+ can use unpatrol command
                 "setbotpos": "owner",  # Owner can set bot position
                 "resetbotpos": "owner",  # Owner can reset bot position
+                "ask": "admin",     # Admin+ can ask room-wide questions
                 "learning": "owner",
                 "learnstatus": "owner"
             }
@@ -1356,7 +1376,7 @@ class ChatHandler:
             self.emote_manager.start_measurement(emote_name, user.id)
             print(f"✅ Measurement started for {emote_name} by {user.username}")
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error starting measurement: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error starting measurement: {str(e)}")
             print(f"❌ Error starting measurement: {e}")
 
     async def handle_friend_emote(self, user: User, emote_number: int, target_username: str) -> None:
@@ -1366,27 +1386,27 @@ class ChatHandler:
             emote_name = self.get_emote_by_number(emote_number)
 
             if not emote_name:
-                await self.bot.highrise.send_whisper(user.id, "❌ Invalid emote number.")
+                await self.send_chunked_whisper(user.id, "❌ Invalid emote number.")
                 return
 
             # Get target user
-            target_user = await teleport_manager.get_user_by_username(self.bot, target_username)
+            target_user = await self.room_state.find_by_username(target_username)
 
             if not target_user:
-                await self.bot.highrise.send_whisper(user.id, f"❌ User @{target_username} not found.")
+                await self.send_chunked_whisper(user.id, f"❌ User @{target_username} not found.")
                 return
 
             # Send emote to target user
             try:
                 await self.bot.highrise.send_emote(emote_name, target_user.id)
-                await self.bot.highrise.send_whisper(user.id, f"✅ Emote #{emote_number} sent to @{target_username}!")
+                await self.send_chunked_whisper(user.id, f"✅ Emote #{emote_number} sent to @{target_username}!")
                 print(f"✅ {user.username} sent emote #{emote_number} to {target_username}")
             except Exception as emote_error:
-                await self.bot.highrise.send_whisper(user.id, f"❌ Error sending emote: {str(emote_error)}")
+                await self.send_chunked_whisper(user.id, f"❌ Error sending emote: {str(emote_error)}")
                 print(f"❌ Error sending emote: {emote_error}")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error: {str(e)}")
             print(f"❌ Error for {user.username} friend emote: {e}")
 
     async def handle_friend_emote_multiple(self, user: User, emote_number: int, usernames: list) -> None:
@@ -1396,7 +1416,7 @@ class ChatHandler:
             emote_name = self.get_emote_by_number(emote_number)
 
             if not emote_name:
-                await self.bot.highrise.send_whisper(user.id, "❌ Invalid emote number.")
+                await self.send_chunked_whisper(user.id, "❌ Invalid emote number.")
                 return
 
             # Iterate through usernames and send emote
@@ -1405,7 +1425,7 @@ class ChatHandler:
             failed_usernames = []
 
             for username in usernames:
-                target_user = await teleport_manager.get_user_by_username(self.bot, username)
+                target_user = await self.room_state.find_by_username(username)
 
                 if not target_user:
                     fail_count += 1
@@ -1427,10 +1447,10 @@ class ChatHandler:
             if fail_count > 0:
                 summary_message += f"\n❌ Failed to send to {fail_count} users: {', '.join(failed_usernames)}"
 
-            await self.bot.highrise.send_whisper(user.id, summary_message)
+            await self.send_chunked_whisper(user.id, summary_message)
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error: {str(e)}")
             print(f"❌ Error for {user.username} friend emote (multiple): {e}")
 
     async def handle_poll_command(self, user: User, message: str) -> None:
@@ -1439,7 +1459,7 @@ class ChatHandler:
             # Parse the poll command: !poll "question" option1 option2
             parts = message.split()
             if len(parts) < 4:
-                await self.bot.highrise.send_whisper(user.id, 
+                await self.send_chunked_whisper(user.id, 
                     "❌ Usage: !poll \"question\" option1 option2\n"
                     "Example: !poll \"Favorite color?\" red blue")
                 return
@@ -1452,7 +1472,7 @@ class ChatHandler:
                 quote_char = message_without_command[0]
                 quote_end = message_without_command.find(quote_char, 1)
                 if quote_end == -1:
-                    await self.bot.highrise.send_whisper(user.id, "❌ Missing closing quote for question!")
+                    await self.send_chunked_whisper(user.id, "❌ Missing closing quote for question!")
                     return
                 
                 question = message_without_command[1:quote_end]
@@ -1462,77 +1482,73 @@ class ChatHandler:
                 # No quotes, take first word as question
                 all_parts = message_without_command.split()
                 if len(all_parts) < 3:
-                    await self.bot.highrise.send_whisper(user.id, "❌ Need question and 2 options!")
+                    await self.send_chunked_whisper(user.id, "❌ Need question and 2 options!")
                     return
                 question = all_parts[0]
                 options = all_parts[1:]
 
             if len(options) < 2:
-                await self.bot.highrise.send_whisper(user.id, "❌ Need at least 2 options!")
+                await self.send_chunked_whisper(user.id, "❌ Need at least 2 options!")
+                return
+            if len(options) > MAX_OPTIONS:
+                await self.send_chunked_whisper(user.id, f"❌ A poll can have at most {MAX_OPTIONS} options!")
                 return
-
-            option_a = options[0]
-            option_b = options[1]
 
             # Get room ID from bot's current room
             room_id = self.bot.room_id
 
             # Create the poll
-            success = poll_manager.create_poll(room_id, question, option_a, option_b, user.id, user.username)
-            
-            if success:
+            try:
+                poll = self.polls.create(room_id, question, options, user.id, user.username)
+            except ValueError as e:
+                await self.send_chunked_whisper(user.id, f"❌ {e}")
+                return
+
+            if poll:
+                results = poll.results()
+                option_lines = "\n".join(f"{entry['label']}: {entry['option']}" for entry in results["options"])
+                labels = " / ".join(entry["label"] for entry in results["options"])
                 await self.bot.highrise.chat(
                     f"📊 NEW POLL by {user.username}!\n"
                     f"❓ {question}\n"
-                    f"🅰️ A: {option_a}\n"
-                    f"🅱️ B: {option_b}\n"
-                    f"Vote with: -vote A or -vote B"
+                    f"{option_lines}\n"
+                    f"Vote with: -vote {labels} (closes in {int(self.polls.duration // 60)} min)"
                 )
-                await self.bot.highrise.send_whisper(user.id, "✅ Poll created successfully!")
+                await self.send_chunked_whisper(user.id, "✅ Poll created successfully!")
             else:
-                await self.bot.highrise.send_whisper(user.id, "❌ There's already an active poll in this room!")
+                await self.send_chunked_whisper(user.id, "❌ There's already an active poll in this room!")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error creating poll: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error creating poll: {str(e)}")
             print(f"❌ Error in poll command: {e}")
 
     async def handle_vote_command(self, user: User, message: str) -> None:
         """Handle vote command"""
         try:
-            parts = message.split()
+            parts = message.split(maxsplit=1)
             if len(parts) != 2:
-                await self.bot.highrise.send_whisper(user.id, 
-                    "❌ Usage: -vote A or -vote B")
-                return
-
-            vote_option = parts[1].upper()
-            if vote_option not in ['A', 'B']:
-                await self.bot.highrise.send_whisper(user.id, "❌ Vote must be A or B!")
+                await self.send_chunked_whisper(user.id, 
+                    "❌ Usage: -vote <letter>, e.g. -vote A")
                 return
 
             # Get room ID from bot's current room
             room_id = self.bot.room_id
 
-            # Cast the vote
-            result = poll_manager.vote(room_id, user.id, user.username, vote_option)
-            
-            if result:
-                await self.bot.highrise.chat(result)
-                
-                # Show current results
-                poll_results = poll_manager.get_poll_results(room_id)
-                if poll_results:
-                    await self.bot.highrise.chat(
-                        f"📊 Current Results:\n"
-                        f"🅰️ A ({poll_results['option_a']}): {poll_results['votes_a']} votes ({poll_results['percent_a']}%)\n"
-                        f"🅱️ B ({poll_results['option_b']}): {poll_results['votes_b']} votes ({poll_results['percent_b']}%)\n"
-                        f"Total: {poll_results['total_votes']} votes"
-                    )
+            # Cast the vote; results reach the room in the next coalesced broadcast
+            status = self.polls.vote(room_id, user.id, parts[1])
+
+            if status == "ok":
+                await self.send_chunked_whisper(user.id, f"✅ Vote recorded: {parts[1].strip()}")
+            elif status == "duplicate":
+                await self.send_chunked_whisper(user.id, "❌ You already voted in this poll!")
+            elif status == "invalid":
+                labels = " / ".join(entry["label"] for entry in self.polls.results(room_id)["options"])
+                await self.send_chunked_whisper(user.id, f"❌ Vote must be one of: {labels}")
             else:
-                await self.bot.highrise.send_whisper(user.id, "❌ No active poll to vote on!")
+                await self.send_chunked_whisper(user.id, "❌ No active poll to vote on!")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error voting: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error voting: {str(e)}")
             print(f"❌ Error in vote command: {e}")
 
     async def handle_poll_results_command(self, user: User) -> None:
@@ -1542,21 +1558,15 @@ class ChatHandler:
             room_id = self.bot.room_id
 
             # Get poll results
-            poll_results = poll_manager.get_poll_results(room_id)
-            
+            poll_results = self.polls.results(room_id)
+
             if poll_results:
-                await self.bot.highrise.chat(
-                    f"📊 **POLL RESULTS** by {poll_results['creator']}\n"
-                    f"❓ {poll_results['question']}\n\n"
-                    f"🅰️ A ({poll_results['option_a']}): {poll_results['votes_a']} votes ({poll_results['percent_a']}%)\n"
-                    f"🅱️ B ({poll_results['option_b']}): {poll_results['votes_b']} votes ({poll_results['percent_b']}%)\n\n"
-                    f"📈 Total votes: {poll_results['total_votes']}"
-                )
+                await self.bot.highrise.chat(format_results(poll_results, f"📊 **POLL RESULTS** by {poll_results['creator']}"))
             else:
-                await self.bot.highrise.send_whisper(user.id, "❌ No active poll to show results for!")
+                await self.send_chunked_whisper(user.id, "❌ No active poll to show results for!")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error showing poll results: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error showing poll results: {str(e)}")
             print(f"❌ Error in poll results command: {e}")
 
     async def handle_close_poll_command(self, user: User) -> None:
@@ -1565,159 +1575,256 @@ class ChatHandler:
             # Get room ID from bot's current room
             room_id = self.bot.room_id
 
-            # Check if there's an active poll
-            if not poll_manager.has_active_poll(room_id):
-                await self.bot.highrise.send_whisper(user.id, "❌ No active poll to close!")
+            # Closing returns the final results
+            final_results = self.polls.close(room_id)
+            if not final_results:
+                await self.send_chunked_whisper(user.id, "❌ No active poll to close!")
                 return
 
-            # Get final results before closing
-            final_results = poll_manager.close_poll(room_id)
-            
-            if final_results:
-                # Determine winner
-                if final_results['votes_a'] > final_results['votes_b']:
-                    winner = f"🏆 A ({final_results['option_a']}) WINS!"
-                elif final_results['votes_b'] > final_results['votes_a']:
-                    winner = f"🏆 B ({final_results['option_b']}) WINS!"
-                else:
-                    winner = "🤝 IT'S A TIE!"
-
-                await self.bot.highrise.chat(
-                    f"🔚 **POLL CLOSED** by {user.username}\n"
-                    f"❓ {final_results['question']}\n\n"
-                    f"🅰️ A ({final_results['option_a']}): {final_results['votes_a']} votes ({final_results['percent_a']}%)\n"
-                    f"🅱️ B ({final_results['option_b']}): {final_results['votes_b']} votes ({final_results['percent_b']}%)\n\n"
-                    f"{winner}\n"
-                    f"📈 Total votes: {final_results['total_votes']}"
-                )
-                
-                await self.bot.highrise.send_whisper(user.id, "✅ Poll closed successfully!")
-            else:
-                await self.bot.highrise.send_whisper(user.id, "❌ Error closing poll!")
+            await self.bot.highrise.chat(
+                f"{format_results(final_results, f'🔚 **POLL CLOSED** by {user.username}')}\n"
+                f"{format_winner(final_results)}"
+            )
+            await self.send_chunked_whisper(user.id, "✅ Poll closed successfully!")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error closing poll: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error closing poll: {str(e)}")
             print(f"❌ Error in close poll command: {e}")
 
+    def sync_pending_answers(self, user_id: str) -> None:
+        """Mirror the game handlers' pending questions for a user into the answer registry"""
+        # No TTL: the game handlers own expiry, and their answer hooks re-check it and re-sync
+        from ..utils.trivia_manager import trivia_manager
+
+        if trivia_manager.has_pending_question(user_id):
+            answer_registry.expect(user_id, "trivia", self._answer_trivia, attempts=TRIVIA_CHOICES, ttl=None)
+        else:
+            answer_registry.clear(user_id, "trivia")
+        # Math and riddle answers are checked by the game handlers, so every message is passed on
+        if user_id in self.game_commands.pending_math:
+            answer_registry.expect(user_id, "math", self._answer_math, ttl=None)
+        else:
+            answer_registry.clear(user_id, "math")
+        if user_id in self.game_commands.pending_riddles:
+            answer_registry.expect(user_id, "riddle", self._answer_riddle, ttl=None)
+        else:
+            answer_registry.clear(user_id, "riddle")
+
+    async def handle_pending_answer(self, user: User, message: str, pending) -> bool:
+        """Hand a matched answer to its question; True if the message was consumed"""
+        if pending.owner is None:
+            # Room-wide: only the first correct answer gets through
+            if not answer_registry.claim(pending, user.id):
+                return False
+            await pending.on_answer(user, message)
+            return True
+        try:
+            return await pending.on_answer(user, message)
+        finally:
+            self.sync_pending_answers(user.id)
+
+    async def _answer_trivia(self, user: User, message: str) -> bool:
+        from ..utils.trivia_manager import trivia_manager
+
+        if not trivia_manager.has_pending_question(user.id):
+            return False
+        try:
+            await trivia_manager.process_answer(self.bot, user, message.strip())
+        except Exception as e:
+            logger.error(f"Error processing trivia answer: {e}")
+        return True
+
+    async def _answer_math(self, user: User, message: str) -> bool:
+        return user.id in self.game_commands.pending_math and await self.game_commands.process_math_answer(user, message)
+
+    async def _answer_riddle(self, user: User, message: str) -> bool:
+        return user.id in self.game_commands.pending_riddles and await self.game_commands.process_riddle_answer(user, message)
+
+    async def handle_ask_command(self, user: User, message: str) -> None:
+        """Handle ask command - room-wide question, the first correct answer wins XP"""
+        try:
+            if not self.can_use_command(user.id, "ask"):
+                await self.send_chunked_whisper(user.id, "🚫 You need admin permissions to ask room questions.")
+                return
+
+            # !ask "question" answer | alias | ...
+            rest = message[len("!ask"):].strip()
+            if not rest.startswith('"') or rest.find('"', 1) == -1:
+                await self.send_chunked_whisper(user.id,
+                    "❌ Usage: !ask \"question\" answer | alias\n"
+                    "Example: !ask \"Capital of France?\" Paris")
+                return
+            quote_end = rest.find('"', 1)
+            question_text = rest[1:quote_end]
+            answers = [answer.strip() for answer in rest[quote_end + 1:].split("|") if answer.strip()]
+            if not question_text or not answers:
+                await self.send_chunked_whisper(user.id, "❌ Need a question and at least one answer!")
+                return
+
+            async def on_correct(winner: User, text: str) -> None:
+                add_xp(winner.id, ROOM_QUESTION_XP)
+                await self.bot.highrise.chat(f"🎉 {winner.username} got it first: {answers[0]}! +{ROOM_QUESTION_XP} XP")
+
+            question = answer_registry.ask_room("room", answers, on_correct)
+            await self.bot.highrise.chat(f"❓ ROOM QUESTION from {user.username}:\n{question_text}\nFirst correct answer wins {ROOM_QUESTION_XP} XP!")
+            asyncio.create_task(self._expire_room_question(question, answers[0]))
+
+        except Exception as e:
+            await self.send_chunked_whisper(user.id, f"❌ Error asking question: {str(e)}")
+            print(f"❌ Error in ask command: {e}")
+
+    async def _expire_room_question(self, question, answer: str) -> None:
+        await asyncio.sleep(ROOM_QUESTION_TTL)
+        if answer_registry.close_room(question):
+            await self.bot.highrise.chat(f"⏰ Time's up! The answer was: {answer}")
+
     async def handle_follow_command(self, user: User) -> None:
         """Handle follow command - bot follows the user"""
         try:
             if not self.can_use_command(user.id, "follow"):
-                await self.bot.highrise.send_whisper(user.id, "🚫 You need VIP permissions to use follow command.")
+                await self.send_chunked_whisper(user.id, "🚫 You need VIP permissions to use follow command.")
                 return
 
-            async with self._movement_lock:
-                # Stop any existing movement first
-                await self.stop_all_movement()
-                
-                # Set new follow target
-                self.following_user = user.id
-                self.follow_active = True
-                
-                await self.bot.highrise.send_whisper(user.id, f"🤖 Bot is now following you! Use !unfollow to stop.")
-                await self.bot.highrise.chat(f"🤖 Following {user.username}")
-                print(f"✅ Bot started following {user.username}")
-                
-                # Start the follow loop
-                asyncio.create_task(self.follow_loop())
+            # The follow pattern ends at once for a user the room state cannot find
+            if await self.room_state.lookup(user.id) is None:
+                await self.send_chunked_whisper(user.id, "❌ Couldn't find you in the room. Try again in a moment.")
+                return
+
+            # Replaces whatever pattern is running
+            follower = Follower(self.bot, self.room_state, user.id)
+            await self.movement.start("follow", follower.steps())
+
+            await self.send_chunked_whisper(user.id, f"🤖 Bot is now following you! Use !unfollow to stop.")
+            await self.bot.highrise.chat(f"🤖 Following {user.username}")
+            print(f"✅ Bot started following {user.username}")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error starting follow: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error starting follow: {str(e)}")
             print(f"❌ Error in follow command: {e}")
 
     async def handle_unfollow_command(self, user: User) -> None:
         """Handle unfollow command"""
         try:
             if not self.can_use_command(user.id, "unfollow"):
-                await self.bot.highrise.send_whisper(user.id, "🚫 You need VIP permissions to use unfollow command.")
+                await self.send_chunked_whisper(user.id, "🚫 You need VIP permissions to use unfollow command.")
                 return
 
-            async with self._movement_lock:
-                if self.follow_active and self.following_user:
-                    self.follow_active = False
-                    old_user = self.following_user
-                    self.following_user = None
-                    
-                    # Return bot to default position
-                    await self.bot.highrise.walk_to(self.default_position)
-                    self.bot_position = self.default_position
-                    
-                    await self.bot.highrise.send_whisper(user.id, "🛑 Bot stopped following and returned to default position.")
-                    await self.bot.highrise.chat("🛑 Stopped following")
-                    print(f"✅ Bot stopped following and returned to default position")
-                else:
-                    await self.bot.highrise.send_whisper(user.id, "❌ Bot is not currently following anyone.")
+            if await self.stop_pattern("follow"):
+                await self.send_chunked_whisper(user.id, "🛑 Bot stopped following and returned to default position.")
+                await self.bot.highrise.chat("🛑 Stopped following")
+                print(f"✅ Bot stopped following and returned to default position")
+            else:
+                await self.send_chunked_whisper(user.id, "❌ Bot is not currently following anyone.")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error stopping follow: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error stopping follow: {str(e)}")
             print(f"❌ Error in unfollow command: {e}")
 
-    async def handle_circle_command(self, user: User) -> None:
-        """Handle circle command - bot circles around the user"""
+    async def handle_circle_command(self, user: User, message: str = "!circle") -> None:
+        """Handle circle command - bot circles around the user, or around the @users named"""
         try:
             if not self.can_use_command(user.id, "circle"):
-                await self.bot.highrise.send_whisper(user.id, "🚫 You need VIP permissions to use circle command.")
+                await self.send_chunked_whisper(user.id, "🚫 You need VIP permissions to use circle command.")
                 return
 
-            async with self._movement_lock:
-                # Stop any existing movement first
-                await self.stop_all_movement()
-                
-                # Set new circle target
-                self.circling_user = user.id
-                self.circle_active = True
-                
-                await self.bot.highrise.send_whisper(user.id, f"🔄 Bot is now circling around you! Use !uncircle to stop.")
-                await self.bot.highrise.chat(f"🔄 Circling around {user.username}")
-                print(f"✅ Bot started circling {user.username}")
-                
-                # Start the circle loop
-                asyncio.create_task(self.circle_loop())
+            usernames = [part for part in message.split()[1:] if part.startswith("@")]
+            targets = []
+            for username in usernames:
+                target_user = await self.room_state.find_by_username(username)
+                if not target_user:
+                    await self.send_chunked_whisper(user.id, f"❌ User {username} not found.")
+                    return
+                targets.append(target_user)
+            if not targets:
+                targets = [user]
+
+            await self.movement.start("circle", circle(self.room_state, [target.id for target in targets], Position))
+
+            names = ", ".join(target.username for target in targets)
+            await self.send_chunked_whisper(user.id, f"🔄 Bot is now circling around {'you' if targets == [user] else names}! Use !uncircle to stop.")
+            await self.bot.highrise.chat(f"🔄 Circling around {names}")
+            print(f"✅ Bot started circling {names}")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error starting circle: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error starting circle: {str(e)}")
             print(f"❌ Error in circle command: {e}")
 
     async def handle_uncircle_command(self, user: User) -> None:
         """Handle uncircle command"""
         try:
             if not self.can_use_command(user.id, "uncircle"):
-                await self.bot.highrise.send_whisper(user.id, "🚫 You need VIP permissions to use uncircle command.")
+                await self.send_chunked_whisper(user.id, "🚫 You need VIP permissions to use uncircle command.")
                 return
 
-            async with self._movement_lock:
-                if self.circle_active and self.circling_user:
-                    self.circle_active = False
-                    old_user = self.circling_user
-                    self.circling_user = None
-                    
-                    # Return bot to default position
-                    await self.bot.highrise.walk_to(self.default_position)
-                    self.bot_position = self.default_position
-                    
-                    await self.bot.highrise.send_whisper(user.id, "🛑 Bot stopped circling and returned to default position.")
-                    await self.bot.highrise.chat("🛑 Stopped circling")
-                    print(f"✅ Bot stopped circling and returned to default position")
-                else:
-                    await self.bot.highrise.send_whisper(user.id, "❌ Bot is not currently circling anyone.")
+            if await self.stop_pattern("circle"):
+                await self.send_chunked_whisper(user.id, "🛑 Bot stopped circling and returned to default position.")
+                await self.bot.highrise.chat("🛑 Stopped circling")
+                print(f"✅ Bot stopped circling and returned to default position")
+            else:
+                await self.send_chunked_whisper(user.id, "❌ Bot is not currently circling anyone.")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error stopping circle: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error stopping circle: {str(e)}")
             print(f"❌ Error in uncircle command: {e}")
 
+    async def handle_patrol_command(self, user: User, message: str) -> None:
+        """Handle patrol command - bot walks between the given points until !unpatrol"""
+        try:
+            if not self.can_use_command(user.id, "patrol"):
+                await self.send_chunked_whisper(user.id, "🚫 You need VIP permissions to use patrol command.")
+                return
+
+            points = []
+            try:
+                for part in message.split()[1:]:
+                    x, y, z = (float(value) for value in part.strip("()").split(","))
+                    points.append(Position(x, y, z, "FrontRight"))
+            except ValueError:
+                points = []
+            if len(points) < 2:
+                await self.send_chunked_whisper(user.id,
+                    "❌ Usage: !patrol x,y,z x,y,z [x,y,z ...]\n"
+                    "Example: !patrol 10,0,10 16.5,0.1,14")
+                return
+
+            await self.movement.start("patrol", patrol(points))
+
+            await self.send_chunked_whisper(user.id, f"🚶 Bot is now patrolling {len(points)} points! Use !unpatrol to stop.")
+            print(f"✅ Bot started patrolling {len(points)} points")
+
+        except Exception as e:
+            await self.send_chunked_whisper(user.id, f"❌ Error starting patrol: {str(e)}")
+            print(f"❌ Error in patrol command: {e}")
+
+    async def handle_unpatrol_command(self, user: User) -> None:
+        """Handle unpatrol command"""
+        try:
+            if not self.can_use_command(user.id, "unpatrol"):
+                await self.send_chunked_whisper(user.id, "🚫 You need VIP permissions to use unpatrol command.")
+                return
+
+            if await self.stop_pattern("patrol"):
+                await self.send_chunked_whisper(user.id, "🛑 Bot stopped patrolling and returned to default position.")
+                print(f"✅ Bot stopped patrolling and returned to default position")
+            else:
+                await self.send_chunked_whisper(user.id, "❌ Bot is not currently patrolling.")
+
+        except Exception as e:
+            await self.send_chunked_whisper(user.id, f"❌ Error stopping patrol: {str(e)}")
+            print(f"❌ Error in unpatrol command: {e}")
+
     async def handle_botpos_command(self, user: User) -> None:
         """Handle botpos command - show current bot position"""
         try:
             # Get current bot position
             try:
-                room_users = (await self.bot.highrise.get_room_users()).content
                 bot_position = None
                 
-                # Find bot in room users
-                for room_user, position in room_users:
-                    if hasattr(self.bot, 'bot_id') and room_user.id == self.bot.bot_id:
-                        bot_position = position
-                        break
+                # Find bot in the room state
+                if hasattr(self.bot, 'bot_id'):
+                    entry = await self.room_state.lookup(self.bot.bot_id)
+                    if entry and hasattr(entry[1], 'x'):
+                        bot_position = entry[1]
                 
                 if bot_position:
                     position_info = (
@@ -1727,7 +1834,13 @@ class ChatHandler:
                         f"Z: {bot_position.z}\n"
                         f"Facing: {bot_position.facing}"
                     )
-                    await self.bot.highrise.send_whisper(user.id, position_info)
+                    if self.movement.active:
+                        timing = self.movement.step_timing(self.movement.name)[self.movement.name]
+                        position_info += (
+                            f"\nPattern: {self.movement.name} ({timing['steps']} steps, "
+                            f"walk {timing['walk_mean'] * 1000:.0f}ms avg)"
+                        )
+                    await self.send_chunked_whisper(user.id, position_info)
                     print(f"✅ Bot position shown to {user.username}")
                 else:
                     # Fallback to stored position
@@ -1739,28 +1852,28 @@ class ChatHandler:
                             f"Z: {self.bot_position.z}\n"
                             f"Facing: {self.bot_position.facing}"
                         )
-                        await self.bot.highrise.send_whisper(user.id, position_info)
+                        await self.send_chunked_whisper(user.id, position_info)
                     else:
-                        await self.bot.highrise.send_whisper(user.id, "❌ Could not get bot position!")
+                        await self.send_chunked_whisper(user.id, "❌ Could not get bot position!")
                         
             except Exception as pos_error:
-                await self.bot.highrise.send_whisper(user.id, f"❌ Error getting position: {str(pos_error)}")
+                await self.send_chunked_whisper(user.id, f"❌ Error getting position: {str(pos_error)}")
                 print(f"❌ Error getting bot position: {pos_error}")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error in botpos command: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error in botpos command: {str(e)}")
             print(f"❌ Error in botpos command: {e}")
 
     async def handle_setbotpos_command(self, user: User, message: str) -> None:
         """Handle setbotpos command - set bot position"""
         try:
             if not self.can_use_command(user.id, "setbotpos"):
-                await self.bot.highrise.send_whisper(user.id, "🚫 You need owner permissions to set bot position.")
+                await self.send_chunked_whisper(user.id, "🚫 You need owner permissions to set bot position.")
                 return
 
             parts = message.split()
             if len(parts) != 5:
-                await self.bot.highrise.send_whisper(user.id, 
+                await self.send_chunked_whisper(user.id, 
                     "❌ Usage: !setbotpos <x> <y> <z> <facing>\n"
                     "Example: !setbotpos 16.5 0.1 14.0 FrontRight")
                 return
@@ -1774,163 +1887,69 @@ class ChatHandler:
                 # Valid facing directions
                 valid_facings = ["FrontRight", "FrontLeft", "BackRight", "BackLeft"]
                 if facing not in valid_facings:
-                    await self.bot.highrise.send_whisper(user.id, 
+                    await self.send_chunked_whisper(user.id, 
                         f"❌ Invalid facing direction. Use: {', '.join(valid_facings)}")
                     return
 
                 # Stop any movement before setting position
-                async with self._movement_lock:
-                    await self.stop_all_movement()
-                    
-                    # Set new position
-                    new_position = Position(x, y, z, facing)
-                    await self.bot.highrise.walk_to(new_position)
-                    self.bot_position = new_position
-                    
-                    await self.bot.highrise.send_whisper(user.id, 
-                        f"✅ Bot moved to position: ({x}, {y}, {z}) facing {facing}")
-                    print(f"✅ Bot position set to: ({x}, {y}, {z}) facing {facing}")
+                await self.stop_all_movement()
+
+                # Set new position
+                new_position = Position(x, y, z, facing)
+                await self.bot.highrise.walk_to(new_position)
+                self.bot_position = new_position
+
+                await self.send_chunked_whisper(user.id, 
+                    f"✅ Bot moved to position: ({x}, {y}, {z}) facing {facing}")
+                print(f"✅ Bot position set to: ({x}, {y}, {z}) facing {facing}")
 
             except ValueError:
-                await self.bot.highrise.send_whisper(user.id, "❌ Invalid coordinates. Please use numbers for x, y, z.")
+                await self.send_chunked_whisper(user.id, "❌ Invalid coordinates. Please use numbers for x, y, z.")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error setting bot position: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error setting bot position: {str(e)}")
             print(f"❌ Error in setbotpos command: {e}")
 
     async def handle_resetbotpos_command(self, user: User) -> None:
         """Handle resetbotpos command - reset bot to default position"""
         try:
             if not self.can_use_command(user.id, "resetbotpos"):
-                await self.bot.highrise.send_whisper(user.id, "🚫 You need owner permissions to reset bot position.")
+                await self.send_chunked_whisper(user.id, "🚫 You need owner permissions to reset bot position.")
                 return
 
-            async with self._movement_lock:
-                await self.stop_all_movement()
-                
-                # Reset to default position
-                await self.bot.highrise.walk_to(self.default_position)
-                self.bot_position = self.default_position
-                
-                await self.bot.highrise.send_whisper(user.id, "✅ Bot position reset to default location.")
-                print("✅ Bot position reset to default")
+            await self.stop_all_movement()
+
+            # Reset to default position
+            await self.bot.highrise.walk_to(self.default_position)
+            self.bot_position = self.default_position
+
+            await self.send_chunked_whisper(user.id, "✅ Bot position reset to default location.")
+            print("✅ Bot position reset to default")
 
         except Exception as e:
-            await self.bot.highrise.send_whisper(user.id, f"❌ Error resetting bot position: {str(e)}")
+            await self.send_chunked_whisper(user.id, f"❌ Error resetting bot position: {str(e)}")
             print(f"❌ Error in resetbotpos command: {e}")
 
     async def stop_all_movement(self) -> None:
         """Stop all bot movement activities"""
         print("🛑 Stopping all movement activities")
-        self.follow_active = False
-        self.circle_active = False
-        self.following_user = None
-        self.circling_user = None
-        
-        # Small delay to allow loops to detect the state change
-        await asyncio.sleep(0.1)
-
-    async def follow_loop(self) -> None:
-        """Main loop for following a user"""
-        try:
-            print(f"🔄 Starting follow loop for user {self.following_user}")
-            
-            while self.follow_active and self.following_user:
-                try:
-                    # Get room users to find the target
-                    room_users = (await self.bot.highrise.get_room_users()).content
-                    target_position = None
-                    target_found = False
-                    
-                    for room_user, position in room_users:
-                        if room_user.id == self.following_user:
-                            target_position = position
-                            target_found = True
-                            break
-                    
-                    if target_found and target_position:
-                        # Calculate position slightly behind the user
-                        follow_x = target_position.x - 1.0
-                        follow_z = target_position.z - 1.0
-                        follow_position = Position(follow_x, target_position.y, follow_z, target_position.facing)
-                        
-                        # Move to follow position
-                        await self.bot.highrise.walk_to(follow_position)
-                        self.bot_position = follow_position
-                        print(f"🚶 Bot moved to follow position: ({follow_x:.1f}, {target_position.y:.1f}, {follow_z:.1f})")
-                    else:
-                        print(f"⚠️ Target user not found in room, stopping follow")
-                        break
-                    
-                    # Wait before next movement
-                    await asyncio.sleep(2.5)
-                    
-                except Exception as e:
-                    print(f"❌ Error in follow loop iteration: {e}")
-                    await asyncio.sleep(3)
-                    
-        except Exception as e:
-            print(f"❌ Follow loop error: {e}")
-        finally:
-            # Clean up state
-            self.follow_active = False
-            self.following_user = None
-            print("🛑 Follow loop ended")
+        name = self.movement.name
+        # Returns once the pattern has been cancelled and cleaned up
+        await self.movement.stop()
+        if name:
+            logger.debug(f"{name} step timing: {self.movement.step_timing(name).get(name)}")
+
+    async def stop_pattern(self, name: str) -> bool:
+        """Stop the named movement pattern and walk back to the default position"""
+        if self.movement.name != name or not self.movement.active:
+            return False
+        await self.stop_all_movement()
+        await self.bot.highrise.walk_to(self.default_position)
+        self.bot_position = self.default_position
+        return True
 
-    async def circle_loop(self) -> None:
-        """Main loop for circling around a user"""
-        try:
-            import math
-            angle = 0
-            radius = 2.0
-            print(f"🔄 Starting circle loop for user {self.circling_user}")
-            
-            while self.circle_active and self.circling_user:
-                try:
-                    # Get room users to find the target
-                    room_users = (await self.bot.highrise.get_room_users()).content
-                    target_position = None
-                    target_found = False
-                    
-                    for room_user, position in room_users:
-                        if room_user.id == self.circling_user:
-                            target_position = position
-                            target_found = True
-                            break
-                    
-                    if target_found and target_position:
-                        # Calculate circle position
-                        circle_x = target_position.x + radius * math.cos(math.radians(angle))
-                        circle_z = target_position.z + radius * math.sin(math.radians(angle))
-                        circle_position = Position(circle_x, target_position.y, circle_z, "FrontRight")
-                        
-                        # Move to circle position
-                        await self.bot.highrise.walk_to(circle_position)
-                        self.bot_position = circle_position
-                        print(f"🔄 Bot moved to circle position: angle {angle}° ({circle_x:.1f}, {target_position.y:.1f}, {circle_z:.1f})")
-                        
-                        # Increment angle for next position
-                        angle += 30  # Move 30 degrees each step
-                        if angle >= 360:
-                            angle = 0
-                    else:
-                        print(f"⚠️ Target user not found in room, stopping circle")
-                        break
-                    
-                    # Wait before next movement
-                    await asyncio.sleep(2.0)
-                    
-                except Exception as e:
-                    print(f"❌ Error in circle loop iteration: {e}")
-                    await asyncio.sleep(3)
-                    
-        except Exception as e:
-            print(f"❌ Circle loop error: {e}")
-        finally:
-            # Clean up state
-            self.circle_active = False
-            self.circling_user = None
-            print("🛑 Circle loop ended")
+    def _set_bot_position(self, position: Position) -> None:
+        self.bot_position = position
 
     async def handle_numbered_emote(self, user: User, emote_number: int) -> None:
         """Handle numbered emote command"""
\ No newline at end of file
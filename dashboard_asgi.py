@@ -0,0 +1,371 @@
+"""ASGI variant of dashboard_server with the same routes.
+
+All requests are answered from one in-memory snapshot of the profile data that a
+background task refreshes when the source files change, so concurrent clients
+share a single parse instead of each request re-reading profiles.json.
+
+Run with:  uvicorn dashboard_asgi:app --port 8000
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from urllib.parse import parse_qsl, unquote
+
+from bot.utils import change_feed
+from dashboard_data import (
+    ACHIEVEMENTS_SORT_KEYS, EXPORT_FORMATS, EXPORTS, export_format, export_stream, USERS_SORT_KEYS, TableView, build_achievements, build_inventory,
+    build_leaderboard, build_users, file_version, format_sse, load_profiles, modlog_page, modlog_params,
+    modlog_version, page_params, profiles_version, summary_fields, users_version
+)
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_FILE = os.path.join(os.path.dirname(__file__), 'templates', 'dashboard_v2.html')
+
+# How often the shared snapshot re-stats its source files
+REFRESH_INTERVAL = 1.0
+
+RESPONSE_CACHE_SIZE = 128
+GZIP_MIN_BYTES = 1024
+
+STREAM_POLL_INTERVAL = 1.0
+STREAM_HEARTBEAT_INTERVAL = 15.0
+
+# Dummy user session for demo purposes, as in dashboard_server
+def get_current_user_role():
+    return "admin"
+
+class DashboardStore:
+    """Snapshot of profiles, table views and rendered responses shared by all requests."""
+
+    def __init__(self):
+        self.profiles = {}
+        self.versions = {"profiles": None, "users": None, "modlog": None}
+        self.users = TableView([])
+        self.achievements = TableView([])
+        self.leaderboard = []
+        self._responses = OrderedDict()  # key -> (version, etag, body, gzipped body or None)
+        self._task = None
+        self._refresh_lock = asyncio.Lock()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Dashboard refresh failed: {e}")
+            await asyncio.sleep(REFRESH_INTERVAL)
+
+    async def refresh(self):
+        """Reload whatever changed on disk; parsing runs in a worker thread."""
+        async with self._refresh_lock:
+            p_version, u_version, m_version = profiles_version(), users_version(), modlog_version()
+            profiles_changed = p_version != self.versions["profiles"]
+            if profiles_changed or u_version != self.versions["users"]:
+                snapshot = await asyncio.to_thread(self._build, profiles_changed)
+                self.profiles, self.users, self.achievements, self.leaderboard = snapshot
+                self.versions["profiles"] = p_version
+                self.versions["users"] = u_version
+            self.versions["modlog"] = m_version
+
+    def _build(self, reload_profiles):
+        profiles = load_profiles() if reload_profiles else self.profiles
+        users = TableView(build_users(profiles))
+        achievements = TableView(build_achievements(profiles))
+        # Prebuild the default orders so the first page request does not sort on the event loop
+        users.order('xp')
+        achievements.order('achievements_count')
+        return profiles, users, achievements, build_leaderboard(profiles)
+
+    async def ensure_loaded(self):
+        if self.versions["profiles"] is None and self.versions["users"] is None:
+            await self.refresh()
+
+    def cached(self, key, version):
+        cached = self._responses.get(key)
+        if cached is None or cached[0] != version:
+            return None
+        self._responses.move_to_end(key)
+        return cached
+
+    def render(self, key, version, data):
+        body = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        etag = hashlib.sha1(body).hexdigest()
+        gzipped = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+        cached = (version, etag, body, gzipped)
+        self._responses[key] = cached
+        while len(self._responses) > RESPONSE_CACHE_SIZE:
+            self._responses.popitem(last=False)
+        return cached
+
+store = DashboardStore()
+_template = {"version": None, "body": b""}
+
+class Request:
+    def __init__(self, scope):
+        self.method = scope.get("method", "GET")
+        self.path = unquote(scope.get("path", "/"))
+        self.args = {}
+        for name, value in parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True):
+            self.args.setdefault(name, value)
+        self.headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope.get("headers", [])}
+
+    def if_none_match(self):
+        value = self.headers.get("if-none-match", "")
+        return {tag.strip().removeprefix("W/").strip('"') for tag in value.split(",") if tag.strip()}
+
+    def accepts_gzip(self):
+        return "gzip" in self.headers.get("accept-encoding", "")
+
+def head_only(send):
+    """send() for a HEAD request: the headers a GET would get (Content-Length included), no body."""
+    async def send_headers(message):
+        if message["type"] == "http.response.body":
+            if message.get("more_body"):
+                return
+            message = {"type": "http.response.body", "body": b""}
+        await send(message)
+    return send_headers
+
+async def send_response(send, status, body=b"", content_type="application/json", headers=()):
+    response_headers = [(b"content-type", content_type.encode("latin-1")), (b"content-length", str(len(body)).encode())]
+    response_headers.extend((name.encode("latin-1"), value.encode("latin-1")) for name, value in headers)
+    await send({"type": "http.response.start", "status": status, "headers": response_headers})
+    await send({"type": "http.response.body", "body": body})
+
+async def send_json(send, data, status=200):
+    await send_response(send, status, json.dumps(data, separators=(',', ':')).encode('utf-8'))
+
+async def send_cached_json(request, send, key, version, build):
+    """Async counterpart of dashboard_server.cached_json (ETag/304 and gzip)."""
+    cached = store.cached(key, version)
+    if cached is None:
+        data = build()
+        if asyncio.iscoroutine(data):
+            data = await data
+        cached = store.render(key, version, data)
+
+    _, etag, body, gzipped = cached
+    headers = [("etag", f'"{etag}"'), ("cache-control", "no-cache"), ("vary", "Accept-Encoding")]
+    if etag in request.if_none_match():
+        await send({"type": "http.response.start", "status": 304, "headers": [(n.encode(), v.encode()) for n, v in headers]})
+        await send({"type": "http.response.body", "body": b""})
+    elif gzipped is not None and request.accepts_gzip():
+        headers.append(("content-encoding", "gzip"))
+        await send_response(send, 200, gzipped, headers=headers)
+    else:
+        await send_response(send, 200, body, headers=headers)
+
+async def index(request, send):
+    version = file_version(TEMPLATE_FILE)
+    if version != _template["version"]:
+        with open(TEMPLATE_FILE, 'rb') as f:
+            _template["body"] = f.read()
+        _template["version"] = version
+    await send_response(send, 200, _template["body"], content_type="text/html; charset=utf-8")
+
+async def modlogs(request, send):
+    params = modlog_params(request.args)
+    key = ('modlogs',) + tuple(sorted(params.items()))
+    # Modlog queries read segment files, so they run off the event loop
+    await send_cached_json(request, send, key, store.versions["modlog"],
+                           lambda: asyncio.to_thread(modlog_page, params))
+
+async def users(request, send):
+    args = page_params(request.args, USERS_SORT_KEYS, 'xp')
+    view = store.users
+    await send_cached_json(request, send, ('users',) + args, store.versions["users"], lambda: view.page(*args))
+
+async def achievements(request, send):
+    args = page_params(request.args, ACHIEVEMENTS_SORT_KEYS, 'achievements_count')
+    view = store.achievements
+    await send_cached_json(request, send, ('achievements',) + args, store.versions["profiles"], lambda: view.page(*args))
+
+async def leaderboard(request, send):
+    rows = store.leaderboard
+    await send_cached_json(request, send, ('leaderboard',), store.versions["profiles"], lambda: rows)
+
+async def summary(request, send):
+    fields = summary_fields(request.args)
+    users_view, achievements_view, leaderboard_rows = store.users, store.achievements, store.leaderboard
+    version = (store.versions["users"], store.versions["modlog"])
+
+    async def build():
+        data = {}
+        if 'users' in fields:
+            data['users'] = users_view.page(*page_params({}, USERS_SORT_KEYS, 'xp'))
+        if 'achievements' in fields:
+            data['achievements'] = achievements_view.page(*page_params({}, ACHIEVEMENTS_SORT_KEYS, 'achievements_count'))
+        if 'leaderboard' in fields:
+            data['leaderboard'] = leaderboard_rows
+        if 'modlogs' in fields:
+            data['modlogs'] = await asyncio.to_thread(modlog_page, modlog_params({}))
+        return data
+
+    await send_cached_json(request, send, ('summary', fields), version, build)
+
+async def export(request, send, receive, name):
+    if name not in EXPORTS:
+        await send_response(send, 404, b"Not Found", content_type="text/plain")
+        return
+    fmt = export_format(request.args)
+    if fmt is None:
+        await send_response(send, 400, b"Unsupported export format", content_type="text/plain")
+        return
+
+    # Exports read the files directly rather than the snapshot so memory stays flat;
+    # each chunk is produced in a worker thread and sent without a Content-Length
+    await send({"type": "http.response.start", "status": 200, "headers": [
+        (b"content-type", EXPORT_FORMATS[fmt].encode()),
+        (b"content-disposition", f'attachment; filename="{name}.{fmt}"'.encode())
+    ]})
+    if request.method == "HEAD":
+        await send({"type": "http.response.body", "body": b""})
+        return
+    chunks = export_stream(name, fmt)
+    disconnected = asyncio.Event()
+    watcher = asyncio.get_running_loop().create_task(watch_disconnect(receive, disconnected))
+    try:
+        # A client that goes away stops the export after the chunk in progress
+        while not disconnected.is_set():
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                await send({"type": "http.response.body", "body": b""})
+                break
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    finally:
+        watcher.cancel()
+        try:
+            chunks.close()
+        except ValueError:
+            # Cancelled while a worker thread is still inside the generator; it is dropped with it
+            pass
+
+async def inventory(request, send, user_id):
+    data = build_inventory(store.profiles, user_id)
+    if data is None:
+        await send_json(send, {"error": "User not found"}, status=404)
+    else:
+        await send_json(send, data)
+
+async def watch_disconnect(receive, disconnected):
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            disconnected.set()
+            return
+
+async def stream(request, send, receive):
+    await send({"type": "http.response.start", "status": 200, "headers": [
+        (b"content-type", b"text/event-stream"),
+        (b"cache-control", b"no-cache"),
+        (b"x-accel-buffering", b"no")
+    ]})
+    if request.method == "HEAD":
+        await send({"type": "http.response.body", "body": b""})
+        return
+    disconnected = asyncio.Event()
+    watcher = asyncio.get_running_loop().create_task(watch_disconnect(receive, disconnected))
+    reader = change_feed.FeedReader(request.headers.get("last-event-id"))
+
+    async def emit(text):
+        await send({"type": "http.response.body", "body": text.encode('utf-8'), "more_body": True})
+
+    try:
+        await emit("retry: 3000\n\n")
+        loop = asyncio.get_running_loop()
+        last_sent = loop.time()
+        while not disconnected.is_set():
+            for event_id, event in reader.poll():
+                if event is None:
+                    await emit(format_sse(f"{reader.file_id}:0", "reset", {}))
+                else:
+                    await emit(format_sse(event_id, event["type"], event))
+                last_sent = loop.time()
+            if loop.time() - last_sent >= STREAM_HEARTBEAT_INTERVAL:
+                await emit(": keep-alive\n\n")
+                last_sent = loop.time()
+            try:
+                await asyncio.wait_for(disconnected.wait(), STREAM_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        watcher.cancel()
+
+ROUTES = {
+    '/modlogs': modlogs,
+    '/users': users,
+    '/achievements': achievements,
+    '/leaderboard': leaderboard,
+    '/summary': summary
+}
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await store.refresh()
+            store.start()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await store.stop()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    request = Request(scope)
+    if request.method not in ("GET", "HEAD"):
+        await send_response(send, 405, b"Method Not Allowed", content_type="text/plain")
+        return
+    if request.method == "HEAD":
+        send = head_only(send)
+    if request.path == '/':
+        await index(request, send)
+        return
+    if get_current_user_role() not in ['admin', 'owner']:
+        await send_response(send, 403, b"No access", content_type="text/plain")
+        return
+
+    # Servers without lifespan support get the snapshot loaded on first use
+    await store.ensure_loaded()
+    store.start()
+    if request.path == '/stream':
+        await stream(request, send, receive)
+    elif request.path in ROUTES:
+        await ROUTES[request.path](request, send)
+    elif request.path.startswith('/export/'):
+        await export(request, send, receive, request.path[len('/export/'):])
+    elif request.path.startswith('/inventory/') and len(request.path) > len('/inventory/'):
+        await inventory(request, send, request.path[len('/inventory/'):])
+    else:
+        await send_response(send, 404, b"Not Found", content_type="text/plain")
+
+if __name__ == '__main__':
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("dashboard_asgi needs an ASGI server, e.g. pip install uvicorn")
+    uvicorn.run(app, host='127.0.0.1', port=int(os.environ.get('DASHBOARD_PORT', 8000)))
@@ -0,0 +1,272 @@
+"""Data views shared by the Flask (dashboard_server) and ASGI (dashboard_asgi) dashboards."""
+import csv
+import io
+import json
+import os
+from threading import Lock
+from bot.core import profile_manager
+from bot.utils import modlog
+from bot.utils import modlog_query
+from bot.utils import roles
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+PROFILES_FILE = os.path.join(DATA_DIR, 'profiles.json')
+
+# Paged table endpoints
+PAGE_SIZE_DEFAULT = 50
+PAGE_SIZE_MAX = 500
+USERS_SORT_KEYS = ('user_id', 'name', 'role', 'level', 'xp', 'messages', 'time_spent')
+ACHIEVEMENTS_SORT_KEYS = ('user_id', 'name', 'achievements_count')
+MODLOG_LIMIT_DEFAULT = 50
+MODLOG_LIMIT_MAX = 500
+
+# Streamed exports: rows are encoded into chunks of about this size
+EXPORT_FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+EXPORT_CHUNK_BYTES = 64 * 1024
+PROFILE_EXPORT_COLUMNS = ('user_id', 'name', 'birthday', 'age', 'level', 'xp', 'messages', 'time_spent',
+                          'games_played', 'room_joins', 'coins', 'achievements_count', 'inventory_count')
+MODLOG_EXPORT_COLUMNS = ('time', 'action', 'by', 'target', 'reason', 'duration')
+
+# Sections of /summary, each the default first page of the route with the same name
+SUMMARY_FIELDS = ('users', 'achievements', 'leaderboard', 'modlogs')
+
+def file_version(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def profiles_version():
+    return file_version(PROFILES_FILE)
+
+def users_version():
+    # The users table also shows roles, so a roles.json edit invalidates it too
+    return (profiles_version(), file_version(roles.ROLES_FILE))
+
+def modlog_version():
+    # Appends touch the active segment; rotations rewrite the segment index
+    return (file_version(modlog.MODLOG_FILE), file_version(modlog.INDEX_FILE))
+
+def load_profiles():
+    try:
+        with open(PROFILES_FILE, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def _int_arg(args, name, default):
+    try:
+        return int(args.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+def page_params(args, sort_keys, default_sort):
+    """(sort, descending, q, offset, limit) from a mapping of query arguments."""
+    offset = max(_int_arg(args, 'offset', 0), 0)
+    limit = min(max(_int_arg(args, 'limit', PAGE_SIZE_DEFAULT), 0), PAGE_SIZE_MAX)
+    sort = args.get('sort', default_sort)
+    if sort not in sort_keys:
+        sort = default_sort
+    descending = args.get('order', 'desc') != 'asc'
+    q = (args.get('q') or '').strip()
+    return sort, descending, q, offset, limit
+
+def modlog_params(args):
+    """Keyword arguments for modlog_query.query from a mapping of query arguments."""
+    limit = _int_arg(args, 'limit', MODLOG_LIMIT_DEFAULT)
+    return {
+        "target": args.get('target'),
+        "by": args.get('by'),
+        "action": args.get('action'),
+        "before": args.get('before'),
+        "since": args.get('since'),
+        "until": args.get('until'),
+        "limit": min(max(limit, 0), MODLOG_LIMIT_MAX)
+    }
+
+def modlog_page(params):
+    """{"items": entries newest-first, "next": the `before` cursor for the next page, or None on the last page}."""
+    entries = modlog_query.query(**params)
+    more = params["limit"] and len(entries) >= params["limit"]
+    return {"items": entries, "next": modlog_query.next_cursor(entries, params["before"]) if more else None}
+
+def summary_fields(args):
+    """Sections requested through ?fields=users,modlogs (all of them when omitted)."""
+    requested = [name.strip() for name in (args.get('fields') or '').split(',') if name.strip()]
+    if not requested:
+        return SUMMARY_FIELDS
+    return tuple(name for name in SUMMARY_FIELDS if name in requested)
+
+class TableView:
+    """Rows of one dashboard table with search keys and lazily built sort orders.
+
+    A view is rebuilt only when its source files change; every page request in
+    between is answered from the prebuilt orders.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.search_keys = [f"{row['user_id']} {row.get('name') or ''}".casefold() for row in rows]
+        self._orders = {}
+        self._lock = Lock()
+
+    def order(self, key):
+        with self._lock:
+            if key not in self._orders:
+                rows = self.rows
+
+                def sort_value(i):
+                    value = rows[i].get(key)
+                    if isinstance(value, str):
+                        value = value.casefold()
+                    return (value is None, value, rows[i]['user_id'])
+
+                self._orders[key] = sorted(range(len(rows)), key=sort_value)
+            return self._orders[key]
+
+    def page(self, sort, descending, q, offset, limit):
+        order = self.order(sort)
+        if q:
+            q = q.casefold()
+            matched = [i for i in (reversed(order) if descending else order) if q in self.search_keys[i]]
+            total = len(matched)
+            selected = matched[offset:offset + limit]
+        else:
+            # Slice the prebuilt order directly instead of copying it
+            total = len(order)
+            if descending:
+                end = max(total - offset, 0)
+                selected = order[max(end - limit, 0):end][::-1]
+            else:
+                selected = order[offset:offset + limit]
+        return {
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "sort": sort,
+            "order": "desc" if descending else "asc",
+            "items": [self.rows[i] for i in selected]
+        }
+
+def build_users(profiles):
+    merged_users = []
+    for user_id, profile in profiles.items():
+        stats = profile.get("stats", {})
+        merged_user = {
+            "user_id": user_id,
+            "name": profile.get("name", ""),
+            "role": roles.get_role(user_id),
+            "level": stats.get("level", 1),
+            "xp": stats.get("xp", 0),
+            "messages": stats.get("messages", 0),
+            "time_spent": stats.get("time_spent", 0)
+        }
+        merged_users.append(merged_user)
+    return merged_users
+
+def build_achievements(profiles):
+    achievements_data = []
+    for user_id, profile in profiles.items():
+        achievements = profile.get("achievements", [])
+        achievements_data.append({
+            "user_id": user_id,
+            "name": profile.get("name", ""),
+            "achievements": achievements,
+            "achievements_count": len(achievements)
+        })
+    return achievements_data
+
+def build_leaderboard(profiles):
+    leaderboard_data = []
+    for user_id, profile in profiles.items():
+        stats = profile.get("stats", {})
+        wallet = profile.get("wallet", {})
+        achievements = profile.get("achievements", [])
+        leaderboard_data.append({
+            "user_id": user_id,
+            "name": profile.get("name", ""),
+            "xp": stats.get("xp", 0),
+            "level": stats.get("level", 1),
+            "coins": wallet.get("coins", 0),
+            "achievements_count": len(achievements)
+        })
+
+    # Sort by XP descending by default
+    leaderboard_data.sort(key=lambda x: x["xp"], reverse=True)
+    return leaderboard_data
+
+def build_inventory(profiles, user_id):
+    profile = profiles.get(user_id)
+    if not profile:
+        return None
+    return {
+        "user_id": user_id,
+        "name": profile.get("name", ""),
+        "inventory": profile.get("inventory", [])
+    }
+
+def export_format(args):
+    """Requested export format, or None when it is not supported."""
+    fmt = args.get('format', 'ndjson')
+    return fmt if fmt in EXPORT_FORMATS else None
+
+def export_profile_records(fmt):
+    """Profiles as read from disk: whole documents for NDJSON, flat rows for CSV."""
+    for user_id, profile in profile_manager.iter_profiles():
+        if fmt != 'csv':
+            record = {"user_id": user_id}
+            record.update(profile)
+            yield record
+            continue
+        stats = profile.get("stats", {})
+        yield {
+            "user_id": user_id,
+            "name": profile.get("name", ""),
+            "birthday": profile.get("birthday"),
+            "age": profile.get("age"),
+            "level": stats.get("level", 1),
+            "xp": stats.get("xp", 0),
+            "messages": stats.get("messages", 0),
+            "time_spent": stats.get("time_spent", 0),
+            "games_played": stats.get("games_played", 0),
+            "room_joins": stats.get("room_joins", 0),
+            "coins": profile.get("wallet", {}).get("coins", 0),
+            "achievements_count": len(profile.get("achievements", [])),
+            "inventory_count": len(profile.get("inventory", []))
+        }
+
+def export_modlog_records(fmt):
+    """Modlog entries newest-first, streamed segment by segment."""
+    modlog.ensure_migrated()
+    return modlog.iter_entries()
+
+def export_chunks(records, fmt, columns):
+    """Encode records as NDJSON or CSV, yielding UTF-8 chunks of about EXPORT_CHUNK_BYTES."""
+    buffer = io.StringIO()
+    if fmt == 'csv':
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        write = lambda record: writer.writerow([record.get(column) for column in columns])
+    else:
+        write = lambda record: buffer.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+    for record in records:
+        write(record)
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+EXPORTS = {
+    'profiles': (export_profile_records, PROFILE_EXPORT_COLUMNS),
+    'modlogs': (export_modlog_records, MODLOG_EXPORT_COLUMNS)
+}
+
+def export_stream(name, fmt):
+    records, columns = EXPORTS[name]
+    return export_chunks(records(fmt), fmt, columns)
+
+def format_sse(event_id, event_type, data):
+    return f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
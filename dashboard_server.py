@@ -1,11 +1,32 @@
-from flask import Flask, jsonify, render_template, request, abort
-import os
+from flask import Flask, Response, jsonify, render_template, request, abort, stream_with_context
+from collections import OrderedDict
+from threading import Lock
+import gzip
+import hashlib
 import json
+import time
+from bot.utils import change_feed
+from dashboard_data import (
+    ACHIEVEMENTS_SORT_KEYS, EXPORT_FORMATS, EXPORTS, export_format, export_stream, USERS_SORT_KEYS, TableView, build_achievements, build_inventory,
+    build_leaderboard, build_users, format_sse, load_profiles, modlog_page, modlog_params, modlog_version,
+    page_params, profiles_version, summary_fields, users_version
+)
 
 app = Flask(__name__, template_folder='templates')
 
-DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
-MODLOG_FILE = os.path.join(DATA_DIR, 'modlog.json')
+# Rendered JSON responses are cached until the files they were built from change
+RESPONSE_CACHE_SIZE = 128
+GZIP_MIN_BYTES = 1024
+_response_cache = OrderedDict()  # key -> (version, etag, body, gzipped body or None)
+_response_cache_lock = Lock()
+
+_views = {}  # view name -> (version, TableView or rows)
+_views_lock = Lock()
+
+# Server-sent events: how often /stream checks the change feed, and how often
+# it sends a comment line so proxies keep the connection open
+STREAM_POLL_INTERVAL = 1.0
+STREAM_HEARTBEAT_INTERVAL = 15.0
 
 # Dummy user session for demo purposes
 # In real app, replace with proper auth and session management
@@ -13,6 +34,66 @@ def get_current_user_role():
     # For demo, assume user is admin
     return "admin"
 
+def get_view(name, version, build):
+    with _views_lock:
+        cached = _views.get(name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    view = build()
+    with _views_lock:
+        _views[name] = (version, view)
+    return view
+
+def get_table_view(name, version, build):
+    return get_view(name, version, lambda: TableView(build()))
+
+class ProfilesParse:
+    """Parses profiles.json at most once for all the views built in one request."""
+
+    def __init__(self):
+        self._profiles = None
+
+    def __call__(self):
+        if self._profiles is None:
+            self._profiles = load_profiles()
+        return self._profiles
+
+def page_args(sort_keys, default_sort):
+    return page_params(request.args, sort_keys, default_sort)
+
+def cached_json(key, version, build):
+    """Serve build() as JSON, re-rendering only when `version` changes.
+
+    Responses carry an ETag so unchanged polls get a bodyless 304, and large
+    bodies are sent gzip-compressed to clients that accept it.
+    """
+    with _response_cache_lock:
+        cached = _response_cache.get(key)
+        if cached is not None:
+            _response_cache.move_to_end(key)
+    if cached is None or cached[0] != version:
+        body = json.dumps(build(), separators=(',', ':')).encode('utf-8')
+        etag = hashlib.sha1(body).hexdigest()
+        gzipped = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+        cached = (version, etag, body, gzipped)
+        with _response_cache_lock:
+            _response_cache[key] = cached
+            while len(_response_cache) > RESPONSE_CACHE_SIZE:
+                _response_cache.popitem(last=False)
+
+    _, etag, body, gzipped = cached
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    elif gzipped is not None and 'gzip' in request.accept_encodings:
+        response = Response(gzipped, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
 @app.route('/')
 def index():
     return render_template('dashboard_v2.html')
@@ -23,16 +104,9 @@ def modlogs():
     if role not in ['admin', 'owner']:
         return abort(403, description="No access")
 
-    limit = request.args.get('limit', default=50, type=int)
-    try:
-        with open(MODLOG_FILE, 'r') as f:
-            logs = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        logs = []
-
-    # Sort logs by time descending
-    logs_sorted = sorted(logs, key=lambda x: x.get('time', ''), reverse=True)
-    return jsonify(logs_sorted[:limit])
+    params = modlog_params(request.args)
+    key = ('modlogs',) + tuple(sorted(params.items()))
+    return cached_json(key, modlog_version(), lambda: modlog_page(params))
 
 @app.route('/users')
 def users():
@@ -40,54 +114,29 @@ def users():
     if role not in ['admin', 'owner']:
         return abort(403, description="No access")
 
-    profiles_file = os.path.join(DATA_DIR, 'profiles.json')
-
-    try:
-        with open(profiles_file, 'r') as f:
-            profiles = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        profiles = {}
-
-    merged_users = []
-    for user_id, profile in profiles.items():
-        stats = profile.get("stats", {})
-        merged_user = {
-            "user_id": user_id,
-            "name": profile.get("name", ""),
-            "role": profile.get("role", ""),
-            "level": stats.get("level", 1),
-            "xp": stats.get("xp", 0),
-            "messages": stats.get("messages", 0),
-            "time_spent": stats.get("time_spent", 0)
-        }
-        merged_users.append(merged_user)
-
-    return jsonify(merged_users)
-    
+    version = users_version()
+    args = page_args(USERS_SORT_KEYS, 'xp')
+
+    def build():
+        view = get_table_view('users', version, lambda: build_users(load_profiles()))
+        return view.page(*args)
+
+    return cached_json(('users',) + args, version, build)
+
 @app.route('/achievements')
 def achievements():
     role = get_current_user_role()
     if role not in ['admin', 'owner']:
         return abort(403, description="No access")
 
-    profiles_file = os.path.join(DATA_DIR, 'profiles.json')
-
-    try:
-        with open(profiles_file, 'r') as f:
-            profiles = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        profiles = {}
+    version = profiles_version()
+    args = page_args(ACHIEVEMENTS_SORT_KEYS, 'achievements_count')
 
-    achievements_data = []
-    for user_id, profile in profiles.items():
-        achievements = profile.get("achievements", [])
-        achievements_data.append({
-            "user_id": user_id,
-            "name": profile.get("name", ""),
-            "achievements": achievements
-        })
+    def build():
+        view = get_table_view('achievements', version, lambda: build_achievements(load_profiles()))
+        return view.page(*args)
 
-    return jsonify(achievements_data)
+    return cached_json(('achievements',) + args, version, build)
 
 @app.route('/leaderboard')
 def leaderboard():
@@ -95,57 +144,96 @@ def leaderboard():
     if role not in ['admin', 'owner']:
         return abort(403, description="No access")
 
-    profiles_file = os.path.join(DATA_DIR, 'profiles.json')
-
-    try:
-        with open(profiles_file, 'r') as f:
-            profiles = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        profiles = {}
-
-    leaderboard_data = []
-    for user_id, profile in profiles.items():
-        stats = profile.get("stats", {})
-        wallet = profile.get("wallet", {})
-        achievements = profile.get("achievements", [])
-        leaderboard_data.append({
-            "user_id": user_id,
-            "name": profile.get("name", ""),
-            "xp": stats.get("xp", 0),
-            "level": stats.get("level", 1),
-            "coins": wallet.get("coins", 0),
-            "achievements_count": len(achievements)
-        })
-
-    # Sort by XP descending by default
-    leaderboard_data.sort(key=lambda x: x["xp"], reverse=True)
-
-    return jsonify(leaderboard_data)
+    version = profiles_version()
+    return cached_json(('leaderboard',), version,
+                       lambda: get_view('leaderboard', version, lambda: build_leaderboard(load_profiles())))
 
-@app.route('/inventory/<user_id>')
-def inventory(user_id):
+@app.route('/summary')
+def summary():
+    role = get_current_user_role()
+    if role not in ['admin', 'owner']:
+        return abort(403, description="No access")
+
+    fields = summary_fields(request.args)
+    u_version = users_version()
+    p_version = u_version[0]
+    m_version = modlog_version()
+
+    def build():
+        # Views that are out of date are rebuilt from a single parse of profiles.json
+        profiles = ProfilesParse()
+        data = {}
+        if 'users' in fields:
+            view = get_table_view('users', u_version, lambda: build_users(profiles()))
+            data['users'] = view.page(*page_params({}, USERS_SORT_KEYS, 'xp'))
+        if 'achievements' in fields:
+            view = get_table_view('achievements', p_version, lambda: build_achievements(profiles()))
+            data['achievements'] = view.page(*page_params({}, ACHIEVEMENTS_SORT_KEYS, 'achievements_count'))
+        if 'leaderboard' in fields:
+            data['leaderboard'] = get_view('leaderboard', p_version, lambda: build_leaderboard(profiles()))
+        if 'modlogs' in fields:
+            data['modlogs'] = modlog_page(modlog_params({}))
+        return data
+
+    return cached_json(('summary', fields), (u_version, m_version), build)
+
+def stream_changes(last_event_id):
+    reader = change_feed.FeedReader(last_event_id)
+    yield "retry: 3000\n\n"
+    last_sent = time.monotonic()
+    while True:
+        for event_id, event in reader.poll():
+            if event is None:
+                yield format_sse(f"{reader.file_id}:0", "reset", {})
+            else:
+                yield format_sse(event_id, event["type"], event)
+            last_sent = time.monotonic()
+        if time.monotonic() - last_sent >= STREAM_HEARTBEAT_INTERVAL:
+            yield ": keep-alive\n\n"
+            last_sent = time.monotonic()
+        time.sleep(STREAM_POLL_INTERVAL)
+
+@app.route('/stream')
+def stream():
     role = get_current_user_role()
     if role not in ['admin', 'owner']:
         return abort(403, description="No access")
 
-    profiles_file = os.path.join(DATA_DIR, 'profiles.json')
+    last_event_id = request.headers.get('Last-Event-ID')
+    return Response(
+        stream_with_context(stream_changes(last_event_id)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
 
-    try:
-        with open(profiles_file, 'r') as f:
-            profiles = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        profiles = {}
+@app.route('/export/<name>')
+def export(name):
+    role = get_current_user_role()
+    if role not in ['admin', 'owner']:
+        return abort(403, description="No access")
+    if name not in EXPORTS:
+        return abort(404)
+    fmt = export_format(request.args)
+    if fmt is None:
+        return abort(400, description="Unsupported export format")
+
+    # No Content-Length: the body is sent with chunked transfer encoding as rows are read
+    return Response(
+        stream_with_context(export_stream(name, fmt)),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{name}.{fmt}"'}
+    )
 
-    profile = profiles.get(user_id)
-    if not profile:
-        return jsonify({"error": "User not found"}), 404
+@app.route('/inventory/<user_id>')
+def inventory(user_id):
+    role = get_current_user_role()
+    if role not in ['admin', 'owner']:
+        return abort(403, description="No access")
 
-    inventory = profile.get("inventory", [])
-    return jsonify({
-        "user_id": user_id,
-        "name": profile.get("name", ""),
-        "inventory": inventory
-    })
+    inventory = build_inventory(load_profiles(), user_id)
+    if inventory is None:
+        return jsonify({"error": "User not found"}), 404
+    return jsonify(inventory)
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    app.run(debug=True, threaded=True)
@@ -4,14 +4,16 @@ Event handlers for user join/leave events with personalized messages.
 import time
 import logging
 from typing import Optional
-from highrise.models import User, Position
+from highrise.models import User, Position, AnchorPosition
 from ..core.profile_manager import (
-    profile_exists, get_profile, load_profiles, save_profiles, 
-    track_user_join, track_user_leave, get_user_role
+    load_profiles, save_profiles, 
+    track_user_leave
 )
 from ..utils.role_utils import auto_assign_role
 from ..utils.time_formatter import format_time
-from ..utils.achievement_manager import get_user_achievements, grant_achievement
+from ..utils.achievement_manager import grant_achievement
+from ..utils import welcome_cache
+from ..utils.greeting_aggregator import GreetingAggregator
 
 logger = logging.getLogger(__name__)
 
@@ -20,59 +22,43 @@ class EventHandler:
 
     def __init__(self, bot):
         self.bot = bot
+        # Room welcomes/farewells are debounced so join storms become grouped messages
+        self.greetings = GreetingAggregator(lambda text: self.bot.highrise.chat(text))
 
     async def on_user_join(self, user: User, position: Position) -> None:
         """Handle user joining the room"""
         try:
             print(f"✅ EVENT HANDLER: {user.username} joined the room")
 
+            # Keep the shared room state current
+            if hasattr(self.bot, 'chat_handler') and hasattr(self.bot.chat_handler, 'room_state'):
+                self.bot.chat_handler.room_state.on_join(user, position)
+
             # Start time tracking
             if hasattr(self.bot, 'chat_handler') and hasattr(self.bot.chat_handler, 'time_handler'):
                 self.bot.chat_handler.time_handler.start_session(user.id)
 
-            # Track join in profile system
-            track_user_join(user.id)
+            # Saves the visit (room_joins, last_seen) and returns everything the welcome message shows
+            card = welcome_cache.record_join(user.id)
 
             # Auto-assign role if they have a profile but no role
             auto_assign_role(user.id)
 
-            # Check if user has a profile
-            if profile_exists(user.id):
+            if card is not None:
                 # Grant join achievement
                 grant_achievement(user.id, "welcome-back", self.bot)
 
-                # Get user's profile and role for personalized message
-                profile = get_profile(user.id)
-                user_name = profile.get('name', user.username)
-                role = get_user_role(user.id)
-                
-                # Get stats for the welcome message
-                stats = profile.get("stats", {})
-                total_visits = stats.get("room_joins", 0)
-                
-                # Calculate total time spent (convert seconds to readable format) 
-                total_seconds = int(stats.get("total_time", 0))
-                if total_seconds >= 3600:
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    total_time = f"{hours}h {minutes}m"
-                elif total_seconds >= 60:
-                    minutes = total_seconds // 60
-                    total_time = f"{minutes}m"
-                else:
-                    total_time = f"{total_seconds}s"
+                user_name = card["name"] or user.username
+                role = card["role"]
+                total_visits = card["visits"]
+                total_time = card["time"]
+                last_seen = card["last_seen"]
 
-                # Get last seen time
-                last_seen = stats.get("last_seen", None)
-                
                 # Generate role-based welcome message
                 welcome_msg = self.generate_role_based_welcome(user_name, role, total_time, total_visits, last_seen)
 
-                try:
-                    await self.bot.highrise.chat(welcome_msg)
-                    print(f"📨 Sent {role} welcome message for {user.username}")
-                except Exception as e:
-                    print(f"❌ Failed to send welcome message for {user.username}: {e}")
+                await self.greetings.add("join", user_name, welcome_msg)
+                print(f"📨 Queued {role} welcome message for {user.username}")
             else:
                 # New user - encourage profile creation
                 try:
@@ -202,6 +188,9 @@ class EventHandler:
         try:
             print(f"🚪 EVENT HANDLER: {user.username} left the room")
 
+            if hasattr(self.bot, 'chat_handler') and hasattr(self.bot.chat_handler, 'room_state'):
+                self.bot.chat_handler.room_state.on_leave(user)
+
             # End time tracking
             if hasattr(self.bot, 'chat_handler') and hasattr(self.bot.chat_handler, 'time_handler'):
                 duration = self.bot.chat_handler.time_handler.end_session(user.id)
@@ -212,13 +201,10 @@ class EventHandler:
             track_user_leave(user.id)
 
             # Send farewell message if user has profile
-            if profile_exists(user.id):
-                try:
-                    farewell_msg = await self.generate_farewell_message(user)
-                    await self.bot.highrise.chat(farewell_msg)
-                    print(f"📨 Sent farewell message for {user.username}")
-                except Exception as e:
-                    print(f"❌ Failed to send farewell message for {user.username}: {e}")
+            if welcome_cache.get_card(user.id) is not None:
+                farewell_msg = await self.generate_farewell_message(user)
+                await self.greetings.add("leave", user.username, farewell_msg)
+                print(f"📨 Queued farewell message for {user.username}")
 
             # Stop any active emote loops
             if hasattr(self.bot, 'chat_handler') and hasattr(self.bot.chat_handler, 'emote_manager'):
@@ -236,6 +222,11 @@ class EventHandler:
         except Exception as e:
             print(f"❌ EVENT HANDLER ERROR: Error handling user leave for {user.username}: {e}")
 
+    async def on_user_move(self, user: User, destination: Position | AnchorPosition) -> None:
+        """Forward movement to the shared room state (follow, circle and lookups read it)"""
+        if hasattr(self.bot, 'chat_handler') and hasattr(self.bot.chat_handler, 'room_state'):
+            self.bot.chat_handler.room_state.on_move(user, destination)
+
     async def send_new_user_welcome(self, user: User) -> None:
         """Send enhanced welcome message for new users without profiles"""
         # Send public welcome
@@ -356,11 +347,11 @@ class EventHandler:
         
         try:
             # Get user data if profile exists
-            if not profile_exists(user.id):
+            card = welcome_cache.get_card(user.id)
+            if card is None:
                 return f"👋✨ Goodbye, {user.username}! Thanks for visiting! ✨"
 
-            profile = get_profile(user.id)
-            role = get_user_role(user.id)
+            role = card["role"]
 
             # Ensure role is valid
             if role not in ["user", "vip", "admin", "owner"]:
@@ -405,31 +396,9 @@ class EventHandler:
     def get_top_achievement(self, user_id: str) -> Optional[str]:
         """Get user's most impressive or recent achievement"""
         try:
-            achievements = get_user_achievements(user_id)
-            if not achievements:
-                return None
-
-            # Priority order for achievements (most impressive first)
-            priority_order = [
-                "engage-time24h", "engage-join100", "engage-chat500",
-                "admin-helper", "vip-status", "loop-master",
-                "social-butterfly", "emote-enthusiast", "engage-time6h",
-                "engage-join25", "engage-chat200", "engage-time1h",
-                "engage-join5", "engage-chat50", "engage-chat10",
-                "profile-viewer", "first-emote", "help-seeker", "first-profile"
-            ]
-
-            # Find the highest priority achievement the user has
-            achievement_ids = [ach.get("id", "") for ach in achievements]
-            for priority_id in priority_order:
-                if priority_id in achievement_ids:
-                    # Find the achievement details
-                    for ach in achievements:
-                        if ach.get("id") == priority_id:
-                            return ach.get("title", "Achievement Unlocked")
-
-            # If no priority match, return the first achievement
-            return achievements[0].get("title", "Achievement Unlocked")
+            # Ranked once per achievement change by the welcome cache instead of scanning here
+            card = welcome_cache.get_card(user_id)
+            return card["top_achievement"] if card else None
 
         except Exception as e:
             logger.error(f"Error getting top achievement for {user_id}: {e}")
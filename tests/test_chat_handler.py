@@ -0,0 +1,42 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from bot.core import profile_manager
+from bot.handlers.chat import ChatHandler
+from bot.utils import change_feed, xp_limiter
+
+class FakeBot:
+    highrise = None
+
+@pytest.fixture
+def handler(tmp_path, monkeypatch):
+    monkeypatch.setattr(profile_manager, "PROFILES_FILE", str(tmp_path / "profiles.json"))
+    monkeypatch.setattr(change_feed, "CHANGES_FILE", str(tmp_path / "changes.jsonl"))
+    monkeypatch.setattr(xp_limiter, "_limiter", xp_limiter.XPRateLimiter())
+    with open(profile_manager.PROFILES_FILE, "w") as f:
+        json.dump({"u1": {"name": "U1", "stats": {"messages": 0, "xp": 0, "level": 1}, "achievements": []}}, f)
+    return ChatHandler(FakeBot())
+
+def messages(user_id):
+    return profile_manager.load_profiles()[user_id]["stats"]["messages"]
+
+def test_auto_muted_users_message_is_dropped(handler):
+    handler.admin_handler.muted_users["u1"] = time.time() + 60
+    asyncio.run(handler.on_message("u1", "hello room"))
+    assert messages("u1") == 0
+
+def test_expired_mute_no_longer_drops_messages(handler):
+    handler.admin_handler.muted_users["u1"] = time.time() - 1
+    asyncio.run(handler.on_message("u1", "hello room"))
+    assert messages("u1") == 1
+    assert "u1" not in handler.admin_handler.muted_users
+
+def test_duplicate_message_counts_but_earns_no_xp(handler):
+    asyncio.run(handler.on_message("u1", "hello room"))
+    asyncio.run(handler.on_message("u1", "hello room"))
+    stats = profile_manager.load_profiles()["u1"]["stats"]
+    assert stats["messages"] == 2
+    assert stats["xp"] == 1
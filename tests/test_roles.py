@@ -0,0 +1,29 @@
+import json
+
+import pytest
+
+from bot.utils import change_feed, roles
+
+@pytest.fixture
+def roles_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(roles, "ROLES_FILE", str(tmp_path / "roles.json"))
+    monkeypatch.setattr(change_feed, "CHANGES_FILE", str(tmp_path / "changes.jsonl"))
+    with open(roles.ROLES_FILE, "w") as f:
+        json.dump({"owners": ["o"], "admins": ["a"], "vips": ["v"], "trusted": ["t"]}, f)
+    roles.invalidate()
+    yield roles.ROLES_FILE
+    roles.invalidate()
+
+def test_trusted_user_is_refused_vip_commands(roles_file):
+    assert roles.get_role("t") == "trusted"
+    assert not roles.require_role("t", "vip")
+
+def test_vip_passes_trusted_but_not_admin_checks(roles_file):
+    assert roles.require_role("v", "vip")
+    assert roles.require_role("v", "trusted")
+    assert not roles.require_role("v", "admin")
+
+def test_higher_roles_pass_vip_checks(roles_file):
+    assert roles.require_role("a", "vip")
+    assert roles.require_role("o", "vip")
+    assert not roles.require_role("nobody", "vip")